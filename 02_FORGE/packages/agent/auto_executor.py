@@ -301,6 +301,10 @@ class AutoExecutor:
             return
 
         payload = self._build_execution_payload(result)
+        # The payload keeps only the inline output; spill files are no longer needed.
+        release_captures = getattr(result, "release_captures", None)
+        if release_captures is not None:
+            release_captures()
         self._proposal_engine.mark_completed(proposal.proposal_id, payload)
         self._audit_logger.emit(
             LogEvent.create(
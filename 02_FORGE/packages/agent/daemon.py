@@ -21,7 +21,7 @@ from .llm_client import LLMClient, LLMConfig, OracleBridge
 from .logging_utils import AuditLogger, LogEvent
 from .proposal_engine import ProposalEngine, RiskLevel
 from .sandbox import SandboxConfig
-from .tool_executor import ToolExecutionEngine
+from .tool_executor import ExecutionLimits, ToolExecutionEngine
 from .thinking_cycle import ThinkingCycle, ThinkingCycleConfig
 from .config import APIKeys
 
@@ -196,6 +196,29 @@ def load_runtime_config(config_path: Path) -> tuple[
             timeout_seconds=resource_cfg.get("timeout_seconds", 600),
         ),
     )
+    resource_defaults = ExecutionLimits()
+    execution_limits = ExecutionLimits(
+        cpu_percent_max=auto_executor_config.resource_limits.cpu_percent_max,
+        memory_mb_max=auto_executor_config.resource_limits.memory_mb_max,
+        disk_mb_max=auto_executor_config.resource_limits.disk_mb_max,
+        timeout_seconds=auto_executor_config.resource_limits.timeout_seconds,
+        max_parallel_executions=resource_cfg.get("max_parallel_executions", resource_defaults.max_parallel_executions),
+        max_parallel_per_tool=resource_cfg.get("max_parallel_per_tool", resource_defaults.max_parallel_per_tool),
+        max_parallel_per_risk={
+            **resource_defaults.max_parallel_per_risk,
+            **resource_cfg.get("max_parallel_per_risk", {}),
+        },
+        admission_cpu_load_percent_max=resource_cfg.get(
+            "admission_cpu_load_percent_max", resource_defaults.admission_cpu_load_percent_max
+        ),
+        admission_memory_percent_max=resource_cfg.get(
+            "admission_memory_percent_max", resource_defaults.admission_memory_percent_max
+        ),
+        admission_poll_seconds=resource_cfg.get("admission_poll_seconds", resource_defaults.admission_poll_seconds),
+        admission_timeout_seconds=resource_cfg.get(
+            "admission_timeout_seconds", resource_defaults.admission_timeout_seconds
+        ),
+    )
     # Align proposal engine auto-approval policy with executor configuration
     def _risk_levels_up_to(level: RiskLevel) -> list[RiskLevel]:
         order = [RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH]
@@ -387,7 +410,7 @@ async def run_service(config_path: Path) -> None:
         audit_logger=execution_logger,
         tool_log_path=harness_config.tool_log_path,
         vessel_id=vessel_id,
-        resource_limits=auto_executor_config.resource_limits,
+        resource_limits=execution_limits,
         max_risk_level=auto_executor_config.max_risk_level,
     )
     auto_executor = AutoExecutor(
@@ -464,6 +487,7 @@ async def run_service(config_path: Path) -> None:
             await thinking_cycle.stop()
         if auto_executor_started:
             await auto_executor.stop()
+        tool_executor.close()
         thinking_logger.close()
         execution_logger.close()
 
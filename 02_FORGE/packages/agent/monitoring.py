@@ -5,7 +5,7 @@ Exposes health, status, and metrics via a simple FastAPI server.
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any
 
 from fastapi import FastAPI
@@ -13,6 +13,7 @@ from fastapi import FastAPI
 from .thinking_cycle import ThinkingCycle
 from .approval_workflow import ApprovalWorkflow
 from .controls_client import ControlsClient
+from .tool_executor import ToolExecutionEngine
 
 log = logging.getLogger(__name__)
 
@@ -28,6 +29,7 @@ AGENT_STATE = {
     "thinking_cycle": None,
     "approval_workflow": None,
     "controls_client": None,
+    "tool_executor": None,
     "start_time": None,
 }
 
@@ -36,11 +38,13 @@ def setup_monitoring_api(
     approval_workflow: ApprovalWorkflow,
     controls_client: ControlsClient,
     start_time: str,
+    tool_executor: ToolExecutionEngine | None = None,
 ):
     """Injects the live agent components into the API's state."""
     AGENT_STATE["thinking_cycle"] = thinking_cycle
     AGENT_STATE["approval_workflow"] = approval_workflow
     AGENT_STATE["controls_client"] = controls_client
+    AGENT_STATE["tool_executor"] = tool_executor
     AGENT_STATE["start_time"] = start_time
     log.info("Monitoring API has been initialized with live agent state.")
 
@@ -80,7 +84,11 @@ async def get_metrics() -> dict[str, Any]:
         return {"error": "Controls client not initialized."}
         
     system_metrics = controls.collect_system_metrics()
-    return system_metrics.__dict__
+    metrics = asdict(system_metrics)
+    tool_executor: ToolExecutionEngine | None = AGENT_STATE.get("tool_executor")
+    if tool_executor is not None:
+        metrics["tool_execution"] = tool_executor.execution_metrics()
+    return metrics
 
 @app.get("/proposals/pending")
 async def get_pending_proposals() -> list[dict[str, Any]]:
@@ -7,15 +7,22 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import uuid
 from dataclasses import asdict, dataclass
 import re
-from collections import deque
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any, Iterable, Optional
 
+from .novelty_index import MinHashLSHIndex, Signature, decode_signature, encode_signature, minhash
+
+
+SNAPSHOT_VERSION = 1
+# Log records appended since the last snapshot before the store compacts again.
+DEFAULT_COMPACT_EVERY = 1000
+
 
 class RiskLevel(Enum):
     """Risk classification for proposed actions."""
@@ -88,7 +95,19 @@ class ActionProposal:
 
 
 class ProposalEngine:
-    """Engine for generating and tracking action proposals."""
+    """Engine for generating and tracking action proposals.
+
+    ``proposals_log`` stays the append-only record of every proposal update.
+    Startup loads ``<proposals_log>.snapshot.json`` (the latest state of every
+    proposal plus the log offset it covers) and replays only the log tail
+    after it; a new snapshot is written every ``compact_every`` appended
+    records. Proposals are indexed by status, so listings and counters only
+    touch the proposals they return.
+
+    Rationales are also indexed by MinHash signature (kept in the snapshot)
+    in an LSH index per action type; :meth:`is_novel` verifies the LSH
+    candidates from the whole history against cached token sets.
+    """
 
     def __init__(
         self,
@@ -97,13 +116,14 @@ class ProposalEngine:
         constitutional_memory: Optional[Path] = None,
         auto_approval_policy: Optional[dict[str, Any]] = None,
         known_tools: Optional[Iterable[str]] = None,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
     ) -> None:
         self.vessel_id = vessel_id
         self.proposals_log = proposals_log
+        self.snapshot_path = proposals_log.with_name(f"{proposals_log.name}.snapshot.json")
+        self.compact_every = compact_every
         self.constitutional_memory = constitutional_memory
-        self._proposals: dict[str, ActionProposal] = {}
-        # keep a small rolling window of recent rationales for novelty checks
-        self._recent_rationales: deque[tuple[str, str]] = deque(maxlen=500)
+        self._clear_store()
         self.auto_approval_policy = self._build_auto_policy(auto_approval_policy)
         self._known_tools: set[str] = set()
         if known_tools:
@@ -143,23 +163,117 @@ class ProposalEngine:
             policy["tool_names"] = {v.strip() for v in config["tool_names"] if v}
         return policy
 
+    # ---- Proposal Store ------------------------------------------------------
+
+    def _clear_store(self) -> None:
+        self._proposals: dict[str, ActionProposal] = {}
+        # First-seen order, used to keep listings in log order.
+        self._order: dict[str, int] = {}
+        self._by_status: dict[ProposalStatus, dict[str, None]] = {status: {} for status in ProposalStatus}
+        self._indexed_status: dict[str, ProposalStatus] = {}
+        self._tokens: dict[str, frozenset[str]] = {}
+        self._novelty = MinHashLSHIndex()
+        self._log_offset = 0
+        self._tail_records = 0
+
     def _load_proposals(self) -> None:
-        """Load existing proposals from log file."""
+        """Load the snapshot, then replay the log records written after it."""
         if not self.proposals_log.exists():
             self.proposals_log.parent.mkdir(parents=True, exist_ok=True)
             return
 
-        with self.proposals_log.open("r", encoding="utf-8") as f:
+        offset = self._load_snapshot()
+        with self.proposals_log.open("rb") as f:
+            f.seek(offset)
             for line in f:
                 if not line.strip():
                     continue
                 data = json.loads(line)
-                proposal = self._deserialize_proposal(data)
-                self._proposals[proposal.proposal_id] = proposal
+                self._remember(self._deserialize_proposal(data))
+                self._tail_records += 1
+            self._log_offset = f.tell()
+
+        if self.compact_every and self._tail_records >= self.compact_every:
+            self.compact()
+
+    def _load_snapshot(self) -> int:
+        """Load the snapshot if it still matches the log; return the log offset to replay from."""
+        try:
+            data = json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+            log_stat = os.stat(self.proposals_log)
+        except (OSError, ValueError):
+            return 0
+        if not isinstance(data, dict):
+            return 0
+        offset = data.get("log_offset", 0)
+        if (
+            data.get("version") != SNAPSHOT_VERSION
+            or data.get("log_inode") != log_stat.st_ino
+            or not isinstance(offset, int)
+            or not 0 < offset <= log_stat.st_size
+        ):
+            # Missing, stale or for a log that was replaced or truncated.
+            return 0
+        signatures = data.get("signatures") or {}
+        try:
+            for record in data["proposals"]:
+                proposal = self._deserialize_proposal(record)
+                encoded = signatures.get(proposal.proposal_id)
+                self._remember(proposal, decode_signature(encoded) if isinstance(encoded, str) else None)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            self._clear_store()
+            return 0
+        return offset
+
+    def compact(self) -> None:
+        """Snapshot every proposal's current state so startup only replays newer log records."""
+        if not self.proposals_log.exists():
+            return
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "log_inode": os.stat(self.proposals_log).st_ino,
+            "log_offset": self._log_offset,
+            "proposals": [proposal.to_dict() for proposal in self._proposals.values()],
+            "signatures": {
+                proposal_id: encode_signature(self._novelty.signature(proposal_id) or ())
+                for proposal_id in self._proposals
+            },
+        }
+        tmp_path = self.snapshot_path.with_name(f".{self.snapshot_path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self.snapshot_path)
+        self._tail_records = 0
+
+    def _remember(self, proposal: ActionProposal, signature: Optional[Signature] = None) -> None:
+        """Add or replace ``proposal`` in memory and in the indexes."""
+        proposal_id = proposal.proposal_id
+        if proposal_id not in self._order:
+            self._order[proposal_id] = len(self._order)
+            tokens = self._tokens[proposal_id] = frozenset(self._tokenize(proposal.rationale))
+            if signature is None:
+                signature = minhash(tokens)
+            self._novelty.add(proposal_id, self._normalize_action_type(proposal.action_type), signature)
+        self._proposals[proposal_id] = proposal
+        self._reindex(proposal)
+
+    def _reindex(self, proposal: ActionProposal) -> None:
+        proposal_id = proposal.proposal_id
+        previous = self._indexed_status.get(proposal_id)
+        if previous is proposal.status:
+            return
+        if previous is not None:
+            self._by_status[previous].pop(proposal_id, None)
+        self._by_status[proposal.status][proposal_id] = None
+        self._indexed_status[proposal_id] = proposal.status
+
+    def _with_status(self, status: ProposalStatus) -> list[ActionProposal]:
+        ids = sorted(self._by_status[status], key=self._order.__getitem__)
+        return [self._proposals[proposal_id] for proposal_id in ids]
 
     def _recompute_stats_from_history(self) -> None:
-        completed = sum(1 for proposal in self._proposals.values() if proposal.status == ProposalStatus.COMPLETED)
-        failed = sum(1 for proposal in self._proposals.values() if proposal.status == ProposalStatus.FAILED)
+        completed = len(self._by_status[ProposalStatus.COMPLETED])
+        failed = len(self._by_status[ProposalStatus.FAILED])
         self._stats["completed"] = completed
         self._stats["failed"] = failed
         total = completed + failed
@@ -230,8 +344,10 @@ class ProposalEngine:
 
     @classmethod
     def _jaccard(cls, a: str, b: str) -> float:
-        ta = cls._tokenize(a)
-        tb = cls._tokenize(b)
+        return cls._jaccard_tokens(cls._tokenize(a), cls._tokenize(b))
+
+    @staticmethod
+    def _jaccard_tokens(ta: set[str] | frozenset[str], tb: set[str] | frozenset[str]) -> float:
         if not ta or not tb:
             return 0.0
         inter = len(ta & tb)
@@ -247,40 +363,28 @@ class ProposalEngine:
         threshold: float = 0.75,
         search_window: int = 200,
     ) -> tuple[bool, float, Optional[str]]:
-        """Assess whether a proposal is novel compared to recent history.
+        """Assess whether a proposal is novel compared to all proposals of its action type.
+
+        Candidates come from the MinHash LSH index, so near-duplicates are
+        found across the whole history; at most ``search_window`` of them,
+        most recent first, are verified by exact Jaccard similarity.
 
         Returns (is_novel, max_similarity, duplicate_of_id)
         """
         norm_type = self._normalize_action_type(action_type)
+        tokens = frozenset(self._tokenize(rationale))
+        if not tokens:
+            return (True, 0.0, None)
 
-        # Search most recent proposals (limited window) for same action type
-        candidates: list[ActionProposal] = []
-        # Fast path via rolling window (proposal_id, rationale_norm_type)
-        checked = 0
-        for pid, atype in reversed(self._recent_rationales):
-            if atype == norm_type:
-                p = self._proposals.get(pid)
-                if p is not None:
-                    candidates.append(p)
-            checked += 1
-            if checked >= search_window:
-                break
-
-        # Fallback if recent window didn't find enough
-        if not candidates:
-            for p in reversed(list(self._proposals.values())):
-                if self._normalize_action_type(p.action_type) == norm_type:
-                    candidates.append(p)
-                if len(candidates) >= search_window:
-                    break
+        candidates = sorted(self._novelty.query(norm_type, minhash(tokens)), key=self._order.__getitem__, reverse=True)
 
         max_sim = 0.0
         dup_id: Optional[str] = None
-        for p in candidates:
-            sim = self._jaccard(p.rationale, rationale)
+        for pid in candidates[:search_window]:
+            sim = self._jaccard_tokens(self._tokens[pid], tokens)
             if sim > max_sim:
                 max_sim = sim
-                dup_id = p.proposal_id
+                dup_id = pid
 
         return (max_sim < threshold, max_sim, dup_id)
 
@@ -363,10 +467,8 @@ class ProposalEngine:
         )
 
         # Store in memory and persist to log
-        self._proposals[proposal_id] = proposal
+        self._remember(proposal)
         self._persist_proposal(proposal)
-        # Update rolling window index
-        self._recent_rationales.append((proposal_id, norm_action))
 
         return proposal
 
@@ -375,6 +477,13 @@ class ProposalEngine:
         with self.proposals_log.open("a", encoding="utf-8") as f:
             json.dump(proposal.to_dict(), f, separators=(",", ":"))
             f.write("\n")
+            f.flush()
+            self._log_offset = os.fstat(f.fileno()).st_size
+        if self._proposals.get(proposal.proposal_id) is proposal:
+            self._reindex(proposal)
+        self._tail_records += 1
+        if self.compact_every and self._tail_records >= self.compact_every:
+            self.compact()
 
     def approve_proposal(
         self,
@@ -521,19 +630,11 @@ class ProposalEngine:
 
     def list_pending_approvals(self) -> list[ActionProposal]:
         """Get all proposals awaiting approval."""
-        return [
-            p
-            for p in self._proposals.values()
-            if p.status == ProposalStatus.PROPOSED
-        ]
+        return self._with_status(ProposalStatus.PROPOSED)
 
     def list_approved_pending_execution(self) -> list[ActionProposal]:
         """Get all approved proposals not yet executed."""
-        return [
-            p
-            for p in self._proposals.values()
-            if p.status == ProposalStatus.APPROVED
-        ]
+        return self._with_status(ProposalStatus.APPROVED)
 
     def list_all(self) -> list[ActionProposal]:
         """Return all proposals ordered by timestamp ascending."""
@@ -543,7 +644,7 @@ class ProposalEngine:
         """List proposals that meet auto-approval policy."""
         return [
             p
-            for p in self._proposals.values()
+            for p in self._with_status(ProposalStatus.PROPOSED)
             if self.is_auto_approvable(p)
         ]
 
@@ -563,10 +664,10 @@ class ProposalEngine:
     def get_approval_rate(self, days: int = 30) -> float:
         """Calculate approval rate over recent history."""
         # Simple implementation - can be enhanced with time filtering
-        total = len([p for p in self._proposals.values() if p.status in (ProposalStatus.APPROVED, ProposalStatus.REJECTED)])
+        approved = len(self._by_status[ProposalStatus.APPROVED])
+        total = approved + len(self._by_status[ProposalStatus.REJECTED])
         if total == 0:
             return 1.0
-        approved = len([p for p in self._proposals.values() if p.status == ProposalStatus.APPROVED])
         return approved / total
 
     def validate_constitutional_alignment(self, proposal: ActionProposal) -> tuple[bool, str]:
@@ -4,7 +4,12 @@ from __future__ import annotations
 import json
 import math
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Sequence
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from .tools import CapturedOutput
+
+# First window of a spilled output searched for a trailing JSON summary.
+_TAIL_WINDOW_BYTES = 256 * 1024
 
 
 class MissionQualityError(RuntimeError):
@@ -45,8 +50,13 @@ class NodeGenerationQuality:
     excellence: Dict[str, float]
 
 
-def evaluate_node_generation_quality(stdout: str) -> NodeGenerationQuality:
-    """Parse node generator output and enforce quality gates."""
+def evaluate_node_generation_quality(stdout: Union[str, CapturedOutput]) -> NodeGenerationQuality:
+    """Parse node generator output and enforce quality gates.
+
+    ``stdout`` may be a :class:`CapturedOutput`; a spilled capture is only read
+    in full when it is a single JSON document, otherwise the trailing summary
+    is searched from the end of the file.
+    """
     payload = _parse_json_document(stdout)
     nodes: Sequence[dict[str, Any]] = ()
     summary = payload
@@ -125,23 +135,68 @@ def evaluate_node_generation_quality(stdout: str) -> NodeGenerationQuality:
     )
 
 
-def _parse_json_document(text: str) -> Any:
-    stripped = text.strip()
+def _parse_json_document(source: Union[str, CapturedOutput]) -> Any:
+    if isinstance(source, CapturedOutput):
+        try:
+            if not source.spilled:
+                return _parse_json_document(source.text)
+            return _parse_spilled_document(source)
+        except MissionQualityError as exc:
+            if exc.code != "parse_error" or not source.truncated:
+                raise
+            raise MissionQualityError(
+                f"Node generator output exceeded the sandbox output limit ({source.truncated_bytes} bytes dropped) "
+                "and no JSON summary survived in its tail.",
+                code="truncated_output",
+            ) from exc
+    stripped = source.strip()
     if not stripped:
         raise MissionQualityError("Node generator emitted empty output.", code="empty_output")
     try:
         return json.loads(stripped)
     except json.JSONDecodeError:
-        last_index = stripped.rfind("{")
-        while last_index != -1:
-            candidate = stripped[last_index:]
-            try:
-                return json.loads(candidate)
-            except json.JSONDecodeError:
-                last_index = stripped.rfind("{", 0, last_index)
+        found = _trailing_json_object(stripped, len(stripped))
+        if found is not None:
+            return found
         raise MissionQualityError("Unable to parse JSON summary from node generator output.", code="parse_error")
 
 
+def _trailing_json_object(text: str, end: int) -> Optional[Dict[str, Any]]:
+    """Parse ``text[i:]`` for each ``{`` at ``i < end``, last first."""
+    last_index = text.rfind("{", 0, max(end, 0))
+    while last_index != -1:
+        try:
+            return json.loads(text[last_index:])
+        except json.JSONDecodeError:
+            last_index = text.rfind("{", 0, last_index)
+    return None
+
+
+def _parse_spilled_document(capture: CapturedOutput) -> Any:
+    size = capture.size
+    if capture.head(64).lstrip()[:1] in ("{", "["):
+        try:
+            return json.loads(capture.read_text())
+        except json.JSONDecodeError:
+            pass
+    # Widen a window from the end; each pass only tries the ``{`` positions
+    # the previous, narrower window did not cover.
+    window = _TAIL_WINDOW_BYTES
+    searched = 0
+    while True:
+        text = capture.tail(window).rstrip()
+        # A few characters of slack: the old window may have started mid-character.
+        found = _trailing_json_object(text, len(text) - searched + 4)
+        if found is not None:
+            return found
+        if window >= size:
+            if not text.strip():
+                raise MissionQualityError("Node generator emitted empty output.", code="empty_output")
+            raise MissionQualityError("Unable to parse JSON summary from node generator output.", code="parse_error")
+        searched = len(text)
+        window *= 4
+
+
 def _compute_excellence(nodes: Sequence[dict[str, Any]]) -> Dict[str, float]:
     if not nodes:
         return {}
@@ -1,17 +1,32 @@
 """Sandbox execution helpers for Janus harness."""
 from __future__ import annotations
 
+import json
+import logging
 import os
+import select
 import shlex
 import subprocess
+import sys
 import tempfile
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Mapping, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 from .config import SandboxPolicy, ToolConfig
+from .sandbox_worker import DEFAULT_INLINE_OUTPUT_BYTES, DEFAULT_MAX_OUTPUT_BYTES, run_command
 from .tools import ToolResult
 
+log = logging.getLogger(__name__)
+
+WORKER_SCRIPT = Path(__file__).resolve().with_name("sandbox_worker.py")
+# Extra time a pooled worker gets to answer after the command's own timeout.
+_WORKER_GRACE_SECONDS = 30.0
+# Minimum time between two sweeps of expired spill files.
+_SPILL_SWEEP_INTERVAL_SECONDS = 600.0
+
 
 @dataclass(slots=True)
 class SandboxConfig:
@@ -22,17 +37,157 @@ class SandboxConfig:
     bubblewrap_path: Path = Path("/usr/bin/bwrap")
     shell_path: Path = Path("/bin/bash")
     dynamic_user: str = "janus"
+    python_path: Path = field(default_factory=lambda: Path(sys.executable))
+    # Pre-warmed workers (one long-lived namespace each) per tool profile.
+    worker_pool: bool = True
+    workers_per_profile: int = 2
+    max_calls_per_worker: int = 200
+    worker_idle_seconds: float = 300.0
+    # Spill files (``<stream>-*.log``) older than this are deleted; None keeps them.
+    spill_retention_seconds: Optional[float] = 24 * 3600.0
 
     def ensure(self) -> None:
         self.workspace_root.mkdir(parents=True, exist_ok=True)
 
 
+@dataclass(slots=True)
+class CallLimits:
+    """Resource limits applied to a single tool command (not to its worker)."""
+
+    timeout_seconds: Optional[float] = None
+    memory_mb: Optional[int] = None
+    cpu_seconds: Optional[int] = None
+    file_size_mb: Optional[int] = None
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES
+    # Larger streams spill to a file in the call's workspace (see ToolResult.capture).
+    inline_output_bytes: int = DEFAULT_INLINE_OUTPUT_BYTES
+
+    def request_fields(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.timeout_seconds,
+            "memory_mb": self.memory_mb,
+            "cpu_seconds": self.cpu_seconds,
+            "file_size_mb": self.file_size_mb,
+            "max_output_bytes": self.max_output_bytes,
+            "inline_output_bytes": self.inline_output_bytes,
+        }
+
+
+class _WorkerError(RuntimeError):
+    """A pooled worker could not be started or could not take a request."""
+
+
+class _WorkerLost(_WorkerError):
+    """A worker failed after receiving a request, so the command may have run."""
+
+    def __init__(self, message: str, *, timed_out: bool = False) -> None:
+        super().__init__(message)
+        self.timed_out = timed_out
+
+
+ProfileKey = Tuple[str, bool, bool]
+
+
+class _SandboxWorker:
+    """One pre-warmed sandbox process serving newline-delimited JSON requests."""
+
+    def __init__(self, key: ProfileKey, generation: int, args: List[str], env: Mapping[str, str], workspace: Path) -> None:
+        self.key = key
+        self.generation = generation
+        self.workspace = workspace
+        self.calls = 0
+        self.last_used = time.monotonic()
+        self._buffer = b""
+        self._process = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=dict(env),
+        )
+        try:
+            ready = self._read_message(timeout=_WORKER_GRACE_SECONDS)
+        except _WorkerLost as exc:
+            self.close()
+            raise _WorkerError(f"sandbox worker failed to start: {exc}") from exc
+        if not ready.get("ready"):
+            self.close()
+            raise _WorkerError(f"sandbox worker failed to start: {ready}")
+
+    def call(self, request: Mapping[str, Any], timeout: Optional[float]) -> Dict[str, Any]:
+        try:
+            self._process.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+            self._process.stdin.flush()
+        except OSError as exc:
+            raise _WorkerError(f"sandbox worker unavailable: {exc}") from exc
+        # From here on the command may be running: failures must not be retried.
+        response = self._read_message(timeout)
+        self.calls += 1
+        self.last_used = time.monotonic()
+        if "error" in response:
+            raise _WorkerLost(response["error"])
+        return response
+
+    def _read_message(self, timeout: Optional[float]) -> Dict[str, Any]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        fd = self._process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise _WorkerLost("sandbox worker did not answer in time", timed_out=True)
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if not readable:
+                continue
+            chunk = os.read(fd, 1 << 20)
+            if not chunk:
+                raise _WorkerLost(f"sandbox worker exited ({self._process.poll()})")
+            self._buffer += chunk
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        try:
+            return json.loads(line)
+        except ValueError as exc:
+            raise _WorkerLost(f"malformed sandbox worker reply: {line[:200]!r}") from exc
+
+    def close(self) -> None:
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process.stdout.close()
+        try:
+            self.workspace.rmdir()
+        except OSError:
+            pass  # not empty: kept for auditing like per-call workspaces
+
+
 class SandboxExecutor:
     """Executes tool commands inside a bind-mounted namespace via bubblewrap.
 
-    The implementation intentionally stays simple: no long-running daemons, just a
-    subprocess wrapper to be invoked per tool call. This keeps the harness portable
-    across development and Balaur environments.
+    With ``SandboxConfig.worker_pool`` each tool profile (tool, network,
+    bubblewrap available) keeps up to ``workers_per_profile`` long-lived
+    sandbox workers. A worker is started once with the profile's bwrap
+    namespace and then runs commands it receives over a pipe, each in a fresh
+    directory under its workspace and with the call's :class:`CallLimits`.
+    Workers are recycled after ``max_calls_per_worker`` calls, after
+    ``worker_idle_seconds`` idle, or when the sandbox policy changes; if a
+    worker cannot serve a call, the call falls back to a one-shot sandbox.
+    Result metadata reports ``setup_seconds`` and ``exec_seconds`` separately.
+
+    Output is streamed off the pipes while the command runs: each stream keeps
+    at most ``CallLimits.inline_output_bytes`` in memory and spills the rest,
+    up to ``max_output_bytes``, to a file recorded as ``<stream>_path``.
+    ``stderr_patterns`` are matched as stderr arrives and reported in
+    ``stderr_matches``.
+
+    Callers that are done with a result delete its spill files with
+    :meth:`ToolResult.release_captures`. Those left behind are removed by
+    :meth:`prune_spills` once older than ``spill_retention_seconds``; calls
+    run it at most every ``_SPILL_SWEEP_INTERVAL_SECONDS``.
     """
 
     def __init__(self, config: SandboxConfig) -> None:
@@ -40,59 +195,300 @@ class SandboxExecutor:
         self.config.ensure()
         # When set, the sandbox will always block network irrespective of tool/policy
         self.force_block_network: bool = False
+        self._pool_lock = threading.Condition()
+        self._idle: Dict[ProfileKey, List[_SandboxWorker]] = {}
+        self._live: Dict[ProfileKey, int] = {}
+        self._generation = 0
+        self._fingerprint: Optional[Tuple[Any, ...]] = None
+        self._pool_broken: Optional[str] = None
+        self._next_spill_sweep = 0.0
+
+    def __call__(
+        self,
+        command: List[str],
+        tool_config: ToolConfig,
+        limits: Optional[CallLimits] = None,
+        *,
+        stderr_patterns: Sequence[str] = (),
+    ) -> ToolResult:
+        limits = limits or CallLimits()
+        if time.monotonic() >= self._next_spill_sweep:
+            self._next_spill_sweep = time.monotonic() + _SPILL_SWEEP_INTERVAL_SECONDS
+            self.prune_spills()
+        if self.config.worker_pool and self._pool_broken is None:
+            try:
+                return self._call_pooled(command, tool_config, limits, stderr_patterns)
+            except _WorkerLost as exc:
+                log.warning("Sandbox worker failed during %s: %s", tool_config.name, exc)
+                return self._lost_result(command, exc)
+            except _WorkerError as exc:
+                log.warning("Sandbox worker failed for %s, running one-shot: %s", tool_config.name, exc)
+        return self._call_once(command, tool_config, limits, stderr_patterns)
 
-    def __call__(self, command: List[str], tool_config: ToolConfig) -> ToolResult:
+    # ------------------------------------------------------------------ one-shot
+    def _call_once(
+        self,
+        command: List[str],
+        tool_config: ToolConfig,
+        limits: CallLimits,
+        stderr_patterns: Sequence[str] = (),
+    ) -> ToolResult:
+        started = time.perf_counter()
         policy = self.config.policy
         workspace = self._allocate_workspace(tool_config.name)
         env = self._prepare_env(tool_config.environment)
-
-        if self.config.bubblewrap_path.exists():
-            args = self._build_bwrap_args(policy, workspace, command, tool_config)
-
-            try:
-                completed = subprocess.run(
-                    args,
-                    check=False,
-                    capture_output=True,
-                    text=True,
-                    env=env,
-                )
-                return ToolResult(
-                    ok=completed.returncode == 0,
-                    stdout=completed.stdout,
-                    stderr=completed.stderr,
-                    metadata={
-                        "returncode": completed.returncode,
-                        "workspace": str(workspace),
-                        "command": command,
-                    },
-                )
-            finally:
-                self._cleanup_workspace(workspace)
-
-        # Fallback: bubblewrap not available; execute directly in place.
+        sandboxed = self.config.bubblewrap_path.exists()
         try:
-            completed = subprocess.run(
-                command,
-                check=False,
-                capture_output=True,
-                text=True,
+            if sandboxed:
+                args = self._build_bwrap_args(policy, workspace, command, tool_config)
+                cwd = None
+            else:
+                # Fallback: bubblewrap not available; execute directly in place.
+                args = command
+                cwd = str(tool_config.working_directory) if tool_config.working_directory else None
+            setup_seconds = time.perf_counter() - started
+            response = run_command(
+                args,
                 env=env,
-                cwd=str(tool_config.working_directory) if tool_config.working_directory else None,
-            )
-            return ToolResult(
-                ok=completed.returncode == 0,
-                stdout=completed.stdout,
-                stderr=completed.stderr,
-                metadata={
-                    "returncode": completed.returncode,
-                    "workspace": str(workspace),
-                    "command": command,
-                    "sandboxed": False,
-                },
+                cwd=cwd,
+                timeout=limits.timeout_seconds,
+                memory_mb=limits.memory_mb,
+                cpu_seconds=limits.cpu_seconds,
+                file_size_mb=limits.file_size_mb,
+                max_output_bytes=limits.max_output_bytes,
+                inline_output_bytes=limits.inline_output_bytes,
+                spill_dir=str(workspace),
+                stderr_patterns=stderr_patterns,
+                # Called from executor threads: no preexec_fn here.
+                limits_python=str(self.config.python_path),
             )
         finally:
             self._cleanup_workspace(workspace)
+        response["workspace"] = str(workspace)
+        return self._result(command, response, limits, sandboxed=sandboxed, setup_seconds=setup_seconds, pooled=False)
+
+    # ------------------------------------------------------------------ pooled
+    def _call_pooled(
+        self,
+        command: List[str],
+        tool_config: ToolConfig,
+        limits: CallLimits,
+        stderr_patterns: Sequence[str] = (),
+    ) -> ToolResult:
+        started = time.perf_counter()
+        sandboxed = self.config.bubblewrap_path.exists()
+        worker = self._acquire(tool_config, sandboxed)
+        request: Dict[str, Any] = {
+            "tool": tool_config.name,
+            "env": dict(self._prepare_env(tool_config.environment)),
+            "stderr_patterns": list(stderr_patterns),
+            **limits.request_fields(),
+        }
+        if sandboxed:
+            request["args"] = [str(self.config.shell_path), "-lc", shlex.join(command)]
+            request["cwd"] = str(tool_config.working_directory) if tool_config.working_directory else None
+            request["chdir_workspace"] = True
+        else:
+            request["args"] = command
+            request["cwd"] = str(tool_config.working_directory) if tool_config.working_directory else None
+        setup_seconds = time.perf_counter() - started
+
+        timeout = None if limits.timeout_seconds is None else limits.timeout_seconds + _WORKER_GRACE_SECONDS
+        try:
+            response = worker.call(request, timeout)
+        except _WorkerError:
+            self._discard(worker)
+            raise
+        self._release(worker)
+        result = self._result(command, response, limits, sandboxed=sandboxed, setup_seconds=setup_seconds, pooled=True)
+        result.metadata["worker_calls"] = worker.calls
+        return result
+
+    def warm(self, tool_config: ToolConfig, count: Optional[int] = None) -> int:
+        """Start idle workers for ``tool_config`` ahead of its first call; returns how many started."""
+        sandboxed = self.config.bubblewrap_path.exists()
+        key = self._profile_key(tool_config, sandboxed)
+        started = 0
+        for _ in range(count or self.config.workers_per_profile):
+            with self._pool_lock:
+                self._check_policy()
+                if self._live.get(key, 0) >= self.config.workers_per_profile:
+                    break
+                self._live[key] = self._live.get(key, 0) + 1
+                generation = self._generation
+            try:
+                worker = self._spawn(key, generation, tool_config)
+            except _WorkerError:
+                with self._pool_lock:
+                    self._live[key] -= 1
+                    self._pool_lock.notify_all()
+                raise
+            self._release(worker)
+            started += 1
+        return started
+
+    def close(self) -> None:
+        """Stop every idle worker; busy workers are stopped when they are released."""
+        with self._pool_lock:
+            self._generation += 1
+            idle = [worker for workers in self._idle.values() for worker in workers]
+            self._idle.clear()
+            for worker in idle:
+                self._live[worker.key] -= 1
+            self._pool_lock.notify_all()
+        for worker in idle:
+            worker.close()
+
+    def _profile_key(self, tool_config: ToolConfig, sandboxed: bool) -> ProfileKey:
+        network = not self.force_block_network and (self.config.policy.allow_network or tool_config.allow_network)
+        return (tool_config.name, network, sandboxed)
+
+    def _policy_fingerprint(self) -> Tuple[Any, ...]:
+        policy = self.config.policy
+        return (
+            str(self.config.bubblewrap_path),
+            str(self.config.shell_path),
+            str(self.config.python_path),
+            tuple(str(path) for path in policy.read_only_paths),
+            tuple(str(path) for path in policy.writable_paths),
+            tuple(policy.preserved_env),
+            policy.allow_network,
+            self.force_block_network,
+        )
+
+    def _check_policy(self) -> List[_SandboxWorker]:
+        """Retire the pool when the policy changed; caller holds ``_pool_lock``. Returns workers to close."""
+        stale: List[_SandboxWorker] = []
+        fingerprint = self._policy_fingerprint()
+        if fingerprint != self._fingerprint:
+            if self._fingerprint is not None:
+                self._generation += 1
+                stale = [worker for workers in self._idle.values() for worker in workers]
+                self._idle.clear()
+                for worker in stale:
+                    self._live[worker.key] -= 1
+                self._pool_broken = None
+            self._fingerprint = fingerprint
+        now = time.monotonic()
+        for workers in self._idle.values():
+            for worker in [w for w in workers if now - w.last_used > self.config.worker_idle_seconds]:
+                workers.remove(worker)
+                self._live[worker.key] -= 1
+                stale.append(worker)
+        return stale
+
+    def _acquire(self, tool_config: ToolConfig, sandboxed: bool) -> _SandboxWorker:
+        key = self._profile_key(tool_config, sandboxed)
+        with self._pool_lock:
+            stale = self._check_policy()
+            while True:
+                idle = self._idle.get(key)
+                if idle:
+                    worker = idle.pop()
+                    break
+                if self._live.get(key, 0) < self.config.workers_per_profile:
+                    self._live[key] = self._live.get(key, 0) + 1
+                    worker = None
+                    break
+                self._pool_lock.wait()
+            generation = self._generation
+        for old in stale:
+            old.close()
+        if worker is not None:
+            return worker
+        try:
+            return self._spawn(key, generation, tool_config)
+        except _WorkerError as exc:
+            with self._pool_lock:
+                self._live[key] -= 1
+                self._pool_broken = str(exc)
+                self._pool_lock.notify_all()
+            raise
+
+    def _release(self, worker: _SandboxWorker) -> None:
+        with self._pool_lock:
+            keep = worker.generation == self._generation and worker.calls < self.config.max_calls_per_worker
+            if keep:
+                self._idle.setdefault(worker.key, []).append(worker)
+            else:
+                self._live[worker.key] -= 1
+            self._pool_lock.notify_all()
+        if not keep:
+            worker.close()
+
+    def _discard(self, worker: _SandboxWorker) -> None:
+        with self._pool_lock:
+            self._live[worker.key] -= 1
+            self._pool_lock.notify_all()
+        worker.close()
+
+    def _spawn(self, key: ProfileKey, generation: int, tool_config: ToolConfig) -> _SandboxWorker:
+        _, _, sandboxed = key
+        workspace = self._allocate_workspace(tool_config.name)
+        worker_command = [str(self.config.python_path), "-I", str(WORKER_SCRIPT), str(workspace)]
+        if sandboxed:
+            args = self._bwrap_prefix(self.config.policy, workspace, tool_config, workspace, die_with_parent=True)
+            args.extend(worker_command)
+        else:
+            args = worker_command
+        try:
+            return _SandboxWorker(key, generation, args, self._prepare_env(None), workspace)
+        except OSError as exc:
+            self._cleanup_workspace(workspace)
+            raise _WorkerError(f"cannot start sandbox worker: {exc}") from exc
+        except _WorkerError:
+            self._cleanup_workspace(workspace)
+            raise
+
+    # ------------------------------------------------------------------ helpers
+    def _lost_result(self, command: List[str], exc: _WorkerLost) -> ToolResult:
+        metadata: Dict[str, Any] = {
+            "returncode": -1,
+            "command": command,
+            "pooled": True,
+            "worker_error": str(exc),
+        }
+        if exc.timed_out:
+            metadata["timed_out"] = True
+        return ToolResult(ok=False, stderr=f"sandbox worker failed: {exc}\n", metadata=metadata)
+
+    def _result(
+        self,
+        command: List[str],
+        response: Mapping[str, Any],
+        limits: CallLimits,
+        *,
+        sandboxed: bool,
+        setup_seconds: float,
+        pooled: bool,
+    ) -> ToolResult:
+        metadata: Dict[str, Any] = {
+            "returncode": response["returncode"],
+            "workspace": response["workspace"],
+            "command": command,
+            "pooled": pooled,
+            "setup_seconds": round(setup_seconds, 6),
+            "exec_seconds": round(response["exec_seconds"], 6),
+        }
+        if not sandboxed:
+            metadata["sandboxed"] = False
+        if response.get("timed_out"):
+            metadata["timed_out"] = True
+        for stream in ("stdout", "stderr"):
+            total = response.get(f"{stream}_bytes", 0)
+            metadata[f"{stream}_bytes"] = total
+            if response.get(f"{stream}_path"):
+                metadata[f"{stream}_path"] = response[f"{stream}_path"]
+            if response.get(f"{stream}_truncated_bytes"):
+                metadata[f"{stream}_truncated_bytes"] = response[f"{stream}_truncated_bytes"]
+        if "stderr_matches" in response:
+            metadata["stderr_matches"] = response["stderr_matches"]
+        return ToolResult(
+            ok=response["returncode"] == 0,
+            stdout=response["stdout"],
+            stderr=response["stderr"],
+            metadata=metadata,
+        )
 
     def _allocate_workspace(self, tool_name: str) -> Path:
         workspace = Path(
@@ -100,6 +496,27 @@ class SandboxExecutor:
         )
         return workspace
 
+    def prune_spills(self, now: Optional[float] = None) -> int:
+        """Delete spill files older than ``spill_retention_seconds``; returns how many.
+
+        Only ``<stream>-*.log`` files directly inside call and worker workspaces
+        are touched, so other audit artefacts and live workers' directories stay.
+        """
+        retention = self.config.spill_retention_seconds
+        if retention is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - retention
+        removed = 0
+        for stream in ("stdout", "stderr"):
+            for path in self.config.workspace_root.glob(f"*/{stream}-*.log"):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
     def _cleanup_workspace(self, workspace: Path) -> None:
         # We intentionally leave workspace files for auditing unless empty. Auditors
         # can configure logrotate or janitor jobs to prune directories later.
@@ -112,16 +529,20 @@ class SandboxExecutor:
             env.update(overrides)
         return env
 
-    def _build_bwrap_args(
+    def _bwrap_prefix(
         self,
         policy: SandboxPolicy,
         workspace: Path,
-        command: List[str],
         tool_config: ToolConfig,
+        workdir: Path,
+        *,
+        die_with_parent: bool = False,
     ) -> List[str]:
         args: List[str] = [str(self.config.bubblewrap_path)]
 
         args.extend(["--unshare-pid", "--unshare-ipc", "--unshare-uts"])
+        if die_with_parent:
+            args.append("--die-with-parent")
         args.extend(["--ro-bind", "/", "/"])
 
         for ro_path in policy.read_only_paths:
@@ -140,12 +561,22 @@ class SandboxExecutor:
         if self.force_block_network or not (policy.allow_network or tool_config.allow_network):
             args.append("--unshare-net")
 
+        args.extend(["--chdir", str(workdir), "--"])
+        return args
+
+    def _build_bwrap_args(
+        self,
+        policy: SandboxPolicy,
+        workspace: Path,
+        command: List[str],
+        tool_config: ToolConfig,
+    ) -> List[str]:
         # Working directory
         workdir = tool_config.working_directory or workspace
-        args.extend(["--chdir", str(workdir)])
+        args = self._bwrap_prefix(policy, workspace, tool_config, workdir)
 
         # Command invocation via shell for compatibility
         shell_command = shlex.join(command)
-        args.extend(["--", str(self.config.shell_path), "-lc", shell_command])
+        args.extend([str(self.config.shell_path), "-lc", shell_command])
 
         return args
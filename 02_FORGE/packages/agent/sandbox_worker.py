@@ -0,0 +1,309 @@
+"""Command runner used by the sandbox executor, in-process or as a pooled worker.
+
+Run as a script (``python -I sandbox_worker.py``) inside a bubblewrap namespace,
+the worker reads one JSON request per line on stdin, runs the command with the
+requested resource limits and writes one JSON response per line on stdout. It
+only depends on the standard library so it can start from a read-only root.
+"""
+from __future__ import annotations
+
+import json
+import os
+import resource
+import selectors
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import IO, Any, Dict, List, Mapping, Optional, Sequence
+
+DEFAULT_MAX_OUTPUT_BYTES = 8 * 1024 * 1024
+# Output kept in memory (and sent back over the worker pipe); the rest spills to a file.
+DEFAULT_INLINE_OUTPUT_BYTES = 256 * 1024
+# End of a stream kept past ``max_output_bytes``, where trailing summaries live.
+DEFAULT_TAIL_OUTPUT_BYTES = 256 * 1024
+_READ_SIZE = 64 * 1024
+_STREAMS = ("stdout", "stderr")
+
+
+def _limit_setter(memory_mb: Optional[int], cpu_seconds: Optional[int], file_size_mb: Optional[int]):
+    limits = []
+    if memory_mb:
+        limits.append((resource.RLIMIT_AS, memory_mb * 1024 * 1024))
+    if cpu_seconds:
+        limits.append((resource.RLIMIT_CPU, cpu_seconds))
+    if file_size_mb:
+        limits.append((resource.RLIMIT_FSIZE, file_size_mb * 1024 * 1024))
+    if not limits:
+        return None
+
+    def apply() -> None:
+        for which, value in limits:
+            resource.setrlimit(which, (value, value))
+
+    return apply
+
+
+def _exec_with_limits(argv: List[str]) -> int:
+    """``--exec-limited MEM CPU FSIZE -- CMD...``: set rlimits (0 = unset), then exec CMD."""
+    memory_mb, cpu_seconds, file_size_mb = (int(value) or None for value in argv[:3])
+    command = argv[4:]
+    apply = _limit_setter(memory_mb, cpu_seconds, file_size_mb)
+    if apply is not None:
+        apply()
+    try:
+        os.execvp(command[0], command)
+    except OSError as exc:
+        sys.stderr.write(f"{exc}\n")
+    return 127
+
+
+class _PatternScanner:
+    """Case-insensitive substring search over a byte stream fed in chunks."""
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self._patterns = {pattern.lower().encode("utf-8"): pattern for pattern in patterns if pattern}
+        self._overlap = max((len(needle) for needle in self._patterns), default=1) - 1
+        self._tail = b""
+        self.matches: List[str] = []
+
+    def feed(self, chunk: bytes) -> None:
+        if not self._patterns:
+            return
+        window = self._tail + chunk.lower()
+        for needle in [needle for needle in self._patterns if needle in window]:
+            self.matches.append(self._patterns.pop(needle))
+        self._tail = window[-self._overlap :] if self._overlap else b""
+
+
+class _Capture:
+    """Bounded capture of one stream: inline up to ``inline`` bytes, then a spill file.
+
+    Past ``limit`` only the last ``tail`` bytes are kept; on close they are
+    appended, after a marker line if anything between was dropped, so a
+    stream's final lines survive truncation.
+    """
+
+    def __init__(
+        self, name: str, limit: int, inline: int, spill_dir: Optional[str], tail: int = DEFAULT_TAIL_OUTPUT_BYTES
+    ) -> None:
+        self.name = name
+        self.limit = limit
+        self.inline = min(inline, limit) if spill_dir else limit
+        self.spill_dir = spill_dir
+        self.head = bytearray()
+        self.kept = 0
+        self.total = 0
+        self.path: Optional[str] = None
+        self._spill: Optional[IO[bytes]] = None
+        self._tail_limit = tail
+        self._tail = bytearray()
+
+    @property
+    def dropped(self) -> int:
+        return self.total - self.kept - len(self._tail)
+
+    def feed(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        room = max(self.limit - self.kept, 0)
+        if len(chunk) > room and self._tail_limit > 0:
+            self._tail += chunk[room:]
+            if len(self._tail) > 2 * self._tail_limit:
+                del self._tail[: -self._tail_limit]
+        chunk = chunk[:room]
+        if not chunk:
+            return
+        self.kept += len(chunk)
+        if self._spill is None and len(self.head) + len(chunk) > self.inline:
+            self._open_spill()
+        if self._spill is not None:
+            self._spill.write(chunk)
+            room = self.inline - len(self.head)
+            if room > 0:
+                self.head += chunk[:room]
+        else:
+            self.head += chunk
+
+    def close(self) -> None:
+        if self._tail:
+            del self._tail[: -self._tail_limit]
+            tail = bytes(self._tail)
+            if self.dropped:
+                tail = b"\n[... %d bytes truncated ...]\n" % self.dropped + tail
+            if self._spill is None and self.spill_dir:
+                self._open_spill()
+            if self._spill is not None:
+                self._spill.write(tail)
+            else:
+                self.head += tail
+        if self._spill is not None:
+            self._spill.close()
+
+    def _open_spill(self) -> None:
+        fd, self.path = tempfile.mkstemp(prefix=f"{self.name}-", suffix=".log", dir=self.spill_dir)
+        self._spill = os.fdopen(fd, "wb")
+        self._spill.write(self.head)
+
+    def fields(self) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {
+            self.name: self.head.decode("utf-8", errors="replace"),
+            f"{self.name}_bytes": self.total,
+        }
+        if self.path is not None:
+            fields[f"{self.name}_path"] = self.path
+        if self.dropped:
+            fields[f"{self.name}_truncated_bytes"] = self.dropped
+        return fields
+
+
+def run_command(
+    args: List[str],
+    *,
+    env: Optional[Mapping[str, str]] = None,
+    cwd: Optional[str] = None,
+    timeout: Optional[float] = None,
+    memory_mb: Optional[int] = None,
+    cpu_seconds: Optional[int] = None,
+    file_size_mb: Optional[int] = None,
+    max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+    inline_output_bytes: int = DEFAULT_INLINE_OUTPUT_BYTES,
+    spill_dir: Optional[str] = None,
+    stderr_patterns: Sequence[str] = (),
+    limits_python: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Run ``args`` with rlimits, a wall-clock ``timeout`` and capped stdout/stderr.
+
+    Both pipes are drained as data arrives. Per stream, the first
+    ``inline_output_bytes`` are returned as text; with a ``spill_dir``, a
+    stream that grows past that is written to ``<spill_dir>/<stream>-*.log``
+    (head included) and its path is returned as ``<stream>_path``. Output past
+    ``max_output_bytes`` is read so the child never blocks on a full pipe;
+    only its last ``DEFAULT_TAIL_OUTPUT_BYTES`` are kept, after a marker line,
+    and ``<stream>_truncated_bytes`` counts the rest. ``<stream>_bytes``
+    records how much was produced.
+
+    ``stderr_patterns`` are matched case-insensitively against all of stderr,
+    including any discarded part, and reported in ``stderr_matches``.
+
+    rlimits are set in the child through ``preexec_fn``, which is only safe
+    in a single-threaded process such as the pooled worker. Multi-threaded
+    callers pass ``limits_python``: the command is then started through
+    this module run by that interpreter, which sets the limits and execs it.
+    """
+    started = time.perf_counter()
+    set_limits = _limit_setter(memory_mb, cpu_seconds, file_size_mb)
+    if set_limits is not None and limits_python is not None:
+        limit_args = [str(value or 0) for value in (memory_mb, cpu_seconds, file_size_mb)]
+        args = [limits_python, "-I", os.path.abspath(__file__), "--exec-limited", *limit_args, "--", *args]
+        set_limits = None
+    try:
+        process = subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=dict(env) if env is not None else None,
+            cwd=cwd,
+            preexec_fn=set_limits,
+            start_new_session=True,
+        )
+    except OSError as exc:
+        return {
+            "returncode": 127,
+            "stdout": "",
+            "stderr": f"{exc}\n",
+            "stdout_bytes": 0,
+            "stderr_bytes": len(str(exc)) + 1,
+            "stderr_matches": [],
+            "timed_out": False,
+            "exec_seconds": time.perf_counter() - started,
+        }
+
+    captures = {name: _Capture(name, max_output_bytes, inline_output_bytes, spill_dir) for name in _STREAMS}
+    scanner = _PatternScanner(stderr_patterns)
+    deadline = started + timeout if timeout else None
+    timed_out = False
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stdout, selectors.EVENT_READ, "stdout")
+        selector.register(process.stderr, selectors.EVENT_READ, "stderr")
+        while selector.get_map():
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                timed_out = True
+                _kill_group(process)
+                deadline = None
+                continue
+            for key, _ in selector.select(remaining):
+                chunk = os.read(key.fd, _READ_SIZE)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    continue
+                captures[key.data].feed(chunk)
+                if key.data == "stderr":
+                    scanner.feed(chunk)
+    returncode = process.wait()
+    process.stdout.close()
+    process.stderr.close()
+    response: Dict[str, Any] = {"returncode": returncode}
+    for capture in captures.values():
+        capture.close()
+        response.update(capture.fields())
+    response["stderr_matches"] = scanner.matches
+    response["timed_out"] = timed_out
+    response["exec_seconds"] = time.perf_counter() - started
+    return response
+
+
+def _kill_group(process: subprocess.Popen) -> None:
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _handle(request: Dict[str, Any], workspace: str) -> Dict[str, Any]:
+    call_dir = tempfile.mkdtemp(prefix=f"{request.get('tool', 'call')}-", dir=workspace)
+    try:
+        response = run_command(
+            request["args"],
+            env=request.get("env"),
+            cwd=request.get("cwd") or (call_dir if request.get("chdir_workspace") else None),
+            timeout=request.get("timeout"),
+            memory_mb=request.get("memory_mb"),
+            cpu_seconds=request.get("cpu_seconds"),
+            file_size_mb=request.get("file_size_mb"),
+            max_output_bytes=request.get("max_output_bytes", DEFAULT_MAX_OUTPUT_BYTES),
+            inline_output_bytes=request.get("inline_output_bytes", DEFAULT_INLINE_OUTPUT_BYTES),
+            # Next to (not inside) the command's directory, so they survive its cleanup.
+            spill_dir=workspace,
+            stderr_patterns=request.get("stderr_patterns", ()),
+        )
+    finally:
+        if not os.listdir(call_dir):
+            os.rmdir(call_dir)
+    response["workspace"] = call_dir
+    return response
+
+
+def main() -> int:
+    if sys.argv[1:2] == ["--exec-limited"]:
+        return _exec_with_limits(sys.argv[2:])
+    workspace = sys.argv[1] if len(sys.argv) > 1 else os.getcwd()
+    out = sys.stdout
+    out.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    out.flush()
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = _handle(json.loads(line), workspace)
+        except Exception as exc:  # keep serving; the caller decides what to do
+            response = {"error": repr(exc)}
+        out.write(json.dumps(response) + "\n")
+        out.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,20 +9,36 @@ This module extends the basic sandbox executor with:
 from __future__ import annotations
 
 import asyncio
+import bisect
+import contextlib
+import functools
 import json
+import os
 import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from .config import ToolConfig
+from .controls_client import ControlsClient, SystemMetrics
 from .logging_utils import AuditLogger, LogEvent
 from .proposal_engine import ActionProposal, ProposalStatus, RiskLevel
 from .quality_gates import MissionQualityError, evaluate_node_generation_quality
-from .sandbox import SandboxConfig, SandboxExecutor
+from .sandbox import CallLimits, SandboxConfig, SandboxExecutor
 from .tools import ToolResult
 
+# Matched case-insensitively against stderr while the tool runs.
+CONCERNING_ERROR_PATTERNS = (
+    "permission denied",
+    "access denied",
+    "unauthorized",
+    "segmentation fault",
+    "core dumped",
+)
+
 
 @dataclass(slots=True)
 class ExecutionLimits:
@@ -32,6 +48,43 @@ class ExecutionLimits:
     memory_mb_max: int = 2048
     disk_mb_max: int = 100
     timeout_seconds: int = 600
+    # Concurrency: executor threads, and slots per risk level / per tool.
+    max_parallel_executions: int = 2
+    max_parallel_per_tool: int = 1
+    max_parallel_per_risk: dict[str, int] = field(
+        default_factory=lambda: {"low": 2, "medium": 1, "high": 1}
+    )
+    # Admission: wait while system load (from /proc) is above these.
+    admission_cpu_load_percent_max: float = 95.0
+    admission_memory_percent_max: float = 95.0
+    admission_poll_seconds: float = 5.0
+    admission_timeout_seconds: float = 300.0
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed bucket bounds (seconds)."""
+
+    DEFAULT_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BOUNDS) -> None:
+        self.bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self._counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def snapshot(self) -> dict[str, Any]:
+        buckets: dict[str, int] = {}
+        running = 0
+        for bound, count in zip(self.bounds, self._counts):
+            running += count
+            buckets[f"{bound:g}"] = running
+        buckets["+Inf"] = self.count
+        return {"count": self.count, "sum": round(self.total, 6), "buckets": buckets}
 
 
 @dataclass(slots=True)
@@ -63,13 +116,31 @@ class ToolExecutionEngine:
         forbidden_tools: Optional[set[str]] = None,
         forbidden_patterns: Optional[set[str]] = None,
         max_risk_level: RiskLevel = RiskLevel.LOW,
+        controls_client: ControlsClient | None = None,
     ) -> None:
         self.sandbox_executor = SandboxExecutor(sandbox)
         self.audit_logger = audit_logger
         self.tool_log_path = tool_log_path
         self.vessel_id = vessel_id
-        self._execution_lock = asyncio.Lock()
         self.resource_limits = resource_limits or ExecutionLimits()
+        self.controls_client = controls_client or ControlsClient(audit_logger, vessel_id=vessel_id)
+
+        # Sandbox calls get their own threads instead of the loop's default pool.
+        parallel = max(1, self.resource_limits.max_parallel_executions)
+        self._executor = ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="janus-tool")
+        self._slots = asyncio.Semaphore(parallel)
+        self._risk_slots = {
+            level: asyncio.Semaphore(max(1, self.resource_limits.max_parallel_per_risk.get(level.value, parallel)))
+            for level in RiskLevel
+        }
+        self._tool_slots: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: dict[str, int] = {}
+        self._metrics_sample: Optional[tuple[float, SystemMetrics]] = None
+        self.admission_wait_histogram = LatencyHistogram()
+        self.queue_wait_histogram = LatencyHistogram()
+        self.run_time_histogram = LatencyHistogram()
+        self.admission_delays = 0
+        self.admission_rejections = 0
         self.max_risk_level = max_risk_level
         self.forbidden_tools = forbidden_tools or {
             "systemctl",
@@ -96,87 +167,96 @@ class ToolExecutionEngine:
         """Execute an approved proposal with full audit trail.
 
         This is the main entry point for executing approved autonomous actions.
+        Executions wait for system load to allow admission, then for a slot
+        for their risk level, their tool and the engine as a whole.
         """
-        async with self._execution_lock:
-            if proposal.status not in {ProposalStatus.APPROVED, ProposalStatus.EXECUTING}:
-                raise ValueError(
-                    f"Proposal must be APPROVED before execution, got {proposal.status}"
-                )
-
-            self._enforce_policy(proposal)
-
-            execution_id = f"exec-{proposal.proposal_id}"
-            context = ExecutionContext(
-                execution_id=execution_id,
-                proposal_id=proposal.proposal_id,
-                vessel_id=self.vessel_id,
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                tool_name=proposal.tool_name,
-                tool_config=tool_config,
-                workspace_path=self.sandbox_executor.config.workspace_root,
-                constitutional_approved=True,
-                rate_limit_approved=True,
+        if proposal.status not in {ProposalStatus.APPROVED, ProposalStatus.EXECUTING}:
+            raise ValueError(
+                f"Proposal must be APPROVED before execution, got {proposal.status}"
             )
 
-            self.audit_logger.emit(
-                LogEvent.create(
-                    level="info",
-                    vessel=self.vessel_id,
-                    event="tool_executor.start",
-                    data={
-                        "execution_id": execution_id,
-                        "proposal_id": proposal.proposal_id,
-                        "tool": proposal.tool_name,
-                        "action_type": proposal.action_type,
-                    },
-                )
+        self._enforce_policy(proposal)
+
+        execution_id = f"exec-{proposal.proposal_id}"
+        context = ExecutionContext(
+            execution_id=execution_id,
+            proposal_id=proposal.proposal_id,
+            vessel_id=self.vessel_id,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            tool_name=proposal.tool_name,
+            tool_config=tool_config,
+            workspace_path=self.sandbox_executor.config.workspace_root,
+            constitutional_approved=True,
+            rate_limit_approved=True,
+        )
+
+        self.audit_logger.emit(
+            LogEvent.create(
+                level="info",
+                vessel=self.vessel_id,
+                event="tool_executor.start",
+                data={
+                    "execution_id": execution_id,
+                    "proposal_id": proposal.proposal_id,
+                    "tool": proposal.tool_name,
+                    "action_type": proposal.action_type,
+                },
             )
+        )
 
-            try:
+        try:
+            async with self._admitted_slot(proposal) as (admission_wait, queue_wait):
                 await self._pre_execution_checks(proposal, context)
-                result = await self._execute_sandboxed(proposal, tool_config, context)
+
+                started = time.perf_counter()
+                try:
+                    result = await self._execute_sandboxed(proposal, tool_config, context)
+                finally:
+                    self.run_time_histogram.observe(time.perf_counter() - started)
                 if result.metadata is None:
                     result.metadata = {}
                 result.metadata.setdefault("resource_limits", asdict(self.resource_limits))
+                result.metadata["admission_wait_seconds"] = round(admission_wait, 6)
+                result.metadata["queue_wait_seconds"] = round(queue_wait, 6)
 
                 await self._post_execution_checks(proposal, result, context)
                 self._log_execution(context, result, success=True)
 
-                self.audit_logger.emit(
-                    LogEvent.create(
-                        level="info",
-                        vessel=self.vessel_id,
-                        event="tool_executor.success",
-                        data={
-                            "execution_id": execution_id,
-                            "proposal_id": proposal.proposal_id,
-                            "returncode": result.metadata.get("returncode", 0),
-                        },
-                    )
+            self.audit_logger.emit(
+                LogEvent.create(
+                    level="info",
+                    vessel=self.vessel_id,
+                    event="tool_executor.success",
+                    data={
+                        "execution_id": execution_id,
+                        "proposal_id": proposal.proposal_id,
+                        "returncode": result.metadata.get("returncode", 0),
+                    },
                 )
-                return result
+            )
+            return result
 
-            except Exception as exc:
-                error_result = ToolResult(
-                    ok=False,
-                    stderr=str(exc),
-                    metadata={"error": repr(exc)},
-                )
-                self._log_execution(context, error_result, success=False)
+        except Exception as exc:
+            error_result = ToolResult(
+                ok=False,
+                stderr=str(exc),
+                metadata={"error": repr(exc)},
+            )
+            self._log_execution(context, error_result, success=False)
 
-                self.audit_logger.emit(
-                    LogEvent.create(
-                        level="error",
-                        vessel=self.vessel_id,
-                        event="tool_executor.failed",
-                        data={
-                            "execution_id": execution_id,
-                            "proposal_id": proposal.proposal_id,
-                            "error": str(exc),
-                        },
-                    )
+            self.audit_logger.emit(
+                LogEvent.create(
+                    level="error",
+                    vessel=self.vessel_id,
+                    event="tool_executor.failed",
+                    data={
+                        "execution_id": execution_id,
+                        "proposal_id": proposal.proposal_id,
+                        "error": str(exc),
+                    },
                 )
-                raise
+            )
+            raise
 
     async def _pre_execution_checks(
         self,
@@ -271,17 +351,111 @@ class ToolExecutionEngine:
                 if token_clean in self.forbidden_shell_tokens:
                     raise ValueError(f"Shell token '{token_clean}' is not permitted during autonomous execution")
 
+    @contextlib.asynccontextmanager
+    async def _execution_slot(self, proposal: ActionProposal) -> AsyncIterator[None]:
+        """Hold the risk-level, per-tool and engine-wide slots (always in that order)."""
+        tool_slot = self._tool_slots.get(proposal.tool_name)
+        if tool_slot is None:
+            tool_slot = self._tool_slots[proposal.tool_name] = asyncio.Semaphore(
+                max(1, self.resource_limits.max_parallel_per_tool)
+            )
+        async with self._risk_slots[proposal.risk_level], tool_slot, self._slots:
+            self._in_flight[proposal.tool_name] = self._in_flight.get(proposal.tool_name, 0) + 1
+            try:
+                yield
+            finally:
+                self._in_flight[proposal.tool_name] -= 1
+
     async def _check_resource_availability(self) -> None:
-        """Check if sufficient resources available for execution."""
-        # Check disk space
+        """Check the workspace is reachable (system load is handled by admission)."""
         try:
-            stat = self.sandbox_executor.config.workspace_root.stat()
-            # This is a placeholder - in production would check actual disk space
+            self.sandbox_executor.config.workspace_root.stat()
         except OSError as exc:
             raise RuntimeError(f"Cannot access workspace: {exc}") from exc
 
-        # Add delay to ensure we don't overload system
-        await asyncio.sleep(0.1)
+    @contextlib.asynccontextmanager
+    async def _admitted_slot(self, proposal: ActionProposal) -> AsyncIterator[tuple[float, float]]:
+        """Wait for load admission, then hold the execution slots.
+
+        Admission is awaited without holding any slot, so a stalled execution
+        never blocks others. Load is checked again once the slots are held;
+        if it rose meanwhile they are released before waiting again. Yields
+        the total admission wait and slot (queue) wait in seconds, each also
+        recorded in its own histogram.
+        """
+        deadline = time.monotonic() + self.resource_limits.admission_timeout_seconds
+        admission_wait = queue_wait = 0.0
+        while True:
+            started = time.perf_counter()
+            await self._wait_for_admission(deadline)
+            queued_at = time.perf_counter()
+            admission_wait += queued_at - started
+            async with self._execution_slot(proposal):
+                queue_wait += time.perf_counter() - queued_at
+                if self._admission_blocked() is None:
+                    self.admission_wait_histogram.observe(admission_wait)
+                    self.queue_wait_histogram.observe(queue_wait)
+                    yield admission_wait, queue_wait
+                    return
+
+    async def _wait_for_admission(self, deadline: float) -> None:
+        """Wait until system load admits another execution, or raise at ``deadline``."""
+        limits = self.resource_limits
+        delayed = False
+        while True:
+            reason = self._admission_blocked()
+            if reason is None:
+                return
+            if time.monotonic() >= deadline:
+                self.admission_rejections += 1
+                raise RuntimeError(f"Execution not admitted: {reason}")
+            if not delayed:
+                delayed = True
+                self.admission_delays += 1
+                self.audit_logger.emit(
+                    LogEvent.create(
+                        level="warn",
+                        vessel=self.vessel_id,
+                        event="tool_executor.admission_delayed",
+                        data={"reason": reason},
+                    )
+                )
+            await asyncio.sleep(limits.admission_poll_seconds)
+
+    def _admission_blocked(self) -> Optional[str]:
+        """Return why system load blocks admission right now, or None."""
+        metrics = self._system_metrics()
+        limits = self.resource_limits
+        cpu_load_percent = metrics.cpu_load_1min / (os.cpu_count() or 1) * 100
+        if cpu_load_percent > limits.admission_cpu_load_percent_max:
+            return f"CPU load too high: {cpu_load_percent:.1f}%"
+        if metrics.memory_percent > limits.admission_memory_percent_max:
+            return f"Memory usage too high: {metrics.memory_percent:.1f}%"
+        return None
+
+    def _system_metrics(self) -> SystemMetrics:
+        # One /proc sample serves every admission check within a second.
+        now = time.monotonic()
+        if self._metrics_sample is None or now - self._metrics_sample[0] >= 1.0:
+            self._metrics_sample = (now, self.controls_client.collect_system_metrics())
+        return self._metrics_sample[1]
+
+    def execution_metrics(self) -> dict[str, Any]:
+        """Concurrency, admission and latency figures for the monitoring API."""
+        return {
+            "max_parallel_executions": self.resource_limits.max_parallel_executions,
+            "in_flight": {tool: count for tool, count in self._in_flight.items() if count},
+            "admission_delays": self.admission_delays,
+            "admission_rejections": self.admission_rejections,
+            "admission_wait_seconds": self.admission_wait_histogram.snapshot(),
+            "queue_wait_seconds": self.queue_wait_histogram.snapshot(),
+            "run_time_seconds": self.run_time_histogram.snapshot(),
+        }
+
+    def close(self) -> None:
+        """Stop the execution threads and pooled sandbox workers."""
+        self._executor.shutdown(wait=False)
+        self.sandbox_executor.close()
 
     async def _execute_sandboxed(
         self,
@@ -293,13 +467,23 @@ class ToolExecutionEngine:
         # Build command from proposal
         command = list(tool_config.command) + list(proposal.tool_args)
 
-        # Execute in sandbox (runs in thread pool to avoid blocking)
-        loop = asyncio.get_event_loop()
+        limits = CallLimits(
+            timeout_seconds=self.resource_limits.timeout_seconds,
+            memory_mb=self.resource_limits.memory_mb_max,
+            file_size_mb=self.resource_limits.disk_mb_max,
+        )
+
+        # Execute in sandbox (runs on the engine's own threads to avoid blocking)
+        loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
-            None,
-            self.sandbox_executor,
-            command,
-            tool_config,
+            self._executor,
+            functools.partial(
+                self.sandbox_executor,
+                command,
+                tool_config,
+                limits,
+                stderr_patterns=CONCERNING_ERROR_PATTERNS,
+            ),
         )
 
         return result
@@ -316,8 +500,7 @@ class ToolExecutionEngine:
             raise ValueError(f"Invalid result type: {type(result)}")
 
         # Check 2: Check for suspicious output patterns
-        if result.stderr:
-            self._check_error_patterns(result.stderr, context)
+        self._check_error_patterns(result, context)
 
         # Check 3: Validate expected outcome
         if not result.ok and proposal.expected_outcome:
@@ -337,7 +520,7 @@ class ToolExecutionEngine:
 
         if proposal.tool_name == "node_generator" and result.ok:
             try:
-                evaluation = evaluate_node_generation_quality(result.stdout)
+                evaluation = evaluate_node_generation_quality(result.capture("stdout"))
             except MissionQualityError as exc:
                 self.audit_logger.emit(
                     LogEvent.create(
@@ -391,30 +574,28 @@ class ToolExecutionEngine:
                     )
                 )
 
-    def _check_error_patterns(self, stderr: str, context: ExecutionContext) -> None:
+    def _check_error_patterns(self, result: ToolResult, context: ExecutionContext) -> None:
         """Check stderr for concerning error patterns."""
-        concerning_patterns = [
-            "permission denied",
-            "access denied",
-            "unauthorized",
-            "segmentation fault",
-            "core dumped",
-        ]
-
-        stderr_lower = stderr.lower()
-        for pattern in concerning_patterns:
-            if pattern in stderr_lower:
-                self.audit_logger.emit(
-                    LogEvent.create(
-                        level="warn",
-                        vessel=self.vessel_id,
-                        event="tool_executor.concerning_error",
-                        data={
-                            "execution_id": context.execution_id,
-                            "pattern": pattern,
-                        },
-                    )
+        metadata = result.metadata or {}
+        if "stderr_matches" in metadata:
+            # Scanned by the sandbox as stderr streamed in, spilled part included.
+            matches = [pattern for pattern in CONCERNING_ERROR_PATTERNS if pattern in metadata["stderr_matches"]]
+        else:
+            stderr_lower = result.stderr.lower()
+            matches = [pattern for pattern in CONCERNING_ERROR_PATTERNS if pattern in stderr_lower]
+
+        for pattern in matches:
+            self.audit_logger.emit(
+                LogEvent.create(
+                    level="warn",
+                    vessel=self.vessel_id,
+                    event="tool_executor.concerning_error",
+                    data={
+                        "execution_id": context.execution_id,
+                        "pattern": pattern,
+                    },
                 )
+            )
 
     def _log_execution(
         self,
@@ -423,6 +604,7 @@ class ToolExecutionEngine:
         success: bool,
     ) -> None:
         """Log detailed execution audit trail to tool_use.jsonl."""
+        metadata = result.metadata or {}
         execution_log = {
             "timestamp": context.timestamp,
             "vessel_id": context.vessel_id,
@@ -431,8 +613,8 @@ class ToolExecutionEngine:
             "tool": context.tool_name,
             "success": success,
             "returncode": result.metadata.get("returncode", -1) if result.metadata else -1,
-            "stdout_length": len(result.stdout),
-            "stderr_length": len(result.stderr),
+            "stdout_length": metadata.get("stdout_bytes", len(result.stdout)),
+            "stderr_length": metadata.get("stderr_bytes", len(result.stderr)),
             "workspace": str(result.metadata.get("workspace", "")) if result.metadata else "",
             "metadata": result.metadata or {},
         }
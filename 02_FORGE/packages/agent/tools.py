@@ -1,9 +1,12 @@
 """Tool abstraction layer for Janus agent harness."""
 from __future__ import annotations
 
+import io
+import os
 import shlex
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, Protocol
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Protocol
 
 from .config import ToolConfig
 
@@ -29,6 +32,85 @@ class ToolResult:
     def __bool__(self) -> bool:
         return self.ok
 
+    def capture(self, stream: str = "stdout") -> "CapturedOutput":
+        """Lazy reader over the full captured ``stream``.
+
+        ``stdout``/``stderr`` only hold the inline head of a stream the sandbox
+        spilled to disk; the capture reads the spill file on demand.
+        """
+        metadata = self.metadata or {}
+        text = self.stdout if stream == "stdout" else self.stderr
+        path = metadata.get(f"{stream}_path")
+        return CapturedOutput(
+            text=text,
+            path=Path(path) if path else None,
+            truncated_bytes=metadata.get(f"{stream}_truncated_bytes", 0),
+        )
+
+    def release_captures(self) -> None:
+        """Delete spill files once a caller is done with :meth:`capture`."""
+        metadata = self.metadata or {}
+        for stream in ("stdout", "stderr"):
+            path = metadata.pop(f"{stream}_path", None)
+            if path:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+
+
+@dataclass(slots=True)
+class CapturedOutput:
+    """One captured output stream: inline text, or a spill file holding all of it.
+
+    ``truncated_bytes`` counts output dropped past the sandbox's output limit;
+    the stream's last bytes are still kept after a marker line.
+    """
+
+    text: str = ""
+    path: Optional[Path] = None
+    truncated_bytes: int = 0
+
+    @property
+    def truncated(self) -> bool:
+        return self.truncated_bytes > 0
+
+    @property
+    def spilled(self) -> bool:
+        return self.path is not None
+
+    @property
+    def size(self) -> int:
+        """Captured size in bytes."""
+        if self.path is not None:
+            return self.path.stat().st_size
+        return len(self.text.encode("utf-8"))
+
+    def open(self) -> BinaryIO:
+        if self.path is not None:
+            return self.path.open("rb")
+        return io.BytesIO(self.text.encode("utf-8"))
+
+    def read_text(self) -> str:
+        if self.path is None:
+            return self.text
+        return self.path.read_bytes().decode("utf-8", errors="replace")
+
+    def head(self, size: int) -> str:
+        with self.open() as handle:
+            return handle.read(size).decode("utf-8", errors="replace")
+
+    def tail(self, size: int) -> str:
+        with self.open() as handle:
+            end = handle.seek(0, os.SEEK_END)
+            handle.seek(max(end - size, 0))
+            return handle.read().decode("utf-8", errors="replace")
+
+    def iter_lines(self) -> Iterator[str]:
+        with self.open() as handle:
+            for line in handle:
+                yield line.decode("utf-8", errors="replace")
+
 
 class ToolRegistry:
     """Registry for dynamically adding/removing tools."""
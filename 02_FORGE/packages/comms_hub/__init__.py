@@ -0,0 +1,25 @@
+"""In-process COMMS_HUB message delivery shared by vessels and the CLI."""
+
+from .messages import (
+    BROADCAST_RECIPIENTS,
+    COMMS_DIR,
+    MESSAGE_TYPES,
+    PRIORITIES,
+    VESSELS,
+    send_many,
+    send_message,
+    validate_fields,
+    verify_message_constitutional,
+)
+
+__all__ = [
+    "BROADCAST_RECIPIENTS",
+    "COMMS_DIR",
+    "MESSAGE_TYPES",
+    "PRIORITIES",
+    "VESSELS",
+    "send_many",
+    "send_message",
+    "validate_fields",
+    "verify_message_constitutional",
+]
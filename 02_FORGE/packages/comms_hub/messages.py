@@ -0,0 +1,166 @@
+"""Write COMMS_HUB messages straight into recipient inboxes."""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping
+
+LOGGER = logging.getLogger(__name__)
+
+COMMS_DIR = Path(os.getenv("COMMS_HUB_PATH", "/srv/janus/03_OPERATIONS/COMMS_HUB"))
+
+VESSELS = ("claude", "codex", "gemini", "groq", "openai", "janus", "janus_balaur", "captain")
+MESSAGE_TYPES = ("task_assignment", "task_complete", "query", "response", "broadcast", "heartbeat")
+PRIORITIES = ("high", "normal", "low")
+BROADCAST_RECIPIENTS = ("claude", "gemini", "groq", "janus")
+
+HARMFUL_PATTERNS = (
+    "delete all",
+    "rm -rf /",
+    "shutdown system",
+    "bypass security",
+    "disable logging",
+    "format disk",
+)
+
+
+def validate_fields(*, from_vessel: str, message_type: str, priority: str) -> None:
+    """Apply the same checks as the ``comms_hub_send.py`` CLI; raise ``ValueError`` on failure."""
+    if from_vessel not in VESSELS:
+        raise ValueError(f"Unknown sending vessel: {from_vessel!r}")
+    if message_type not in MESSAGE_TYPES:
+        raise ValueError(f"Unknown message type: {message_type!r}")
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority!r}")
+
+
+def verify_message_constitutional(payload: dict) -> bool:
+    """
+    Verify message aligns with constitutional principles.
+
+    Checks:
+    - No harmful instructions
+    - No obfuscation or encryption (transparency requirement)
+
+    Returns:
+        True if message passes verification, False otherwise
+    """
+    payload_str = json.dumps(payload).lower()
+
+    if any(pattern in payload_str for pattern in HARMFUL_PATTERNS):
+        LOGGER.warning("Message contains harmful pattern and was BLOCKED")
+        return False
+
+    if payload.get("obfuscated", False) or payload.get("encrypted", False):
+        LOGGER.warning("Message contains obfuscation and was BLOCKED")
+        return False
+
+    return True
+
+
+def build_message(
+    from_vessel: str,
+    to_vessel: str,
+    message_type: str,
+    payload: dict,
+    priority: str = "normal",
+) -> dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "message_id": f"msg-{now.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}",
+        "timestamp": now.isoformat().replace("+00:00", "Z"),
+        "from_vessel": from_vessel,
+        "to_vessel": to_vessel,
+        "message_type": message_type,
+        "priority": priority,
+        "payload": payload,
+        "constitutional_verified": verify_message_constitutional(payload),
+    }
+
+
+def _recipients(to_vessel: str) -> Iterable[str]:
+    return BROADCAST_RECIPIENTS if to_vessel == "broadcast" else (to_vessel,)
+
+
+def _write_atomic(destination: Path, data: str) -> None:
+    # Readers (and inbox watchers) only ever see complete files.
+    tmp_path = destination.with_name(f".{destination.name}.tmp")
+    tmp_path.write_text(data, encoding="utf-8")
+    os.replace(tmp_path, destination)
+
+
+def send_many(messages: Iterable[Mapping[str, Any]], *, comms_root: Path | None = None) -> List[str]:
+    """
+    Send several messages in one pass and return their message ids in order.
+
+    Each item takes the keyword arguments of :func:`send_message`. Every
+    message is serialised once, inbox directories are created once per call,
+    and each file is written atomically to the recipients' inboxes and the
+    outbox archive.
+    """
+    root = Path(comms_root) if comms_root else COMMS_DIR
+    outbox = root / "outbox"
+    ready: set[Path] = set()
+
+    def directory(path: Path) -> Path:
+        if path not in ready:
+            path.mkdir(parents=True, exist_ok=True)
+            ready.add(path)
+        return path
+
+    message_ids: List[str] = []
+    for item in messages:
+        message = build_message(
+            item["from_vessel"],
+            item["to_vessel"],
+            item["message_type"],
+            item["payload"],
+            item.get("priority", "normal"),
+        )
+        data = json.dumps(message, indent=2)
+        file_name = f"{message['message_id']}.msg.json"
+        for recipient in _recipients(message["to_vessel"]):
+            _write_atomic(directory(root / recipient / "inbox") / file_name, data)
+        _write_atomic(directory(outbox) / file_name, data)
+        message_ids.append(message["message_id"])
+    return message_ids
+
+
+def send_message(
+    from_vessel: str,
+    to_vessel: str,
+    message_type: str,
+    payload: dict,
+    priority: str = "normal",
+    *,
+    comms_root: Path | None = None,
+) -> str:
+    """
+    Send a message via COMMS_HUB.
+
+    Args:
+        from_vessel: Sending vessel (claude, codex, gemini)
+        to_vessel: Receiving vessel (claude, codex, gemini, broadcast)
+        message_type: Type of message (task_assignment, query, response, etc.)
+        payload: Message payload as dictionary
+        priority: Message priority (high, normal, low)
+
+    Returns:
+        message_id: Unique identifier for the sent message
+    """
+    return send_many(
+        [
+            {
+                "from_vessel": from_vessel,
+                "to_vessel": to_vessel,
+                "message_type": message_type,
+                "payload": payload,
+                "priority": priority,
+            }
+        ],
+        comms_root=comms_root,
+    )[0]
@@ -1,9 +1,11 @@
 """Narrative Warehouse tooling for constitutional context streaming."""
 
+from .cache import EmbeddingCache
 from .indexer import build_index
 from .query_engine import NarrativeQueryEngine, NarrativeResult
 
 __all__ = [
+    "EmbeddingCache",
     "build_index",
     "NarrativeQueryEngine",
     "NarrativeResult",
@@ -0,0 +1,339 @@
+"""Approximate nearest-neighbour backends for the Narrative Warehouse.
+
+The pure NumPy :class:`IVFIndex` (spherical k-means coarse quantiser with
+inverted lists) is always available. When ``faiss`` or ``hnswlib`` are
+installed they can be selected instead; all backends score by inner product,
+which equals cosine similarity for the normalised embeddings the encoders emit.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+LOGGER = logging.getLogger(__name__)
+
+ANN_BACKENDS = ("ivf", "faiss", "hnswlib")
+
+
+def _pad_results(indices: list[np.ndarray], scores: list[np.ndarray], top_k: int) -> tuple[np.ndarray, np.ndarray]:
+    out_indices = np.full((len(indices), top_k), -1, dtype=np.int64)
+    out_scores = np.full((len(indices), top_k), -np.inf, dtype=np.float32)
+    for row, (found, found_scores) in enumerate(zip(indices, scores)):
+        out_indices[row, : len(found)] = found
+        out_scores[row, : len(found)] = found_scores
+    return out_indices, out_scores
+
+
+class BaseAnnIndex:
+    """Interface shared by the ANN backends."""
+
+    backend: str
+    filename: str
+
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:  # pragma: no cover - interface
+        """Return ``(indices, scores)`` of shape ``(len(queries), top_k)``, padded with ``-1``."""
+        raise NotImplementedError
+
+    def save(self, path: Path) -> None:  # pragma: no cover - interface
+        raise NotImplementedError
+
+    def config(self) -> dict[str, Any]:
+        return {"backend": self.backend, "filename": self.filename}
+
+
+class IVFIndex(BaseAnnIndex):
+    """Inverted-file index built with NumPy only."""
+
+    backend = "ivf"
+    filename = "ann_ivf.npz"
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        centroids: np.ndarray,
+        order: np.ndarray,
+        offsets: np.ndarray,
+        nprobe: int = 8,
+    ) -> None:
+        self._embeddings = embeddings
+        self._centroids = centroids
+        self._order = order
+        self._offsets = offsets
+        self.nprobe = nprobe
+
+    @property
+    def nprobe(self) -> int:
+        """Inverted lists scanned per query; can be changed without rebuilding."""
+        return self._nprobe
+
+    @nprobe.setter
+    def nprobe(self, value: int) -> None:
+        self._nprobe = max(1, min(int(value), len(self._centroids)))
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        nlist: int | None = None,
+        nprobe: int = 8,
+        iterations: int = 10,
+        seed: int = 0,
+        batch_size: int = 8192,
+    ) -> "IVFIndex":
+        count = len(embeddings)
+        if count == 0:
+            raise ValueError("Cannot build an ANN index over zero embeddings")
+        nlist = nlist or max(1, int(4 * np.sqrt(count)))
+        nlist = min(nlist, count)
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(count, nlist * 256)
+        sample = np.asarray(embeddings[np.sort(rng.choice(count, size=sample_size, replace=False))], dtype=np.float32)
+        centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids = (sums / norms).astype(np.float32)
+
+        assignment = np.empty(count, dtype=np.int64)
+        for start in range(0, count, batch_size):
+            block = np.asarray(embeddings[start : start + batch_size], dtype=np.float32)
+            assignment[start : start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(assignment, minlength=nlist)))).astype(np.int64)
+        return cls(embeddings, centroids, order, offsets, nprobe=nprobe)
+
+    @classmethod
+    def load(cls, path: Path, embeddings: np.ndarray, nprobe: int | None = None) -> "IVFIndex":
+        with np.load(path) as data:
+            stored_nprobe = int(data["nprobe"])
+            return cls(
+                embeddings,
+                data["centroids"],
+                data["order"],
+                data["offsets"],
+                nprobe=nprobe or stored_nprobe,
+            )
+
+    def save(self, path: Path) -> None:
+        with path.open("wb") as handle:
+            np.savez(
+                handle,
+                centroids=self._centroids,
+                order=self._order,
+                offsets=self._offsets,
+                nprobe=np.asarray(self.nprobe),
+            )
+
+    def config(self) -> dict[str, Any]:
+        return {**super().config(), "nlist": int(len(self._centroids)), "nprobe": self.nprobe}
+
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        probes = np.argpartition(-(queries @ self._centroids.T), self.nprobe - 1, axis=1)[:, : self.nprobe]
+        found_indices: list[np.ndarray] = []
+        found_scores: list[np.ndarray] = []
+        for query, lists in zip(queries, probes):
+            candidates = np.concatenate([self._order[self._offsets[i] : self._offsets[i + 1]] for i in lists])
+            if not len(candidates):
+                found_indices.append(candidates)
+                found_scores.append(np.empty(0, dtype=np.float32))
+                continue
+            candidates.sort()
+            scores = np.asarray(self._embeddings[candidates] @ query)
+            k = min(top_k, len(candidates))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind="stable")]
+            found_indices.append(candidates[best])
+            found_scores.append(scores[best])
+        return _pad_results(found_indices, found_scores, top_k)
+
+
+class FaissIndex(BaseAnnIndex):
+    """IVF-Flat index backed by faiss (inner-product metric)."""
+
+    backend = "faiss"
+    filename = "ann.faiss"
+
+    def __init__(self, index: Any, nprobe: int = 8) -> None:
+        self._index = index
+        self.nprobe = nprobe
+
+    @property
+    def nprobe(self) -> int:
+        """Inverted lists scanned per query; can be changed without rebuilding."""
+        return int(self._index.nprobe)
+
+    @nprobe.setter
+    def nprobe(self, value: int) -> None:
+        self._index.nprobe = int(value)
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, nlist: int | None = None, nprobe: int = 8) -> "FaissIndex":
+        import faiss  # type: ignore[import]
+
+        data = np.ascontiguousarray(embeddings, dtype=np.float32)
+        nlist = min(nlist or max(1, int(4 * np.sqrt(len(data)))), len(data))
+        quantizer = faiss.IndexFlatIP(data.shape[1])
+        index = faiss.IndexIVFFlat(quantizer, data.shape[1], nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(data)
+        index.add(data)
+        return cls(index, nprobe=nprobe)
+
+    @classmethod
+    def load(cls, path: Path, nprobe: int = 8) -> "FaissIndex":
+        import faiss  # type: ignore[import]
+
+        return cls(faiss.read_index(str(path)), nprobe=nprobe)
+
+    def save(self, path: Path) -> None:
+        import faiss  # type: ignore[import]
+
+        faiss.write_index(self._index, str(path))
+
+    def config(self) -> dict[str, Any]:
+        return {**super().config(), "nlist": int(self._index.nlist), "nprobe": self.nprobe}
+
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        scores, indices = self._index.search(queries, top_k)
+        return indices.astype(np.int64), scores.astype(np.float32)
+
+
+class HnswlibIndex(BaseAnnIndex):
+    """HNSW graph index backed by hnswlib (inner-product space)."""
+
+    backend = "hnswlib"
+    filename = "ann.hnsw"
+
+    def __init__(self, index: Any, count: int, ef: int = 64) -> None:
+        self._index = index
+        self._count = count
+        self.ef = ef
+
+    @classmethod
+    def build(cls, embeddings: np.ndarray, m: int = 16, ef_construction: int = 200, ef: int = 64) -> "HnswlibIndex":
+        import hnswlib  # type: ignore[import]
+
+        data = np.ascontiguousarray(embeddings, dtype=np.float32)
+        index = hnswlib.Index(space="ip", dim=data.shape[1])
+        index.init_index(max_elements=len(data), ef_construction=ef_construction, M=m)
+        index.add_items(data, np.arange(len(data)))
+        return cls(index, len(data), ef=ef)
+
+    @classmethod
+    def load(cls, path: Path, dimension: int, count: int, ef: int = 64) -> "HnswlibIndex":
+        import hnswlib  # type: ignore[import]
+
+        index = hnswlib.Index(space="ip", dim=dimension)
+        index.load_index(str(path), max_elements=count)
+        return cls(index, count, ef=ef)
+
+    def save(self, path: Path) -> None:
+        self._index.save_index(str(path))
+
+    def config(self) -> dict[str, Any]:
+        return {**super().config(), "ef": self.ef}
+
+    def search(self, queries: np.ndarray, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32)
+        k = min(top_k, self._count)
+        self._index.set_ef(max(self.ef, k))
+        labels, distances = self._index.knn_query(queries, k=k)
+        found = [labels[row].astype(np.int64) for row in range(len(queries))]
+        scores = [(1.0 - distances[row]).astype(np.float32) for row in range(len(queries))]
+        return _pad_results(found, scores, top_k)
+
+
+def available_backends() -> list[str]:
+    """Return the ANN backends importable in this environment."""
+    backends = ["ivf"]
+    for name in ("faiss", "hnswlib"):
+        try:
+            __import__(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+def build_ann_index(embeddings: np.ndarray, backend: str = "auto", **params: Any) -> BaseAnnIndex:
+    """Build an ANN index; ``backend="auto"`` prefers faiss, then hnswlib, then IVF."""
+    if backend == "auto":
+        installed = available_backends()
+        backend = next((name for name in ("faiss", "hnswlib") if name in installed), "ivf")
+    if backend == "ivf":
+        return IVFIndex.build(embeddings, **params)
+    if backend == "faiss":
+        return FaissIndex.build(embeddings, **params)
+    if backend == "hnswlib":
+        return HnswlibIndex.build(embeddings, **params)
+    raise ValueError(f"Unsupported ANN backend '{backend}'")
+
+
+def load_ann_index(index_dir: Path, config: dict[str, Any], embeddings: np.ndarray) -> BaseAnnIndex:
+    """Recreate the ANN index described by ``metadata["ann"]``."""
+    backend = config.get("backend")
+    path = index_dir / str(config.get("filename"))
+    if backend == "ivf":
+        return IVFIndex.load(path, embeddings, nprobe=config.get("nprobe"))
+    if backend == "faiss":
+        return FaissIndex.load(path, nprobe=int(config.get("nprobe", 8)))
+    if backend == "hnswlib":
+        return HnswlibIndex.load(path, embeddings.shape[1], len(embeddings), ef=int(config.get("ef", 64)))
+    raise ValueError(f"Unsupported ANN backend '{backend}'")
+
+
+def exact_search(embeddings: np.ndarray, queries: np.ndarray, top_k: int) -> np.ndarray:
+    """Brute-force top-k indices used as ground truth for recall measurements."""
+    scores = np.asarray(queries @ np.asarray(embeddings).T)
+    k = min(top_k, scores.shape[1])
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, best, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(best, order, axis=1)
+
+
+def recall_at_k(
+    index: BaseAnnIndex,
+    embeddings: np.ndarray,
+    queries: np.ndarray,
+    top_k: int = 10,
+) -> dict[str, float]:
+    """Compare ``index`` against exact search and report recall@k and latency."""
+    started = time.perf_counter()
+    truth = exact_search(embeddings, queries, top_k)
+    exact_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    approx, _ = index.search(queries, top_k)
+    ann_seconds = time.perf_counter() - started
+
+    hits = sum(len(set(t.tolist()) & set(a[a >= 0].tolist())) for t, a in zip(truth, approx))
+    return {
+        "recall": hits / float(truth.size) if truth.size else 1.0,
+        "exact_ms_per_query": 1000.0 * exact_seconds / max(len(queries), 1),
+        "ann_ms_per_query": 1000.0 * ann_seconds / max(len(queries), 1),
+    }
+
+
+def sample_queries(embeddings: np.ndarray, count: int, noise: float = 0.05, seed: int = 0) -> np.ndarray:
+    """Draw perturbed copies of indexed vectors to use as benchmark queries."""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(embeddings), size=min(count, len(embeddings)), replace=False)
+    queries = np.asarray(embeddings[np.sort(rows)], dtype=np.float32)
+    queries = queries + noise * rng.standard_normal(queries.shape).astype(np.float32)
+    norms = np.linalg.norm(queries, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return queries / norms
+
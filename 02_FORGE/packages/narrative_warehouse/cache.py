@@ -0,0 +1,194 @@
+"""Persistent embedding cache shared by the Narrative Warehouse tools."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+from .encoder import BaseEncoder
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_ENV_VAR = "NARRATIVE_EMBEDDING_CACHE"
+_SQLITE_MAX_VARIABLES = 500
+
+
+def default_cache_path() -> Path:
+    """Return the cache location (``$NARRATIVE_EMBEDDING_CACHE`` or ``~/.cache``)."""
+    override = os.environ.get(CACHE_ENV_VAR)
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".cache" / "narrative_warehouse" / "embeddings.sqlite3"
+
+
+def cache_namespace(config: Mapping[str, Any]) -> str:
+    """Stable key for an encoder configuration (e.g. ``EncoderConfig.to_dict()``)."""
+    payload = json.dumps(dict(config), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed ``(encoder config, content hash) -> vector`` store.
+
+    A bounded in-process LRU sits in front of the database; the database itself
+    is trimmed to ``max_entries`` by least-recent use. WAL mode lets indexers,
+    query engines and other tools share one file concurrently.
+    """
+
+    def __init__(self, path: Path | None = None, max_entries: int = 500_000, hot_entries: int = 4096) -> None:
+        self.path = path or default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._hot_entries = hot_entries
+        self._hot: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30.0)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                namespace TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, content_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._connection.commit()
+        self._count = int(self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _remember(self, key: tuple[str, str], vector: np.ndarray) -> None:
+        self._hot[key] = vector
+        self._hot.move_to_end(key)
+        while len(self._hot) > self._hot_entries:
+            self._hot.popitem(last=False)
+
+    def get_many(self, namespace: str, hashes: Sequence[str]) -> list[np.ndarray | None]:
+        """Return cached vectors for ``hashes`` (``None`` for misses)."""
+        found: list[np.ndarray | None] = [None] * len(hashes)
+        missing: dict[str, list[int]] = {}
+        with self._lock:
+            for position, digest in enumerate(hashes):
+                vector = self._hot.get((namespace, digest))
+                if vector is not None:
+                    self._hot.move_to_end((namespace, digest))
+                    found[position] = vector
+                else:
+                    missing.setdefault(digest, []).append(position)
+            if not missing:
+                return found
+
+            digests = list(missing)
+            hits: list[str] = []
+            for start in range(0, len(digests), _SQLITE_MAX_VARIABLES):
+                batch = digests[start : start + _SQLITE_MAX_VARIABLES]
+                placeholders = ",".join("?" for _ in batch)
+                rows = self._connection.execute(
+                    f"SELECT content_hash, dimension, vector FROM embeddings "
+                    f"WHERE namespace = ? AND content_hash IN ({placeholders})",
+                    [namespace, *batch],
+                ).fetchall()
+                for digest, dimension, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32, count=int(dimension))
+                    self._remember((namespace, digest), vector)
+                    for position in missing[digest]:
+                        found[position] = vector
+                    hits.append(digest)
+            if hits:
+                now = time.time()
+                self._connection.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE namespace = ? AND content_hash = ?",
+                    [(now, namespace, digest) for digest in hits],
+                )
+                self._connection.commit()
+        return found
+
+    def put_many(self, namespace: str, hashes: Sequence[str], vectors: np.ndarray) -> None:
+        """Store ``vectors`` (one row per hash) and trim the cache if it is over budget."""
+        if not len(hashes):
+            return
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        now = time.time()
+        with self._lock:
+            for digest, vector in zip(hashes, vectors):
+                self._remember((namespace, digest), vector.copy())
+            before = self._connection.total_changes
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO embeddings (namespace, content_hash, dimension, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(namespace, digest, int(vector.shape[0]), vector.tobytes(), now) for digest, vector in zip(hashes, vectors)],
+            )
+            self._count += self._connection.total_changes - before
+            if self._count > self._max_entries * 1.1:
+                self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        excess = self._count - self._max_entries
+        self._connection.execute(
+            "DELETE FROM embeddings WHERE (namespace, content_hash) IN "
+            "(SELECT namespace, content_hash FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+        self._count = int(self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0])
+        LOGGER.info("Evicted %d least-recently-used embeddings from %s", excess, self.path)
+
+
+class CachedEncoder(BaseEncoder):
+    """Wrap an encoder so every text is embedded at most once per configuration."""
+
+    def __init__(self, encoder: BaseEncoder, cache: EmbeddingCache) -> None:
+        self._encoder = encoder
+        self._cache = cache
+        self._namespace = cache_namespace(encoder.config.to_dict())
+        self.name = encoder.name
+        self.config = encoder.config
+
+    @property
+    def inner(self) -> BaseEncoder:
+        return self._encoder
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        texts = list(texts)
+        hashes = [content_hash(text) for text in texts]
+        cached = self._cache.get_many(self._namespace, hashes)
+
+        pending: dict[str, int] = {}
+        for position, vector in enumerate(cached):
+            if vector is None:
+                pending.setdefault(hashes[position], position)
+        if not pending:
+            return np.vstack(cached) if texts else self._encoder.encode(texts)
+
+        encoded = np.asarray(self._encoder.encode([texts[position] for position in pending.values()]), dtype=np.float32)
+        self._cache.put_many(self._namespace, list(pending), encoded)
+        fresh = dict(zip(pending, encoded))
+
+        vectors = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+        for position, vector in enumerate(cached):
+            vectors[position] = fresh[hashes[position]] if vector is None else vector
+        return vectors
@@ -3,35 +3,59 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Iterable, Sequence
+from functools import lru_cache
+from typing import Sequence
 
 import numpy as np
 
 LOGGER = logging.getLogger(__name__)
 
+# ``\w`` is ``str.isalnum()`` plus underscore, so this matches maximal alphanumeric runs.
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+_ENCODE_BLOCK_ROWS = 4096
+
 
 def _tokenize(text: str) -> list[str]:
     """Crude but robust tokenizer that is locale-agnostic."""
-    tokens: list[str] = []
-    current: list[str] = []
-    for ch in text.lower():
-        if ch.isalnum():
-            current.append(ch)
-        else:
-            if current:
-                tokens.append("".join(current))
-                current.clear()
-    if current:
-        tokens.append("".join(current))
-    return tokens
+    return _TOKEN_PATTERN.findall(text.lower())
 
 
+@lru_cache(maxsize=1 << 18)
 def _stable_hash(token: str) -> int:
     digest = hashlib.blake2s(token.encode("utf-8"), digest_size=4).digest()
     return int.from_bytes(digest, "big")
 
 
+def _hashing_block(texts: Sequence[str], dimension: int) -> np.ndarray:
+    """Encode a block of texts by scattering token buckets into a count matrix."""
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    hashes: list[int] = []
+    for row, text in enumerate(texts):
+        tokens = _tokenize(text)
+        lengths[row] = len(tokens)
+        hashes.extend(map(_stable_hash, tokens))
+
+    buckets = np.fromiter(hashes, dtype=np.int64, count=len(hashes)) % dimension
+    rows = np.repeat(np.arange(len(texts), dtype=np.int64), lengths)
+    counts = np.bincount(rows * dimension + buckets, minlength=len(texts) * dimension)
+    vectors = counts.astype(np.float32).reshape(len(texts), dimension)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def _hashing_encode(texts: Sequence[str], dimension: int) -> np.ndarray:
+    vectors = np.zeros((len(texts), dimension), dtype=np.float32)
+    for start in range(0, len(texts), _ENCODE_BLOCK_ROWS):
+        block = texts[start : start + _ENCODE_BLOCK_ROWS]
+        vectors[start : start + len(block)] = _hashing_block(block, dimension)
+    return vectors
+
+
 @dataclass(frozen=True)
 class EncoderConfig:
     """Persistable configuration for recreating an encoder instance."""
@@ -67,29 +91,29 @@ class BaseEncoder:
 
 
 class HashingEncoder(BaseEncoder):
-    """Deterministic hashing encoder used when transformer models are unavailable."""
+    """Deterministic hashing encoder used when transformer models are unavailable.
 
-    def __init__(self, dimension: int = 768) -> None:
+    ``workers > 1`` fans batches of at least ``parallel_threshold`` texts out to a
+    process pool; the output does not depend on the worker count.
+    """
+
+    def __init__(self, dimension: int = 768, workers: int = 1, parallel_threshold: int = 8192) -> None:
         self._dimension = dimension
+        self._workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self._parallel_threshold = parallel_threshold
         self.name = f"hashing-{dimension}"
         self.config = EncoderConfig(kind="hashing", model_name=None, dimension=dimension)
 
-    def _vector_for_tokens(self, tokens: Iterable[str]) -> np.ndarray:
-        vec = np.zeros(self._dimension, dtype=np.float32)
-        for token in tokens:
-            idx = _stable_hash(token) % self._dimension
-            vec[idx] += 1.0
-        norm = np.linalg.norm(vec)
-        if norm:
-            vec /= norm
-        return vec
-
     def encode(self, texts: Sequence[str]) -> np.ndarray:
-        vectors = np.zeros((len(texts), self._dimension), dtype=np.float32)
-        for i, text in enumerate(texts):
-            tokens = _tokenize(text)
-            vectors[i] = self._vector_for_tokens(tokens)
-        return vectors
+        texts = list(texts)
+        if self._workers <= 1 or len(texts) < self._parallel_threshold:
+            return _hashing_encode(texts, self._dimension)
+
+        step = -(-len(texts) // self._workers)
+        slices = [texts[start : start + step] for start in range(0, len(texts), step)]
+        with ProcessPoolExecutor(max_workers=len(slices)) as pool:
+            parts = list(pool.map(_hashing_encode, slices, [self._dimension] * len(slices)))
+        return np.concatenate(parts, axis=0)
 
 
 class SentenceTransformerEncoder(BaseEncoder):
@@ -1,8 +1,9 @@
 """Index construction for the Narrative Warehouse."""
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -10,8 +11,17 @@ from typing import Iterable, Sequence
 
 import numpy as np
 
+from .ann import BaseAnnIndex, build_ann_index
+from .cache import CachedEncoder, EmbeddingCache
 from .encoder import EncoderConfig, BaseEncoder, select_encoder
-from .storage import save_index_bundle
+from .storage import (
+    METADATA_FILENAME,
+    bundle_data_dir,
+    load_file_manifest,
+    load_index_bundle,
+    load_source_ranges,
+    save_index_bundle,
+)
 from .utils import chunk_text
 
 LOGGER = logging.getLogger(__name__)
@@ -52,21 +62,70 @@ def _iter_documents(paths: Sequence[Path], extensions: Sequence[str]) -> Iterabl
                 yield candidate
 
 
-def _gather_entries(files: Iterable[Path], base_dir: Path, max_words: int) -> list[IndexEntry]:
-    entries: list[IndexEntry] = []
-    entry_id = 0
-    for file_path in files:
-        try:
-            raw = file_path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            raw = file_path.read_text(encoding="utf-8", errors="ignore")
-        rel_path = str(file_path.relative_to(base_dir))
-        for chunk in chunk_text(raw, max_words=max_words):
-            if not chunk.strip():
-                continue
-            entries.append(IndexEntry(entry_id=entry_id, source_file=rel_path, content=chunk.strip()))
-            entry_id += 1
-    return entries
+def _read_document(raw: bytes) -> str:
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("utf-8", errors="ignore")
+
+
+def _chunk_document(raw: bytes, max_words: int) -> list[str]:
+    chunks: list[str] = []
+    for chunk in chunk_text(_read_document(raw), max_words=max_words):
+        if chunk.strip():
+            chunks.append(chunk.strip())
+    return chunks
+
+
+@dataclass(slots=True)
+class _PreviousIndex:
+    """Artefacts of the last build that an incremental run can reuse."""
+
+    embeddings: np.ndarray
+    entries: Sequence[dict[str, object]]
+    files: dict[str, dict[str, object]]
+    rows_by_file: dict[str, list[int]]
+
+    def unchanged_rows(self, rel_path: str, stat: os.stat_result, digest: str | None) -> list[int] | None:
+        """Return the rows for ``rel_path`` if the file is known to be unchanged."""
+        known = self.files.get(rel_path)
+        rows = self.rows_by_file.get(rel_path, [])
+        if not known or known.get("chunks") != len(rows):
+            return None
+        if digest is None:
+            if known.get("size") == stat.st_size and known.get("mtime_ns") == stat.st_mtime_ns:
+                return rows
+            return None
+        return rows if known.get("sha256") == digest else None
+
+
+def _load_previous_index(output_dir: Path, encoder: BaseEncoder, max_words: int) -> _PreviousIndex | None:
+    if not (output_dir / METADATA_FILENAME).exists():
+        return None
+    try:
+        embeddings, entries, metadata = load_index_bundle(output_dir, mmap_mode="r")
+    except (OSError, ValueError) as exc:
+        LOGGER.warning("Existing index at %s is unreadable, rebuilding from scratch: %s", output_dir, exc)
+        return None
+
+    if (
+        metadata.get("version") != INDEX_VERSION
+        or metadata.get("encoder") != encoder.config.to_dict()
+        or metadata.get("max_words") != max_words
+    ):
+        LOGGER.info("Existing index was built with different settings, rebuilding from scratch")
+        return None
+
+    data_dir = bundle_data_dir(output_dir, metadata)
+    files = load_file_manifest(data_dir)
+    if not files or len(entries) != len(embeddings):
+        LOGGER.info("Existing index has no usable file manifest, rebuilding from scratch")
+        return None
+
+    rows_by_file: dict[str, list[int]] = {}
+    for source in load_source_ranges(data_dir, entries):
+        rows_by_file.setdefault(source["source_file"], []).extend(range(source["start"], source["stop"]))
+    return _PreviousIndex(embeddings=embeddings, entries=entries, files=files, rows_by_file=rows_by_file)
 
 
 def build_index(
@@ -76,8 +135,18 @@ def build_index(
     preferred_model: str | None = "sentence-transformers/all-MiniLM-L6-v2",
     extensions: Sequence[str] = (".md", ".txt"),
     max_words: int = 220,
+    incremental: bool = False,
+    ann_backend: str | None = None,
+    ann_params: dict[str, object] | None = None,
+    embedding_cache: EmbeddingCache | None = None,
 ) -> dict[str, object]:
-    """Build the narrative index."""
+    """Build the narrative index.
+
+    With ``incremental=True`` an existing bundle in ``output_dir`` is reused:
+    files whose size/mtime or content hash match the stored manifest keep their
+    chunks and embeddings, changed files are re-chunked and only chunks with new
+    text are encoded, and entries for deleted files are dropped.
+    """
     scope = include_paths or DEFAULT_SCOPE
     resolved_scope = [workspace_root / Path(path) for path in scope]
     resolved_scope = [path for path in resolved_scope if path.exists()]
@@ -85,14 +154,81 @@ def build_index(
         raise ValueError("No valid paths found for narrative index scope")
 
     encoder: BaseEncoder = select_encoder(preferred_model)
+    if embedding_cache is not None:
+        encoder = CachedEncoder(encoder, embedding_cache)
+
+    previous = _load_previous_index(output_dir, encoder, max_words) if incremental else None
+
+    entries: list[IndexEntry] = []
+    reuse_rows: list[int] = []
+    pending: list[str] = []
+    manifest: dict[str, dict[str, object]] = {}
+    reused_files = 0
+    for file_path in _iter_documents(resolved_scope, extensions):
+        rel_path = str(file_path.relative_to(workspace_root))
+        stat = file_path.stat()
+        rows = previous.unchanged_rows(rel_path, stat, None) if previous else None
+        digest = previous.files[rel_path].get("sha256") if rows is not None else None
+
+        if rows is None:
+            raw = file_path.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            rows = previous.unchanged_rows(rel_path, stat, digest) if previous else None
+
+        if rows is not None:
+            reused_files += 1
+            for row in rows:
+                content = str(previous.entries[row]["content"])
+                entries.append(IndexEntry(entry_id=len(entries), source_file=rel_path, content=content))
+                reuse_rows.append(row)
+        else:
+            known_chunks: dict[str, int] = {}
+            if previous:
+                for row in previous.rows_by_file.get(rel_path, []):
+                    known_chunks.setdefault(str(previous.entries[row]["content"]), row)
+            rows = []
+            for chunk in _chunk_document(raw, max_words=max_words):
+                entries.append(IndexEntry(entry_id=len(entries), source_file=rel_path, content=chunk))
+                row = known_chunks.get(chunk, -1)
+                reuse_rows.append(row)
+                if row < 0:
+                    pending.append(chunk)
+                rows.append(row)
+
+        manifest[rel_path] = {
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "chunks": len(rows),
+        }
 
-    files = list(_iter_documents(resolved_scope, extensions))
-    entries = _gather_entries(files, workspace_root, max_words=max_words)
     if not entries:
         raise ValueError("No narrative content discovered for indexing")
 
-    contents = [entry.content for entry in entries]
-    embeddings = encoder.encode(contents)
+    encoded = encoder.encode(pending) if pending else None
+    dimension = encoded.shape[1] if encoded is not None else previous.embeddings.shape[1]
+    embeddings = np.empty((len(entries), dimension), dtype=np.float32)
+    rows_array = np.asarray(reuse_rows, dtype=np.int64)
+    reused = rows_array >= 0
+    if reused.any():
+        embeddings[reused] = previous.embeddings[rows_array[reused]]
+    if encoded is not None:
+        embeddings[~reused] = encoded
+
+    removed_files = len(set(previous.files) - set(manifest)) if previous else 0
+    LOGGER.info(
+        "Indexed %d files (%d unchanged, %d removed); encoded %d of %d chunks",
+        len(manifest),
+        reused_files,
+        removed_files,
+        len(pending),
+        len(entries),
+    )
+
+    ann: BaseAnnIndex | None = None
+    if ann_backend:
+        ann = build_ann_index(embeddings, backend=ann_backend, **(ann_params or {}))
+        LOGGER.info("Built %s ANN index over %d chunks", ann.backend, len(entries))
 
     metadata = {
         "version": INDEX_VERSION,
@@ -102,13 +238,24 @@ def build_index(
         "scope": [str(path.relative_to(workspace_root)) for path in resolved_scope],
         "extensions": list(extensions),
         "max_words": max_words,
+        "build": {
+            "incremental": previous is not None,
+            "files": len(manifest),
+            "files_reused": reused_files,
+            "files_removed": removed_files,
+            "chunks_encoded": len(pending),
+        },
     }
+    if ann is not None:
+        metadata["ann"] = ann.config()
 
     save_index_bundle(
         output_dir=output_dir,
         embeddings=embeddings,
         entries=[entry.to_dict() for entry in entries],
         metadata=metadata,
+        files=manifest,
+        ann=ann,
     )
 
     return metadata
@@ -1,15 +1,18 @@
 """Query interface for the Narrative Warehouse index."""
 from __future__ import annotations
 
+import bisect
 import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Sequence
 
 import numpy as np
 
+from .ann import BaseAnnIndex, load_ann_index
+from .cache import CachedEncoder, EmbeddingCache
 from .encoder import EncoderConfig, encoder_from_config
-from .storage import load_index_bundle, METADATA_FILENAME
+from .storage import bundle_data_dir, load_index_bundle, load_source_ranges, METADATA_FILENAME
 
 LOGGER = logging.getLogger(__name__)
 
@@ -37,56 +40,145 @@ def _normalise_scope(scope: Sequence[str] | None) -> list[str]:
     return normalised
 
 
+def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Return the indices of the ``top_k`` highest scores, best first."""
+    if top_k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class _SourcePrefixIndex:
+    """Sorted source-file table mapping path prefixes to index rows.
+
+    Prefix lookups are two bisections over the sorted paths; the resulting row
+    arrays are memoised per scope so repeated lookups for the same resident
+    scope are a dictionary hit.
+    """
+
+    def __init__(self, sources: Sequence[dict[str, object]], row_count: int, cache_size: int = 128) -> None:
+        ordered = sorted(sources, key=lambda source: str(source["source_file"]))
+        self._paths = [str(source["source_file"]) for source in ordered]
+        self._ranges = [(int(source["start"]), int(source["stop"])) for source in ordered]
+        self._row_count = row_count
+        self._cache: dict[tuple[str, ...], np.ndarray | None] = {}
+        self._cache_size = cache_size
+
+    def rows_for(self, prefixes: Sequence[str]) -> np.ndarray | None:
+        """Return sorted row indices under ``prefixes`` (``None`` means every row)."""
+        key = tuple(sorted(set(prefixes)))
+        if key in self._cache:
+            return self._cache[key]
+
+        ranges: list[tuple[int, int]] = []
+        for prefix in key:
+            lo = bisect.bisect_left(self._paths, prefix)
+            hi = bisect.bisect_left(self._paths, prefix + "\U0010ffff")
+            ranges.extend(self._ranges[lo:hi])
+
+        rows: np.ndarray | None
+        if ranges:
+            rows = np.unique(np.concatenate([np.arange(start, stop) for start, stop in ranges]))
+            if len(rows) == self._row_count:
+                rows = None
+        else:
+            rows = np.empty(0, dtype=np.int64)
+
+        if len(self._cache) >= self._cache_size:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = rows
+        return rows
+
+
 class NarrativeQueryEngine:
     """Loads the persisted index and answers semantic queries."""
 
-    def __init__(self, index_dir: Path) -> None:
+    def __init__(
+        self,
+        index_dir: Path,
+        mmap_mode: str | None = "r",
+        use_ann: bool = True,
+        embedding_cache: EmbeddingCache | None = None,
+    ) -> None:
         self._index_dir = index_dir
-        self._embeddings, self._entries, metadata = load_index_bundle(index_dir)
+        self._embeddings, self._entries, metadata = load_index_bundle(index_dir, mmap_mode=mmap_mode)
+        data_dir = bundle_data_dir(index_dir, metadata)
+        self._prefix_index = _SourcePrefixIndex(load_source_ranges(data_dir, self._entries), len(self._entries))
         encoder_meta = metadata.get("encoder")
         if not isinstance(encoder_meta, dict):
             raise RuntimeError(f"Invalid encoder metadata in {METADATA_FILENAME}")
         self._encoder = encoder_from_config(EncoderConfig.from_dict(encoder_meta))
+        if embedding_cache is not None:
+            self._encoder = CachedEncoder(self._encoder, embedding_cache)
         self._metadata = metadata
 
+        self._ann: BaseAnnIndex | None = None
+        ann_meta = metadata.get("ann")
+        if use_ann and isinstance(ann_meta, dict):
+            try:
+                self._ann = load_ann_index(data_dir, ann_meta, self._embeddings)
+            except (ImportError, OSError, ValueError) as exc:
+                LOGGER.warning("ANN index unavailable, using exact search: %s", exc)
+
     @property
     def metadata(self) -> dict[str, object]:
         return dict(self._metadata)
 
     def query(self, query: str, scope: Sequence[str] | None = None, top_k: int = 5) -> list[NarrativeResult]:
-        if not query.strip():
+        return self.query_many([query], scope=scope, top_k=top_k)[0]
+
+    def query_many(
+        self,
+        queries: Sequence[str],
+        scope: Sequence[str] | None = None,
+        top_k: int = 5,
+        exact: bool = False,
+    ) -> list[list[NarrativeResult]]:
+        """Answer several queries with one encoder call and one matrix multiply.
+
+        Unscoped queries go through the ANN index when one was built, unless
+        ``exact`` is set; scoped queries always score their rows exactly.
+        """
+        if not queries:
+            return []
+        if any(not query.strip() for query in queries):
             raise ValueError("Query text must not be empty")
+        if top_k <= 0:
+            return [[] for _ in queries]
 
-        query_vector = self._encoder.encode([query])[0]
-        scores = (self._embeddings * query_vector).sum(axis=1)
-
-        mask = np.ones(len(self._entries), dtype=bool)
+        rows: np.ndarray | None = None
         scope_filters = _normalise_scope(scope)
         if scope_filters:
-            mask = np.array(
-                [
-                    any(entry["source_file"].startswith(prefix) for prefix in scope_filters)
-                    for entry in self._entries
-                ],
-                dtype=bool,
-            )
-            if not mask.any():
+            rows = self._prefix_index.rows_for(scope_filters)
+            if rows is not None and not len(rows):
                 LOGGER.info("Scope %s matched no documents", scope_filters)
-                return []
-
-        ranked_indices = np.argsort(scores)[::-1]
-        results: list[NarrativeResult] = []
-        for idx in ranked_indices:
-            if not mask[idx]:
-                continue
-            entry = self._entries[idx]
-            results.append(
-                NarrativeResult(
-                    source_file=str(entry["source_file"]),
-                    content=str(entry["content"]),
-                    score=float(scores[idx]),
-                )
-            )
-            if len(results) >= top_k:
-                break
-        return results
+                return [[] for _ in queries]
+
+        query_vectors = np.asarray(self._encoder.encode(list(queries)), dtype=np.float32)
+        if rows is None and self._ann is not None and not exact:
+            indices, ann_scores = self._ann.search(query_vectors, top_k)
+            return [
+                [self._result(int(idx), float(score)) for idx, score in zip(row_indices, row_scores) if idx >= 0]
+                for row_indices, row_scores in zip(indices, ann_scores)
+            ]
+
+        candidates = self._embeddings if rows is None else self._embeddings[rows]
+        scores = np.asarray(candidates @ query_vectors.T)
+
+        batch: list[list[NarrativeResult]] = []
+        for column in range(len(queries)):
+            column_scores = scores[:, column]
+            results: list[NarrativeResult] = []
+            for position in _top_k(column_scores, top_k):
+                idx = int(position) if rows is None else int(rows[position])
+                results.append(self._result(idx, float(column_scores[position])))
+            batch.append(results)
+        return batch
+
+    def _result(self, idx: int, score: float) -> NarrativeResult:
+        entry = self._entries[idx]
+        return NarrativeResult(
+            source_file=str(entry["source_file"]),
+            content=str(entry["content"]),
+            score=score,
+        )
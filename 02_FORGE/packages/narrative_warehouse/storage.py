@@ -2,14 +2,54 @@
 from __future__ import annotations
 
 import json
+import mmap
+import os
+import shutil
+import time
+import uuid
 from pathlib import Path
-from typing import Any, Iterable
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
 
 import numpy as np
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .ann import BaseAnnIndex
+
 METADATA_FILENAME = "metadata.json"
 ENTRIES_FILENAME = "entries.jsonl"
 EMBEDDINGS_FILENAME = "embeddings.npy"
+FILES_FILENAME = "files.json"
+OFFSETS_FILENAME = "entries.offsets.npy"
+SOURCES_FILENAME = "sources.json"
+GENERATIONS_DIRNAME = "generations"
+
+
+def _temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.tmp")
+
+
+def bundle_data_dir(index_dir: Path, metadata: dict[str, Any]) -> Path:
+    """Directory holding the artefacts described by ``metadata``.
+
+    Bundles are written as ``generations/<id>/`` and published by replacing the
+    top-level ``metadata.json``, whose ``generation`` key names the live one.
+    Bundles written before generations existed keep their files in
+    ``index_dir`` itself.
+    """
+    generation = metadata.get("generation")
+    return index_dir / GENERATIONS_DIRNAME / str(generation) if generation else index_dir
+
+
+def _read_metadata(index_dir: Path) -> dict[str, Any]:
+    with (index_dir / METADATA_FILENAME).open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _extend_source_runs(sources: list[dict[str, Any]], row: int, source_file: str) -> None:
+    if sources and sources[-1]["source_file"] == source_file:
+        sources[-1]["stop"] = row + 1
+    else:
+        sources.append({"source_file": source_file, "start": row, "stop": row + 1})
 
 
 def save_index_bundle(
@@ -17,28 +57,190 @@ def save_index_bundle(
     embeddings: np.ndarray,
     entries: Iterable[dict[str, Any]],
     metadata: dict[str, Any],
+    files: dict[str, dict[str, Any]] | None = None,
+    ann: "BaseAnnIndex | None" = None,
 ) -> None:
+    """Persist an index bundle.
+
+    Every artefact is written into a fresh ``generations/<id>/`` directory that
+    no reader knows about yet; the bundle is then published with a single
+    ``os.replace`` of the top-level ``metadata.json`` naming that generation,
+    so readers see either the whole old bundle or the whole new one. The
+    generation being replaced is kept for readers that resolved it just before
+    the swap; older ones are removed.
+    """
     output_dir.mkdir(parents=True, exist_ok=True)
-    np.save(output_dir / EMBEDDINGS_FILENAME, embeddings)
+    try:
+        previous = _read_metadata(output_dir).get("generation")
+    except (OSError, ValueError):
+        previous = None
+    generation = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+    metadata = {**metadata, "generation": generation}
+    data_dir = bundle_data_dir(output_dir, metadata)
+    data_dir.mkdir(parents=True)
+    try:
+        _write_bundle_files(data_dir, embeddings, entries, metadata, files, ann)
+        metadata_path = output_dir / METADATA_FILENAME
+        with _temp_path(metadata_path).open("w", encoding="utf-8") as handle:
+            json.dump(metadata, handle, indent=2)
+        os.replace(_temp_path(metadata_path), metadata_path)
+    except BaseException:
+        shutil.rmtree(data_dir, ignore_errors=True)
+        raise
+    _prune_generations(output_dir, keep={generation, previous})
+
+
+def _write_bundle_files(
+    data_dir: Path,
+    embeddings: np.ndarray,
+    entries: Iterable[dict[str, Any]],
+    metadata: dict[str, Any],
+    files: dict[str, dict[str, Any]] | None,
+    ann: "BaseAnnIndex | None",
+) -> None:
+    with (data_dir / EMBEDDINGS_FILENAME).open("wb") as handle:
+        np.save(handle, np.ascontiguousarray(embeddings, dtype=np.float32))
+
+    offsets = [0]
+    sources: list[dict[str, Any]] = []
+    with (data_dir / ENTRIES_FILENAME).open("wb") as handle:
+        for row, entry in enumerate(entries):
+            line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+            handle.write(line)
+            offsets.append(offsets[-1] + len(line))
+            _extend_source_runs(sources, row, str(entry.get("source_file", "")))
+
+    with (data_dir / OFFSETS_FILENAME).open("wb") as handle:
+        np.save(handle, np.asarray(offsets, dtype=np.uint64))
 
-    with (output_dir / ENTRIES_FILENAME).open("w", encoding="utf-8") as handle:
-        for entry in entries:
-            handle.write(json.dumps(entry, ensure_ascii=False))
-            handle.write("\n")
+    with (data_dir / SOURCES_FILENAME).open("w", encoding="utf-8") as handle:
+        json.dump(sources, handle, ensure_ascii=False)
 
-    with (output_dir / METADATA_FILENAME).open("w", encoding="utf-8") as handle:
+    if files is not None:
+        with (data_dir / FILES_FILENAME).open("w", encoding="utf-8") as handle:
+            json.dump(files, handle, indent=2, sort_keys=True)
+
+    if ann is not None:
+        ann.save(data_dir / ann.filename)
+
+    with (data_dir / METADATA_FILENAME).open("w", encoding="utf-8") as handle:
         json.dump(metadata, handle, indent=2)
 
 
-def load_index_bundle(index_dir: Path) -> tuple[np.ndarray, list[dict[str, Any]], dict[str, Any]]:
-    embeddings = np.load(index_dir / EMBEDDINGS_FILENAME)
-    entries: list[dict[str, Any]] = []
-    with (index_dir / ENTRIES_FILENAME).open("r", encoding="utf-8") as handle:
+def _prune_generations(output_dir: Path, keep: set[str | None]) -> None:
+    """Remove superseded generations and artefacts left by the flat layout."""
+    for name in (EMBEDDINGS_FILENAME, ENTRIES_FILENAME, OFFSETS_FILENAME, SOURCES_FILENAME, FILES_FILENAME):
+        (output_dir / name).unlink(missing_ok=True)
+    with os.scandir(output_dir / GENERATIONS_DIRNAME) as generations:
+        for entry in generations:
+            if entry.name not in keep:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+
+class EntryStore(Sequence[dict[str, Any]]):
+    """Read-only, memory-mapped view over ``entries.jsonl``.
+
+    Rows are located through the byte offsets in ``entries.offsets.npy`` and
+    only decoded when accessed, so opening an index costs the same regardless
+    of how many chunks it holds and every process shares the page cache.
+    """
+
+    def __init__(self, entries_path: Path, offsets: np.ndarray) -> None:
+        self._path = entries_path
+        self._offsets = offsets
+        with entries_path.open("rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            self._buffer: mmap.mmap | bytes = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    @classmethod
+    def open(cls, index_dir: Path) -> "EntryStore":
+        """Open the entries stored directly in ``index_dir`` (see :func:`bundle_data_dir`)."""
+        entries_path = index_dir / ENTRIES_FILENAME
+        offsets_path = index_dir / OFFSETS_FILENAME
+        if offsets_path.exists():
+            offsets = np.load(offsets_path, mmap_mode="r")
+        else:
+            offsets = _scan_offsets(entries_path)
+        return cls(entries_path, offsets)
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, index: int) -> dict[str, Any]:  # type: ignore[override]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start = int(self._offsets[index])
+        stop = int(self._offsets[index + 1])
+        return json.loads(self._buffer[start:stop])
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+def _scan_offsets(entries_path: Path) -> np.ndarray:
+    """Build row offsets for bundles written before ``entries.offsets.npy`` existed."""
+    offsets = [0]
+    position = 0
+    with entries_path.open("rb") as handle:
         for line in handle:
+            position += len(line)
             if line.strip():
-                entries.append(json.loads(line))
+                offsets.append(position)
+            else:
+                offsets[-1] = position
+    return np.asarray(offsets, dtype=np.uint64)
+
+
+def load_source_ranges(data_dir: Path, entries: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return contiguous ``{source_file, start, stop}`` row runs for the bundle in ``data_dir``."""
+    path = data_dir / SOURCES_FILENAME
+    if path.exists():
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    sources: list[dict[str, Any]] = []
+    for row, entry in enumerate(entries):
+        _extend_source_runs(sources, row, str(entry.get("source_file", "")))
+    return sources
 
-    with (index_dir / METADATA_FILENAME).open("r", encoding="utf-8") as handle:
-        metadata = json.load(handle)
+
+def load_index_bundle(
+    index_dir: Path,
+    mmap_mode: str | None = None,
+) -> tuple[np.ndarray, Sequence[dict[str, Any]], dict[str, Any]]:
+    """Load an index bundle.
+
+    With ``mmap_mode`` (e.g. ``"r"``) the embeddings matrix is memory-mapped and
+    entries are returned as a lazily decoded :class:`EntryStore`; otherwise
+    everything is read into memory as before. The top-level metadata is read
+    first and pins the generation every other artefact is loaded from.
+    """
+    metadata = _read_metadata(index_dir)
+    data_dir = bundle_data_dir(index_dir, metadata)
+    embeddings = np.load(data_dir / EMBEDDINGS_FILENAME, mmap_mode=mmap_mode)
+    entries: Sequence[dict[str, Any]]
+    if mmap_mode:
+        entries = EntryStore.open(data_dir)
+    else:
+        entries = []
+        with (data_dir / ENTRIES_FILENAME).open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    entries.append(json.loads(line))
 
     return embeddings, entries, metadata
+
+
+def load_file_manifest(data_dir: Path) -> dict[str, dict[str, Any]]:
+    """Return the per-file manifest written by incremental builds (empty if absent)."""
+    path = data_dir / FILES_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
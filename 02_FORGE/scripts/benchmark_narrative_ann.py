@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Measure recall@k and latency of Narrative Warehouse ANN backends against exact search."""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PACKAGES_DIR = SCRIPT_DIR.parent / "packages"
+if str(PACKAGES_DIR) not in sys.path:
+    sys.path.insert(0, str(PACKAGES_DIR))
+
+import numpy as np
+
+from narrative_warehouse.ann import available_backends, build_ann_index, recall_at_k, sample_queries
+from narrative_warehouse.storage import load_index_bundle
+
+LOGGER = logging.getLogger(__name__)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--index-dir", type=Path, default=None, help="Benchmark an existing index bundle.")
+    parser.add_argument("--synthetic", type=int, default=50000, help="Synthetic corpus size when no index is given.")
+    parser.add_argument("--dimension", type=int, default=384, help="Synthetic embedding dimension.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of benchmark queries.")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, action="append", default=None, help="IVF nprobe values to sweep.")
+    parser.add_argument("--backend", action="append", default=None, help="Backends to test (default: all installed).")
+    return parser.parse_args()
+
+
+def _synthetic_embeddings(count: int, dimension: int, clusters: int = 256, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    data = centres[rng.integers(0, clusters, size=count)] + 0.6 * rng.standard_normal((count, dimension)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    args = parse_args()
+
+    if args.index_dir:
+        embeddings, _, _ = load_index_bundle(args.index_dir, mmap_mode="r")
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+    else:
+        embeddings = _synthetic_embeddings(args.synthetic, args.dimension)
+    queries = sample_queries(embeddings, args.queries)
+    LOGGER.info("Benchmarking %d vectors x %d dims, %d queries", len(embeddings), embeddings.shape[1], len(queries))
+
+    report = []
+    for backend in args.backend or available_backends():
+        sweep = (args.nprobe or [1, 4, 8, 16, 32]) if backend in ("ivf", "faiss") else [None]
+        # nprobe only affects search, so each backend is trained once and swept in place.
+        started = time.perf_counter()
+        index = build_ann_index(embeddings, backend=backend)
+        build_seconds = time.perf_counter() - started
+        for nprobe in sweep:
+            if nprobe:
+                index.nprobe = nprobe
+            stats = recall_at_k(index, embeddings, queries, top_k=args.top_k)
+            row = {**index.config(), "build_seconds": round(build_seconds, 3), **{k: round(v, 4) for k, v in stats.items()}}
+            report.append(row)
+            LOGGER.info(
+                "%s nprobe=%s: recall@%d=%.3f ann=%.3fms exact=%.3fms",
+                backend,
+                nprobe,
+                args.top_k,
+                stats["recall"],
+                stats["ann_ms_per_query"],
+                stats["exact_ms_per_query"],
+            )
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 """Build the Narrative Warehouse semantic index."""
 from __future__ import annotations
 
+import argparse
 import logging
 import sys
 from pathlib import Path
@@ -11,13 +12,36 @@ PACKAGES_DIR = SCRIPT_DIR.parent / "packages"
 if str(PACKAGES_DIR) not in sys.path:
     sys.path.insert(0, str(PACKAGES_DIR))
 
+from narrative_warehouse.cache import EmbeddingCache
 from narrative_warehouse.indexer import build_index
 
 LOGGER = logging.getLogger(__name__)
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the Narrative Warehouse semantic index.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-encode every document instead of reusing unchanged files from the existing index.",
+    )
+    parser.add_argument(
+        "--ann",
+        choices=("auto", "ivf", "faiss", "hnswlib"),
+        default=None,
+        help="Also build an approximate nearest-neighbour index with the given backend.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or populate the shared embedding cache.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    args = parse_args()
 
     workspace_root = SCRIPT_DIR.parents[1]  # /srv/janus
     output_dir = workspace_root / "03_OPERATIONS" / "vessels" / "localhost" / "state" / "narrative_warehouse.index"
@@ -37,12 +61,16 @@ def main() -> None:
         preferred_model="sentence-transformers/all-MiniLM-L6-v2",
         extensions=(".md", ".txt"),
         max_words=220,
+        incremental=not args.full,
+        ann_backend=args.ann,
+        embedding_cache=None if args.no_cache else EmbeddingCache(),
     )
 
     LOGGER.info(f"✅ Index built successfully!")
     LOGGER.info(f"   Entries: {metadata['entry_count']}")
     LOGGER.info(f"   Scope: {', '.join(metadata['scope'])}")
     LOGGER.info(f"   Created: {metadata['created_at']}")
+    LOGGER.info(f"   Chunks encoded: {metadata['build']['chunks_encoded']}")
 
 
 if __name__ == "__main__":
@@ -12,7 +12,7 @@ PACKAGES_DIR = SCRIPT_DIR.parent / "packages"
 if str(PACKAGES_DIR) not in sys.path:
     sys.path.insert(0, str(PACKAGES_DIR))
 
-from narrative_warehouse import NarrativeQueryEngine
+from narrative_warehouse import EmbeddingCache, NarrativeQueryEngine
 
 LOGGER = logging.getLogger(__name__)
 
@@ -38,6 +38,11 @@ def parse_args() -> argparse.Namespace:
         default=5,
         help="Maximum number of results to return.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or populate the shared embedding cache.",
+    )
     return parser.parse_args()
 
 
@@ -50,7 +55,7 @@ def main() -> None:
     if not index_dir.exists():
         raise SystemExit(f"Index directory {index_dir} does not exist. Build the index with build_narrative_index.py first.")
 
-    engine = NarrativeQueryEngine(index_dir=index_dir)
+    engine = NarrativeQueryEngine(index_dir=index_dir, embedding_cache=None if args.no_cache else EmbeddingCache())
     results = engine.query(query=args.query, scope=args.scope, top_k=args.top_k)
     payload = {
         "query": args.query,
@@ -0,0 +1,381 @@
+"""Unit tests for the narrative warehouse index bundle, indexer and search."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from narrative_warehouse.ann import (
+    IVFIndex,
+    available_backends,
+    build_ann_index,
+    exact_search,
+    load_ann_index,
+    recall_at_k,
+    sample_queries,
+)
+from narrative_warehouse.cache import CachedEncoder, EmbeddingCache, cache_namespace, content_hash
+from narrative_warehouse.encoder import HashingEncoder, _stable_hash, _tokenize
+from narrative_warehouse.indexer import build_index
+from narrative_warehouse.query_engine import NarrativeQueryEngine, _top_k
+from narrative_warehouse.storage import (
+    ENTRIES_FILENAME,
+    GENERATIONS_DIRNAME,
+    METADATA_FILENAME,
+    EntryStore,
+    bundle_data_dir,
+    load_file_manifest,
+    load_index_bundle,
+    save_index_bundle,
+)
+
+
+class _WarehouseTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _save(self, index_dir, rows, tag="v"):
+        embeddings = np.eye(max(rows, 1), 4, dtype=np.float32)[:rows]
+        entries = [{"source_file": f"doc-{row % 2}.md", "content": f"{tag} {row}"} for row in range(rows)]
+        save_index_bundle(index_dir, embeddings, entries, {"tag": tag}, files={"doc-0.md": {"chunks": rows}})
+        return embeddings, entries
+
+
+class TestIndexBundle(_WarehouseTestCase):
+    def test_save_publishes_one_generation(self):
+        index_dir = self.root / "index"
+        embeddings, entries = self._save(index_dir, 3)
+
+        loaded, loaded_entries, metadata = load_index_bundle(index_dir)
+        self.assertEqual(metadata["tag"], "v")
+        np.testing.assert_array_equal(loaded, embeddings)
+        self.assertEqual(loaded_entries, entries)
+        data_dir = bundle_data_dir(index_dir, metadata)
+        self.assertEqual(data_dir.parent, index_dir / GENERATIONS_DIRNAME)
+        self.assertEqual(load_file_manifest(data_dir), {"doc-0.md": {"chunks": 3}})
+        self.assertFalse((index_dir / ENTRIES_FILENAME).exists())
+
+    def test_resolved_generation_survives_next_save(self):
+        index_dir = self.root / "index"
+        self._save(index_dir, 2, tag="first")
+        _, _, first = load_index_bundle(index_dir)
+        self._save(index_dir, 5, tag="second")
+
+        # A reader that resolved the first generation before the swap can still open it.
+        old_dir = bundle_data_dir(index_dir, first)
+        self.assertEqual(json.loads((old_dir / METADATA_FILENAME).read_text())["tag"], "first")
+        embeddings, entries, metadata = load_index_bundle(index_dir, mmap_mode="r")
+        self.assertEqual((metadata["tag"], len(entries), len(embeddings)), ("second", 5, 5))
+
+        self._save(index_dir, 1, tag="third")
+        self.assertFalse(old_dir.exists())
+        self.assertEqual(len(list((index_dir / GENERATIONS_DIRNAME).iterdir())), 2)
+
+    def test_failed_save_keeps_published_bundle(self):
+        index_dir = self.root / "index"
+        self._save(index_dir, 2, tag="good")
+
+        def entries():
+            yield {"source_file": "a.md", "content": "partial"}
+            raise RuntimeError("encoder crashed")
+
+        with self.assertRaises(RuntimeError):
+            save_index_bundle(index_dir, np.zeros((1, 4), dtype=np.float32), entries(), {"tag": "bad"})
+        _, loaded_entries, metadata = load_index_bundle(index_dir)
+        self.assertEqual((metadata["tag"], len(loaded_entries)), ("good", 2))
+        self.assertEqual(len(list((index_dir / GENERATIONS_DIRNAME).iterdir())), 1)
+
+    def test_flat_layout_still_loads(self):
+        index_dir = self.root / "legacy"
+        index_dir.mkdir()
+        np.save(index_dir / "embeddings.npy", np.ones((1, 4), dtype=np.float32))
+        (index_dir / ENTRIES_FILENAME).write_text(json.dumps({"source_file": "a.md", "content": "x"}) + "\n")
+        (index_dir / METADATA_FILENAME).write_text(json.dumps({"tag": "flat"}))
+
+        _, entries, metadata = load_index_bundle(index_dir, mmap_mode="r")
+        self.assertEqual(bundle_data_dir(index_dir, metadata), index_dir)
+        self.assertEqual(list(entries), [{"source_file": "a.md", "content": "x"}])
+
+
+class TestEntryStore(_WarehouseTestCase):
+    def test_matches_eager_entries(self):
+        index_dir = self.root / "index"
+        self._save(index_dir, 7)
+        _, eager, metadata = load_index_bundle(index_dir)
+        store = EntryStore.open(bundle_data_dir(index_dir, metadata))
+
+        self.assertEqual(len(store), 7)
+        self.assertEqual(list(store), eager)
+        self.assertEqual(store[-1], eager[-1])
+        with self.assertRaises(IndexError):
+            store[7]
+
+    def test_offsets_rebuilt_without_offsets_file(self):
+        index_dir = self.root / "legacy"
+        index_dir.mkdir()
+        rows = [{"content": "caf\u00e9"}, {"content": "two"}, {"content": "three"}]
+        lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+        (index_dir / ENTRIES_FILENAME).write_text(lines[0] + "\n\n" + lines[1] + "\n" + lines[2], encoding="utf-8")
+
+        store = EntryStore.open(index_dir)
+        self.assertEqual(list(store), rows)
+
+    def test_empty_entries_file(self):
+        index_dir = self.root / "empty"
+        self._save(index_dir, 0)
+        embeddings, entries, _ = load_index_bundle(index_dir, mmap_mode="r")
+        self.assertEqual((len(entries), embeddings.shape), (0, (0, 4)))
+
+
+class TestQueryEngine(_WarehouseTestCase):
+    def _engine(self, rows=60, **kwargs):
+        encoder = HashingEncoder(dimension=64)
+        words = ["lion", "grant", "deadline", "forge", "river", "budget", "sanctuary", "oracle"]
+        folders = ("docs", "ops", "docs/sub")
+        entries = [
+            {
+                "source_file": f"{folders[row % 3]}/file-{row % 7}.md",
+                "content": " ".join(words[row % 8 :] + words[: row % 5]),
+            }
+            for row in range(rows)
+        ]
+        entries.sort(key=lambda entry: entry["source_file"])
+        embeddings = encoder.encode([entry["content"] for entry in entries])
+        save_index_bundle(self.root / "index", embeddings, entries, {"encoder": encoder.config.to_dict()})
+        return NarrativeQueryEngine(self.root / "index", **kwargs), encoder, embeddings, entries
+
+    def _brute_force(self, encoder, embeddings, entries, query, top_k, prefix=""):
+        scores = embeddings @ encoder.encode([query])[0]
+        rows = [row for row, entry in enumerate(entries) if entry["source_file"].startswith(prefix)]
+        rows.sort(key=lambda row: -scores[row])
+        return [(entries[row]["source_file"], round(float(scores[row]), 5)) for row in rows[:top_k]]
+
+    def test_top_k_matches_full_sort(self):
+        scores = np.random.default_rng(3).integers(0, 5, size=200).astype(np.float32)
+        full = np.argsort(-scores, kind="stable")
+        for k in (1, 7, 199, 200, 500):
+            picked = _top_k(scores, k)
+            self.assertEqual(len(picked), min(k, 200))
+            np.testing.assert_array_equal(scores[picked], scores[full[: len(picked)]])
+
+    def test_query_many_matches_brute_force(self):
+        engine, encoder, embeddings, entries = self._engine()
+        queries = ["lion sanctuary", "grant budget deadline"]
+        for results, query in zip(engine.query_many(queries, top_k=5), queries):
+            expected = self._brute_force(encoder, embeddings, entries, query, 5)
+            self.assertEqual([round(result.score, 5) for result in results], [score for _, score in expected])
+
+    def test_scoped_query_only_returns_scope_rows(self):
+        engine, encoder, embeddings, entries = self._engine()
+        results = engine.query("oracle river", scope=["./docs/sub"], top_k=4)
+        expected = self._brute_force(encoder, embeddings, entries, "oracle river", 4, prefix="docs/sub")
+        self.assertEqual([(result.source_file, round(result.score, 5)) for result in results], expected)
+        self.assertEqual(engine.query("oracle", scope=["missing/"]), [])
+        self.assertEqual(engine.query_many([]), [])
+        with self.assertRaises(ValueError):
+            engine.query(" ")
+
+
+class TestHashingEncoder(unittest.TestCase):
+    TEXTS = ["Lion Sanctuary, grant deadline 2025!", "", "naïve café_menu", "forge " * 50] * 7
+
+    def test_matches_per_token_reference(self):
+        encoded = HashingEncoder(dimension=32).encode(self.TEXTS)
+        for text, vector in zip(self.TEXTS, encoded):
+            expected = np.zeros(32, dtype=np.float32)
+            for token in _tokenize(text):
+                expected[_stable_hash(token) % 32] += 1
+            norm = np.linalg.norm(expected)
+            np.testing.assert_allclose(vector, expected / norm if norm else expected, rtol=1e-6)
+
+    def test_parallel_encoding_matches_serial(self):
+        serial = HashingEncoder(dimension=64).encode(self.TEXTS)
+        parallel = HashingEncoder(dimension=64, workers=3, parallel_threshold=4).encode(self.TEXTS)
+        self.assertEqual(parallel.dtype, np.float32)
+        np.testing.assert_array_equal(parallel, serial)
+
+
+class _CountingEncoder(HashingEncoder):
+    def __init__(self):
+        super().__init__(dimension=16)
+        self.encoded = []
+
+    def encode(self, texts):
+        texts = list(texts)
+        self.encoded.extend(texts)
+        return super().encode(texts)
+
+
+class TestEmbeddingCache(_WarehouseTestCase):
+    def _cache(self, **kwargs):
+        cache = EmbeddingCache(self.root / "cache" / "embeddings.sqlite3", **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_cached_encoder_embeds_each_text_once(self):
+        cache = self._cache()
+        inner = _CountingEncoder()
+        encoder = CachedEncoder(inner, cache)
+        first = encoder.encode(["alpha", "beta", "alpha"])
+        second = encoder.encode(["beta", "gamma", "alpha"])
+
+        self.assertEqual(inner.encoded, ["alpha", "beta", "gamma"])
+        np.testing.assert_array_equal(first[[0, 1]], second[[2, 0]])
+        np.testing.assert_array_equal(first, HashingEncoder(dimension=16).encode(["alpha", "beta", "alpha"]))
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(encoder.encode([]).shape[0], 0)
+
+    def test_entries_are_shared_through_the_database(self):
+        inner = _CountingEncoder()
+        CachedEncoder(inner, self._cache()).encode(["alpha", "beta"])
+        reader = self._cache()
+        self.assertEqual(reader._connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        reopened = _CountingEncoder()
+        CachedEncoder(reopened, reader).encode(["beta", "alpha"])
+        self.assertEqual(reopened.encoded, [])
+        # Namespaces keep encoder configurations apart.
+        other = HashingEncoder(dimension=8)
+        self.assertNotEqual(cache_namespace(other.config.to_dict()), cache_namespace(inner.config.to_dict()))
+        self.assertEqual(reader.get_many(cache_namespace(other.config.to_dict()), [content_hash("alpha")]), [None])
+
+    def test_hot_tier_and_database_are_bounded(self):
+        cache = self._cache(max_entries=10, hot_entries=4)
+        vectors = np.eye(16, dtype=np.float32)
+        hashes = [f"h{index:02d}" for index in range(16)]
+        cache.put_many("ns", hashes[:8], vectors[:8])
+        self.assertEqual(list(cache._hot), [("ns", digest) for digest in hashes[4:8]])
+
+        # Touch the oldest rows so the least-recently-used ones are evicted instead.
+        cache.get_many("ns", hashes[:2])
+        cache.put_many("ns", hashes[8:], vectors[8:])
+        self.assertEqual(len(cache), 10)
+        survivors = cache.get_many("ns", hashes)
+        self.assertEqual([digest for digest, vector in zip(hashes, survivors) if vector is not None], hashes[:2] + hashes[8:])
+        np.testing.assert_array_equal(survivors[0], vectors[0])
+
+
+def _clustered(count=2000, dimension=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((32, dimension)).astype(np.float32)
+    data = centres[rng.integers(0, 32, size=count)] + 0.3 * rng.standard_normal((count, dimension)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+class TestAnnBackends(_WarehouseTestCase):
+    def test_ivf_probing_every_list_is_exact(self):
+        embeddings = _clustered()
+        queries = sample_queries(embeddings, 25)
+        index = IVFIndex.build(embeddings, nlist=20, nprobe=1)
+        self.assertEqual(index.config()["nprobe"], 1)
+
+        # nprobe is a search-time knob: raising it needs no rebuild.
+        index.nprobe = 1000
+        self.assertEqual(index.nprobe, 20)
+        indices, scores = index.search(queries, 10)
+        np.testing.assert_array_equal(indices, exact_search(embeddings, queries, 10))
+        self.assertTrue(np.all(np.diff(scores, axis=1) <= 1e-6))
+        self.assertEqual(recall_at_k(index, embeddings, queries)["recall"], 1.0)
+
+    def test_ivf_pads_short_results(self):
+        embeddings = _clustered(count=5)
+        indices, scores = IVFIndex.build(embeddings, nlist=5, nprobe=1).search(embeddings[:1], 4)
+        found = indices[0] >= 0
+        self.assertEqual(indices[0, 0], 0)
+        self.assertTrue(np.all(np.isneginf(scores[0, ~found])))
+        with self.assertRaises(ValueError):
+            IVFIndex.build(np.zeros((0, 4), dtype=np.float32))
+
+    def test_saved_index_round_trips(self):
+        embeddings = _clustered(count=500)
+        queries = sample_queries(embeddings, 10)
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                index = build_ann_index(embeddings, backend=backend)
+                path = self.root / index.filename
+                index.save(path)
+                loaded = load_ann_index(self.root, index.config(), embeddings)
+                np.testing.assert_array_equal(loaded.search(queries, 5)[0], index.search(queries, 5)[0])
+        with self.assertRaises(ValueError):
+            build_ann_index(embeddings, backend="annoy")
+
+    @unittest.skipUnless("faiss" in available_backends(), "faiss not installed")
+    def test_faiss_nprobe_reaches_index(self):
+        index = build_ann_index(_clustered(), backend="faiss", nlist=20, nprobe=2)
+        index.nprobe = 20
+        self.assertEqual(index.config()["nprobe"], 20)
+
+    def test_query_engine_uses_ann_for_unscoped_queries(self):
+        docs = self.root / "workspace" / "docs"
+        docs.mkdir(parents=True)
+        for index in range(30):
+            (docs / f"note-{index}.md").write_text(f"note {index} about topic {index % 4} " * 5, encoding="utf-8")
+        build_index(self.root / "workspace", self.root / "index", ["docs"], preferred_model=None, ann_backend="ivf")
+
+        engine = NarrativeQueryEngine(self.root / "index")
+        self.assertEqual(engine.metadata["ann"]["backend"], "ivf")
+        approx = engine.query("note about topic 2", top_k=3)
+        exact = engine.query_many(["note about topic 2"], top_k=3, exact=True)[0]
+        self.assertEqual(approx[0].source_file, exact[0].source_file)
+
+
+class TestIncrementalBuild(_WarehouseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.docs = self.root / "workspace" / "docs"
+        self.docs.mkdir(parents=True)
+        for name, words in (("alpha.md", 500), ("beta.md", 300), ("gamma.txt", 40)):
+            (self.docs / name).write_text(" ".join(f"{name}-{index}" for index in range(words)), encoding="utf-8")
+
+    def _build(self, name, incremental):
+        output_dir = self.root / name
+        metadata = build_index(
+            self.root / "workspace",
+            output_dir,
+            include_paths=["docs"],
+            preferred_model=None,
+            max_words=64,
+            incremental=incremental,
+        )
+        embeddings, entries, _ = load_index_bundle(output_dir)
+        return metadata, embeddings, entries
+
+    def test_incremental_rebuild_matches_full_rebuild(self):
+        self._build("incremental", incremental=False)
+        (self.docs / "beta.md").write_text("rewritten beta " * 200, encoding="utf-8")
+        (self.docs / "gamma.txt").unlink()
+        (self.docs / "delta.md").write_text("new delta document", encoding="utf-8")
+
+        metadata, embeddings, entries = self._build("incremental", incremental=True)
+        self.assertTrue(metadata["build"]["incremental"])
+        self.assertEqual(metadata["build"]["files_removed"], 1)
+        _, full_embeddings, full_entries = self._build("full", incremental=False)
+        self.assertEqual(entries, full_entries)
+        np.testing.assert_array_equal(embeddings, full_embeddings)
+
+    def test_unchanged_files_keep_their_rows(self):
+        _, before, before_entries = self._build("index", incremental=False)
+        (self.docs / "beta.md").write_text("rewritten beta " * 200, encoding="utf-8")
+
+        metadata, after, after_entries = self._build("index", incremental=True)
+        self.assertEqual(metadata["build"]["files_reused"], 2)
+        self.assertEqual(metadata["build"]["chunks_encoded"], sum(e["source_file"].endswith("beta.md") for e in after_entries))
+        for source in ("docs/alpha.md", "docs/gamma.txt"):
+            old_rows = [row for row, entry in enumerate(before_entries) if entry["source_file"] == source]
+            new_rows = [row for row, entry in enumerate(after_entries) if entry["source_file"] == source]
+            # entry_id is the row number, so only the content is carried over.
+            self.assertEqual(
+                [before_entries[row]["content"] for row in old_rows],
+                [after_entries[row]["content"] for row in new_rows],
+            )
+            np.testing.assert_array_equal(before[old_rows], after[new_rows])
+
+
+if __name__ == "__main__":
+    unittest.main()
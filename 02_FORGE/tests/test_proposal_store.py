@@ -0,0 +1,116 @@
+"""Unit tests for the ProposalEngine snapshot store and indexes."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from agent.novelty_index import minhash
+from agent.proposal_engine import ProposalEngine, ProposalStatus, RiskLevel
+
+
+class _ProposalTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.log_path = Path(self._tmp.name) / "proposals.jsonl"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _engine(self, **kwargs):
+        return ProposalEngine("test", self.log_path, **kwargs)
+
+    def _create(self, engine, action_type, rationale):
+        return engine.create_proposal(
+            mission_context="mission",
+            action_type=action_type,
+            rationale=rationale,
+            expected_outcome="",
+            risk_level=RiskLevel.LOW,
+            risk_mitigation="",
+            rollback_plan="",
+            tool_name="shell",
+            tool_args=["echo"],
+            enforce_novelty=False,
+        )
+
+    def _populate(self, engine):
+        ids = [self._create(engine, "Analysis", f"rationale {index}").proposal_id for index in range(6)]
+        engine.approve_proposal(ids[0])
+        engine.approve_proposal(ids[1])
+        engine.reject_proposal(ids[2], "no")
+        engine.mark_executing(ids[1])
+        engine.mark_completed(ids[1], {})
+        engine.approve_proposal(ids[3])
+        engine.mark_failed(ids[3], {})
+        return ids
+
+
+class TestProposalStore(_ProposalTestCase):
+    def test_indexes_follow_status_changes(self):
+        engine = self._engine()
+        ids = self._populate(engine)
+        self.assertEqual([p.proposal_id for p in engine.list_pending_approvals()], ids[4:])
+        self.assertEqual([p.proposal_id for p in engine.list_auto_approvable()], ids[4:])
+        self.assertEqual([p.proposal_id for p in engine.list_approved_pending_execution()], [ids[0]])
+        self.assertEqual(engine.get_approval_rate(), 0.5)
+        self.assertEqual(engine.get_failure_rate(), 0.5)
+
+    def test_restart_replays_only_tail_after_snapshot(self):
+        engine = self._engine(compact_every=5)
+        ids = self._populate(engine)
+        self.assertTrue(engine.snapshot_path.exists())
+        log_records = len(self.log_path.read_text().splitlines())
+        self.assertEqual(log_records, 13)
+
+        reloaded = self._engine(compact_every=5)
+        self.assertEqual(reloaded._tail_records, log_records % 5)
+        for proposal_id in ids:
+            self.assertEqual(reloaded.get_proposal(proposal_id).status, engine.get_proposal(proposal_id).status)
+        self.assertEqual(
+            [p.proposal_id for p in reloaded.list_pending_approvals()],
+            [p.proposal_id for p in engine.list_pending_approvals()],
+        )
+        self.assertEqual(reloaded.get_failure_rate(), 0.5)
+        self.assertEqual(reloaded.is_novel("analysis", "rationale 5")[2], ids[5])
+
+    def test_snapshot_ignored_when_log_replaced(self):
+        engine = self._engine(compact_every=5)
+        self._populate(engine)
+        lines = self.log_path.read_text().splitlines()
+        self.log_path.unlink()
+        self.log_path.write_text(lines[0] + "\n")
+
+        reloaded = self._engine(compact_every=5)
+        self.assertEqual(list(reloaded._proposals), [json.loads(lines[0])["proposal_id"]])
+        self.assertEqual(reloaded.get_proposal(json.loads(lines[0])["proposal_id"]).status, ProposalStatus.PROPOSED)
+
+
+class TestProposalNovelty(_ProposalTestCase):
+    def test_duplicates_found_across_full_history(self):
+        engine = self._engine()
+        original = self._create(engine, "analysis", "Survey the archive of lighthouse keeper journals for storm patterns")
+        for index in range(300):
+            self._create(engine, "analysis", f"Unrelated topic number {index:04d} about tidal {index * 7919:06d} charts")
+
+        is_new, similarity, duplicate = engine.is_novel(
+            "Analysis", "Survey the archive of lighthouse keeper journals for storm patterns again"
+        )
+        self.assertFalse(is_new)
+        self.assertGreaterEqual(similarity, 0.75)
+        self.assertEqual(duplicate, original.proposal_id)
+        self.assertTrue(engine.is_novel("reconnaissance", original.rationale)[0])
+        self.assertTrue(engine.is_novel("analysis", "Catalogue migratory bird sightings near the estuary")[0])
+
+    def test_signatures_persist_in_snapshot(self):
+        engine = self._engine(compact_every=3)
+        proposal = self._create(engine, "analysis", "Map the relationships between guild charters and trade routes")
+        for index in range(3):
+            self._create(engine, "analysis", f"Filler rationale {index:03d} describing something else entirely")
+        reloaded = self._engine(compact_every=3)
+        self.assertEqual(reloaded._novelty.signature(proposal.proposal_id), minhash(reloaded._tokens[proposal.proposal_id]))
+        self.assertEqual(reloaded.is_novel("analysis", proposal.rationale), (False, 1.0, proposal.proposal_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
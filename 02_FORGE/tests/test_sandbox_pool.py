@@ -0,0 +1,174 @@
+"""Unit tests for the pooled sandbox executor (runs without bubblewrap)."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from agent.config import SandboxPolicy, ToolConfig
+from agent.quality_gates import MissionQualityError, evaluate_node_generation_quality
+from agent.sandbox import CallLimits, SandboxConfig, SandboxExecutor
+from agent.sandbox_worker import DEFAULT_TAIL_OUTPUT_BYTES
+
+
+class _SandboxTestCase(unittest.TestCase):
+    """Executor over a temporary workspace without bubblewrap."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.config = SandboxConfig(
+            policy=SandboxPolicy(),
+            workspace_root=root / "workspaces",
+            bubblewrap_path=root / "no-bwrap",
+            max_calls_per_worker=3,
+        )
+        self.executor = SandboxExecutor(self.config)
+        self.tool = ToolConfig(name="echo", command=["echo"])
+
+    def tearDown(self):
+        self.executor.close()
+        self._tmp.cleanup()
+
+
+class TestSandboxWorkerPool(_SandboxTestCase):
+    """Exercises worker reuse, recycling and per-call limits."""
+
+    def test_workers_are_reused_then_recycled(self):
+        results = [self.executor(["echo", str(index)], self.tool) for index in range(4)]
+        self.assertEqual([result.stdout.strip() for result in results], ["0", "1", "2", "3"])
+        self.assertTrue(all(result.metadata["pooled"] for result in results))
+        self.assertEqual([result.metadata["worker_calls"] for result in results], [1, 2, 3, 1])
+        for result in results:
+            self.assertIn("setup_seconds", result.metadata)
+            self.assertIn("exec_seconds", result.metadata)
+            self.assertFalse(result.metadata["sandboxed"])
+
+    def test_policy_change_retires_workers(self):
+        self.executor(["true"], self.tool)
+        self.executor.force_block_network = True
+        result = self.executor(["true"], self.tool)
+        self.assertEqual(result.metadata["worker_calls"], 1)
+
+    def test_per_call_limits(self):
+        capped = self.executor(["head", "-c", "500000", "/dev/zero"], self.tool, CallLimits(max_output_bytes=100))
+        self.assertEqual(len(capped.stdout), 100)
+        self.assertEqual(capped.metadata["stdout_truncated_bytes"], 500000 - 100 - DEFAULT_TAIL_OUTPUT_BYTES)
+
+        slow = self.executor(["sleep", "5"], self.tool, CallLimits(timeout_seconds=0.2))
+        self.assertFalse(slow.ok)
+        self.assertTrue(slow.metadata["timed_out"])
+        self.assertLess(slow.metadata["exec_seconds"], 2)
+
+    def test_lost_worker_does_not_rerun_command(self):
+        marker = Path(self._tmp.name) / "runs.txt"
+        script = (
+            f"echo ran >> {marker}; "
+            "if tr '\\0' ' ' < /proc/$PPID/cmdline | grep -q sandbox_worker; then kill -9 $PPID; sleep 1; fi"
+        )
+        result = self.executor(["sh", "-c", script], self.tool)
+        self.assertFalse(result.ok)
+        self.assertIn("worker_error", result.metadata)
+        self.assertEqual(marker.read_text(), "ran\n")
+
+        after = self.executor(["echo", "again"], self.tool)
+        self.assertEqual(after.stdout, "again\n")
+        self.assertTrue(after.metadata["pooled"])
+
+    def test_one_shot_fallback(self):
+        self.config.worker_pool = False
+        result = self.executor(["echo", "direct"], self.tool)
+        self.assertEqual(result.stdout, "direct\n")
+        self.assertFalse(result.metadata["pooled"])
+
+        limited = self.executor(
+            ["sh", "-c", "ulimit -v; ulimit -t"], self.tool, CallLimits(memory_mb=512, cpu_seconds=7)
+        )
+        self.assertEqual(limited.stdout.split(), [str(512 * 1024), "7"])
+        missing = self.executor(["no-such-command-xyz"], self.tool, CallLimits(memory_mb=512))
+        self.assertEqual(missing.metadata["returncode"], 127)
+
+
+class TestStreamingCapture(_SandboxTestCase):
+    """Spill-to-file capture, streamed stderr scanning and lazy readers."""
+
+    def _run(self, script, **options):
+        limits = CallLimits(inline_output_bytes=1024, **options)
+        return self.executor(["python3", "-c", script], self.tool, limits, stderr_patterns=("core dumped",))
+
+    def test_large_output_spills(self):
+        for pool in (True, False):
+            self.config.worker_pool = pool
+            result = self._run("print('x' * 9999)")
+            capture = result.capture("stdout")
+            self.assertEqual(result.stdout, "x" * 1024)
+            self.assertTrue(capture.spilled)
+            self.assertEqual(capture.read_text(), "x" * 9999 + "\n")
+            self.assertEqual(result.metadata["stdout_bytes"], 10000)
+            self.assertFalse(result.capture("stderr").spilled)
+
+    def test_stderr_scanned_past_cap(self):
+        result = self._run(
+            "import sys; sys.stderr.write('e' * 400000 + ' CORE DUMPED')", max_output_bytes=2048
+        )
+        self.assertEqual(result.metadata["stderr_matches"], ["core dumped"])
+        dropped = 400012 - 2048 - DEFAULT_TAIL_OUTPUT_BYTES
+        self.assertEqual(result.metadata["stderr_truncated_bytes"], dropped)
+        capture = result.capture("stderr")
+        self.assertTrue(capture.truncated)
+        self.assertEqual(capture.head(2048), "e" * 2048)
+        self.assertIn(f"[... {dropped} bytes truncated ...]", capture.tail(DEFAULT_TAIL_OUTPUT_BYTES + 100))
+        self.assertTrue(capture.tail(100).endswith("e CORE DUMPED"))
+
+    def test_output_just_past_cap_is_kept_whole(self):
+        result = self._run("print('y' * 5000)", max_output_bytes=2048)
+        self.assertNotIn("stdout_truncated_bytes", result.metadata)
+        self.assertEqual(result.capture("stdout").read_text(), "y" * 5000 + "\n")
+
+    def test_quality_gate_reads_spilled_summary(self):
+        summary = {
+            "summary": {
+                "quality": {
+                    "generated": 10,
+                    "target_min": 10,
+                    "relationship_density": 0.5,
+                    "average_confidence": 0.9,
+                }
+            }
+        }
+        script = f"print('progress {{' * 50000); print({json.dumps(json.dumps(summary))})"
+        result = self._run(script)
+        self.assertTrue(result.capture("stdout").spilled)
+        evaluation = evaluate_node_generation_quality(result.capture("stdout"))
+        self.assertEqual(evaluation.quality["generated"], 10)
+
+        # Past the output limit the summary survives in the kept tail ...
+        truncated = self._run(script, max_output_bytes=4096)
+        self.assertTrue(truncated.capture("stdout").truncated)
+        evaluation = evaluate_node_generation_quality(truncated.capture("stdout"))
+        self.assertEqual(evaluation.quality["generated"], 10)
+
+        # ... and when it was dropped, the gate reports the truncation.
+        buried = f"print({json.dumps(json.dumps(summary))}); print('x' * 400000)"
+        with self.assertRaises(MissionQualityError) as caught:
+            evaluate_node_generation_quality(self._run(buried, max_output_bytes=4096).capture("stdout"))
+        self.assertEqual(caught.exception.code, "truncated_output")
+
+    def test_spill_files_are_released_and_pruned(self):
+        result = self._run("print('x' * 9999)")
+        path = Path(result.metadata["stdout_path"])
+        result.release_captures()
+        self.assertFalse(path.exists())
+        self.assertNotIn("stdout_path", result.metadata)
+
+        kept = Path(self._run("print('x' * 9999)").metadata["stdout_path"])
+        other = kept.parent / "report.log"
+        other.write_text("audit")
+        self.assertEqual(self.executor.prune_spills(), 0)
+        self.assertEqual(self.executor.prune_spills(now=kept.stat().st_mtime + self.config.spill_retention_seconds + 1), 1)
+        self.assertFalse(kept.exists())
+        self.assertTrue(other.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
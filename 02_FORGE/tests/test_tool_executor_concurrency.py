@@ -0,0 +1,125 @@
+"""Unit tests for ToolExecutionEngine concurrency slots and load admission."""
+
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from agent.config import SandboxPolicy, ToolConfig
+from agent.controls_client import SystemMetrics
+from agent.logging_utils import AuditLogger
+from agent.proposal_engine import ActionProposal, ProposalStatus, RiskLevel
+from agent.sandbox import SandboxConfig
+from agent.tool_executor import ExecutionLimits, ToolExecutionEngine
+
+
+class _FakeControls:
+    def __init__(self, load: float = 0.0, memory_percent: float = 10.0):
+        self.load = load
+        self.memory_percent = memory_percent
+
+    def collect_system_metrics(self) -> SystemMetrics:
+        return SystemMetrics(
+            timestamp="",
+            cpu_load_1min=self.load,
+            cpu_load_5min=self.load,
+            cpu_load_15min=self.load,
+            memory_total_mb=1000,
+            memory_available_mb=1000,
+            memory_used_mb=0,
+            memory_percent=self.memory_percent,
+            disk_used_percent=0.0,
+            active_processes=1,
+            network_connections=0,
+        )
+
+
+def _proposal(tool_name: str, *args: str) -> ActionProposal:
+    return ActionProposal(
+        proposal_id=f"p-{tool_name}-{time.monotonic_ns()}",
+        timestamp="",
+        vessel_id="test",
+        mission_context="",
+        action_type="analysis",
+        rationale="",
+        expected_outcome="",
+        risk_level=RiskLevel.LOW,
+        risk_mitigation="",
+        rollback_plan="",
+        tool_name=tool_name,
+        tool_args=list(args),
+        tool_kwargs={},
+        status=ProposalStatus.APPROVED,
+        metadata={},
+    )
+
+
+class TestToolExecutionConcurrency(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.sandbox = SandboxConfig(
+            policy=SandboxPolicy(),
+            workspace_root=root / "workspaces",
+            bubblewrap_path=root / "no-bwrap",
+        )
+        self.logger = AuditLogger(root / "audit.jsonl", flush_interval=0.05)
+        self.controls = _FakeControls()
+        self.tools = {name: ToolConfig(name=name, command=["sleep"]) for name in ("sleep_a", "sleep_b")}
+        self.engine = ToolExecutionEngine(
+            self.sandbox,
+            self.logger,
+            root / "tool_use.jsonl",
+            resource_limits=ExecutionLimits(admission_poll_seconds=0.05, admission_timeout_seconds=0.2),
+            controls_client=self.controls,
+        )
+
+    def tearDown(self):
+        self.engine.close()
+        self.logger.close()
+        self._tmp.cleanup()
+
+    async def _run(self, tool_name: str):
+        return await self.engine.execute_proposal(_proposal(tool_name, "0.3"), self.tools[tool_name])
+
+    async def test_per_tool_slots_serialise_same_tool_only(self):
+        started = time.perf_counter()
+        await asyncio.gather(self._run("sleep_a"), self._run("sleep_b"))
+        self.assertLess(time.perf_counter() - started, 0.55)
+
+        results = await asyncio.gather(self._run("sleep_a"), self._run("sleep_a"))
+        waits = sorted(result.metadata["queue_wait_seconds"] for result in results)
+        self.assertGreaterEqual(waits[1], 0.25)
+
+        metrics = self.engine.execution_metrics()
+        self.assertEqual(metrics["run_time_seconds"]["count"], 4)
+        self.assertEqual(metrics["queue_wait_seconds"]["buckets"]["+Inf"], 4)
+        self.assertEqual(metrics["in_flight"], {})
+
+    async def test_admission_waits_without_holding_slots(self):
+        self.engine.resource_limits.admission_timeout_seconds = 5.0
+        self.controls.memory_percent = 99.0
+        pending = asyncio.create_task(self._run("sleep_a"))
+        await asyncio.sleep(0.15)
+        self.assertEqual(self.engine.execution_metrics()["in_flight"], {})
+        self.assertEqual(self.engine._slots._value, self.engine.resource_limits.max_parallel_executions)
+
+        self.controls.memory_percent = 10.0
+        result = await pending
+        self.assertGreaterEqual(result.metadata["admission_wait_seconds"], 0.15)
+        self.assertLess(result.metadata["queue_wait_seconds"], 0.1)
+        metrics = self.engine.execution_metrics()
+        self.assertEqual(metrics["admission_wait_seconds"]["count"], 1)
+        self.assertEqual(self.engine.admission_delays, 1)
+
+    async def test_admission_waits_for_load_then_rejects(self):
+        self.controls.memory_percent = 99.0
+        with self.assertRaisesRegex(RuntimeError, "Memory usage too high"):
+            await self._run("sleep_a")
+        self.assertEqual(self.engine.admission_rejections, 1)
+        self.assertEqual(self.engine.run_time_histogram.count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,16 +10,20 @@ import os
 import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 DEFAULT_ORCHESTRION_SPEC = \
     Path("/srv/janus/balaur/projects/03_systems/infrastructure/orchestrion_spec_v1.md")
 URIP_CLOCK_DIR = Path("/srv/janus/balaur/signal/clock")
 ORACLE_SYNC_DIR = Path("/srv/janus/balaur/oracle_trinity/sync")
+WAVELET_SCALES = (2.0, 4.0, 8.0, 16.0, 32.0)
+PRIMARY_STREAM = "urip"
 
 
 @dataclass
@@ -29,10 +33,272 @@ class HarmonicSeed:
     raw: Dict[str, str]
 
 
+@lru_cache(maxsize=None)
+def morlet_kernel(scale: float, width: int) -> np.ndarray:
+    """Normalised Morlet-style kernel, built once per (scale, width)."""
+    t = np.linspace(-3, 3, width)
+    wavelet = np.exp(-t**2 / 2) * np.cos(5 * t / scale)
+    wavelet /= np.linalg.norm(wavelet) or 1.0
+    wavelet.setflags(write=False)
+    return wavelet
+
+
+def _kernel_width(scale: float) -> int:
+    return max(int(scale * 6), 3)
+
+
+@lru_cache(maxsize=64)
+def _kernel_bank(signal_size: int) -> Tuple[int, np.ndarray]:
+    """FFT length and stacked kernel spectra for every wavelet scale."""
+    longest = max(_kernel_width(scale) for scale in WAVELET_SCALES)
+    fft_len = 1 << int(np.ceil(np.log2(signal_size + longest - 1)))
+    bank = np.stack([np.fft.rfft(morlet_kernel(scale, _kernel_width(scale)), fft_len) for scale in WAVELET_SCALES])
+    bank.setflags(write=False)
+    return fft_len, bank
+
+
+def wavelet_energies(centered: np.ndarray) -> np.ndarray:
+    """Mean squared ``np.convolve(..., mode="same")`` response per scale.
+
+    ``centered`` may be 1-D or a ``(streams, samples)`` matrix; every stream
+    and scale is convolved with a single forward/inverse FFT pair.
+    """
+    signals = np.atleast_2d(centered)
+    size = signals.shape[1]
+    fft_len, bank = _kernel_bank(size)
+    spectra = np.fft.rfft(signals, fft_len)
+    full = np.fft.irfft(spectra[:, None, :] * bank[None, :, :], fft_len)
+    energies = np.empty((signals.shape[0], len(WAVELET_SCALES)), dtype=float)
+    for idx, scale in enumerate(WAVELET_SCALES):
+        width = _kernel_width(scale)
+        start = (min(size, width) - 1) // 2
+        same = full[:, idx, start:start + max(size, width)]
+        energies[:, idx] = np.mean(same**2, axis=1)
+    return energies if centered.ndim > 1 else energies[0]
+
+
+def fourier_batch(windows: np.ndarray, sample_intervals: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Dominant frequency and energy share for every row of ``windows``."""
+    centered = windows - windows.mean(axis=1, keepdims=True)
+    magnitudes = np.abs(np.fft.rfft(centered, axis=1))
+    magnitudes[:, 0] = 0.0
+    peak = np.argmax(magnitudes, axis=1)
+    rows = np.arange(windows.shape[0])
+    frequencies = peak / (windows.shape[1] * sample_intervals)
+    energies = magnitudes[rows, peak] / (magnitudes.sum(axis=1) + 1e-9)
+    return frequencies, energies
+
+
+def entropy_batch(windows: np.ndarray, bins: int = 16) -> np.ndarray:
+    """Normalised Shannon entropy of the amplitude histogram of every row."""
+    values = windows - windows.min(axis=1, keepdims=True)
+    peaks = values.max(axis=1, keepdims=True)
+    np.divide(values, peaks, out=values, where=peaks > 0)
+    bucket = np.minimum((values * bins).astype(np.int64), bins - 1)
+    offsets = np.arange(windows.shape[0])[:, None] * bins
+    counts = np.bincount((bucket + offsets).ravel(), minlength=windows.shape[0] * bins).reshape(-1, bins)
+    probs = counts / counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(probs > 0, probs * np.log2(probs), 0.0)
+    return -terms.sum(axis=1) / math.log2(bins)
+
+
+class SlidingSpectrum:
+    """Real DFT of a fixed-length window, updated incrementally as it slides.
+
+    When the new window equals the previous one shifted left by ``k`` samples
+    the spectrum is advanced with ``k`` sliding-DFT steps instead of a fresh
+    FFT; unchanged windows reuse the cached spectrum outright. A full FFT is
+    taken on length changes, larger jumps and every ``resync_every`` steps to
+    bound floating-point drift.
+    """
+
+    def __init__(self, resync_every: int = 256):
+        self.resync_every = resync_every
+        self._window: Optional[np.ndarray] = None
+        self._spectrum: Optional[np.ndarray] = None
+        self._steps = 0
+
+    def update(self, samples: np.ndarray) -> np.ndarray:
+        previous = self._window
+        size = samples.size
+        shift = None
+        if previous is not None and previous.size == size and self._steps < self.resync_every:
+            for candidate in range(0, size // 4 + 1):
+                if np.array_equal(previous[candidate:], samples[:size - candidate]):
+                    shift = candidate
+                    break
+        if shift is None:
+            spectrum = np.fft.rfft(samples)
+            self._steps = 0
+        else:
+            spectrum = self._spectrum
+            if shift:
+                twiddle = np.exp(2j * np.pi * np.arange(spectrum.size) / size)
+                for outgoing, incoming in zip(previous[:shift], samples[size - shift:]):
+                    spectrum = (spectrum - outgoing + incoming) * twiddle
+                self._steps += shift
+        self._window = samples.copy()
+        self._spectrum = spectrum
+        return spectrum
+
+
+class RhythmRingBuffer:
+    """Fixed-capacity (timestamp, amplitude) window backed by NumPy arrays."""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(int(capacity), 1)
+        self._timestamps = np.zeros(self.capacity, dtype=float)
+        self._amplitudes = np.zeros(self.capacity, dtype=float)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        self._next = 0
+        self._size = 0
+
+    def extend(self, records: Sequence[Tuple[float, float]]) -> None:
+        if not records:
+            return
+        records = records[-self.capacity:]
+        count = len(records)
+        slots = (self._next + np.arange(count)) % self.capacity
+        data = np.asarray(records, dtype=float)
+        self._timestamps[slots] = data[:, 0]
+        self._amplitudes[slots] = data[:, 1]
+        self._next = int((self._next + count) % self.capacity)
+        self._size = min(self._size + count, self.capacity)
+
+    def window(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the buffered points in chronological order (copies)."""
+        if not self._size:
+            return np.array([]), np.array([])
+        slots = (self._next - self._size + np.arange(self._size)) % self.capacity
+        timestamps = self._timestamps[slots]
+        amplitudes = self._amplitudes[slots]
+        order = np.argsort(timestamps, kind="stable")
+        return timestamps[order], amplitudes[order]
+
+    def to_state(self) -> Dict[str, np.ndarray]:
+        timestamps, amplitudes = self.window()
+        return {"timestamps": timestamps, "amplitudes": amplitudes}
+
+    def load_state(self, timestamps: np.ndarray, amplitudes: np.ndarray) -> None:
+        self.clear()
+        self.extend(list(zip(timestamps.tolist(), amplitudes.tolist())))
+
+
+class RhythmHistoryTail:
+    """Incremental reader for ``rhythm_history.log``.
+
+    The first read seeks backwards from the end of the file for just enough
+    lines to fill the window; later reads resume from the last consumed byte
+    offset so each cycle only parses lines appended since the previous one.
+    The offset, file identity and buffered window are persisted to
+    ``state_path`` so a restarted engine resumes without rescanning. Rotation
+    or truncation (inode change or shrinking file) triggers a fresh tail read.
+    """
+
+    BLOCK_SIZE = 8192
+
+    def __init__(self, path: Path, capacity: int, state_path: Optional[Path] = None):
+        self.path = path
+        self.state_path = state_path
+        self.buffer = RhythmRingBuffer(capacity)
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._restore_state()
+
+    def refresh(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Consume newly appended lines and return the current window."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return np.array([]), np.array([])
+        if self._inode != stat.st_ino or stat.st_size < self._offset:
+            self.buffer.clear()
+            lines = self._read_tail(stat.st_size)
+            self._inode = stat.st_ino
+        elif stat.st_size > self._offset:
+            lines = self._read_from_offset()
+        else:
+            lines = []
+        if lines:
+            records = [record for record in map(PatternEngineCore._parse_history_line, lines) if record]
+            self.buffer.extend(records)
+            self._persist_state()
+        return self.buffer.window()
+
+    def _read_tail(self, size: int) -> List[str]:
+        wanted = self.buffer.capacity + 1
+        chunks: List[bytes] = []
+        newlines = 0
+        position = size
+        with self.path.open("rb") as handle:
+            while position > 0 and newlines < wanted:
+                step = min(self.BLOCK_SIZE, position)
+                position -= step
+                handle.seek(position)
+                chunk = handle.read(step)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+        data = b"".join(reversed(chunks))
+        end = data.rfind(b"\n") + 1
+        self._offset = position + end
+        lines = data[:end].decode("utf-8", errors="replace").splitlines()
+        if position > 0 and lines:
+            lines = lines[1:]  # first line may be partial
+        return lines[-self.buffer.capacity:]
+
+    def _read_from_offset(self) -> List[str]:
+        with self.path.open("rb") as handle:
+            handle.seek(self._offset)
+            data = handle.read()
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+        return data[:end].decode("utf-8", errors="replace").splitlines()
+
+    def _restore_state(self) -> None:
+        if not self.state_path or not self.state_path.is_file():
+            return
+        try:
+            with np.load(self.state_path) as state:
+                if int(state["capacity"]) != self.buffer.capacity:
+                    return
+                self.buffer.load_state(state["timestamps"], state["amplitudes"])
+                self._offset = int(state["offset"])
+                self._inode = int(state["inode"])
+        except (OSError, KeyError, ValueError):
+            self.buffer.clear()
+            self._offset = 0
+            self._inode = None
+
+    def _persist_state(self) -> None:
+        if not self.state_path:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as handle:
+                np.savez(
+                    handle,
+                    offset=np.asarray(self._offset),
+                    inode=np.asarray(self._inode or 0),
+                    capacity=np.asarray(self.buffer.capacity),
+                    **self.buffer.to_state(),
+                )
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
+
+
 class PatternEngineCore:
     """Implements Fourier/Wavelet analysis and artifact generation."""
 
-    def __init__(self, project_dir: Path, orchestrion_spec: Path):
+    def __init__(self, project_dir: Path, orchestrion_spec: Path, channels: Optional[Dict[str, Path]] = None):
         self.project_dir = project_dir
         self.artifacts_dir = self.project_dir / "artifacts"
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
@@ -40,6 +306,10 @@ class PatternEngineCore:
         self.rhythm_state_path = URIP_CLOCK_DIR / "rhythm_state.json"
         self.rhythm_history_path = URIP_CLOCK_DIR / "rhythm_history.log"
         self.release_token_path = URIP_CLOCK_DIR / "next_release.token"
+        self.history_state_path = self.project_dir / "state" / "rhythm_history_tail.npz"
+        self.channels: Dict[str, Path] = dict(channels or {})
+        self._tails: Dict[str, RhythmHistoryTail] = {}
+        self._spectra: Dict[str, SlidingSpectrum] = {}
         self.logger = logging.getLogger("PatternEngine")
 
     # ------------------------------------------------------------------
@@ -54,6 +324,8 @@ class PatternEngineCore:
                 self.logger.warning("No URIP rhythm history available; skipping cycle")
             else:
                 metrics = self._compute_metrics(window)
+                if self.channels:
+                    metrics["channels"] = self.analyze_channels(window_points)
                 if force_emit or self._should_emit(metrics):
                     artifact = self._build_artifact(metrics, window)
                     self._write_artifact(artifact)
@@ -69,9 +341,158 @@ class PatternEngineCore:
             beat_interval = metrics.get("interval", 6.0)
             time.sleep(max(beat_interval, 2.0))
 
+    def backfill(
+        self,
+        window_points: int = 96,
+        stride: int = 24,
+        chunk_records: int = 50_000,
+        force_emit: bool = False,
+        batch_windows: int = 2048,
+    ) -> Dict[str, any]:
+        """Mine the full rhythm history with strided windows.
+
+        The log is streamed in chunks of ``chunk_records`` parsed points; each
+        chunk (plus the tail of the previous one, so no window is lost at the
+        seam) is viewed as a strided window matrix and Fourier, wavelet and
+        entropy metrics are computed for all windows at once. Emitted
+        artifacts are appended to one JSONL file per run.
+        """
+        if window_points < 4:
+            raise ValueError("window_points must be at least 4")
+        stride = max(int(stride), 1)
+        seed = self._load_harmonic_seed()
+        rhythm_state = self._load_rhythm_state()
+        interval = float(rhythm_state.get("interval", seed.tempo)) if rhythm_state else seed.tempo
+        cohesion = self._cohesion(interval)
+
+        started = time.perf_counter()
+        run_id = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H-%M-%SZ")
+        output_path = self.artifacts_dir / f"backfill_{run_id}.jsonl"
+        carry_ts = np.array([])
+        carry_amp = np.array([])
+        consumed = 0  # points already dropped from the front of the stream
+        next_start = 0  # absolute index of the next window start
+        total_windows = 0
+        emitted = 0
+
+        with open(output_path, "w", encoding="utf-8") as sink:
+            for chunk_ts, chunk_amp in self._iter_history_chunks(chunk_records):
+                timestamps = np.concatenate([carry_ts, chunk_ts])
+                amplitudes = np.concatenate([carry_amp, chunk_amp])
+                if amplitudes.size >= window_points:
+                    first = next_start - consumed
+                    ts_windows = sliding_window_view(timestamps, window_points)[first::stride]
+                    amp_windows = sliding_window_view(amplitudes, window_points)[first::stride]
+                    for offset in range(0, len(amp_windows), batch_windows):
+                        lines = self._backfill_batch(
+                            ts_windows[offset:offset + batch_windows],
+                            amp_windows[offset:offset + batch_windows],
+                            seed,
+                            cohesion,
+                            force_emit,
+                        )
+                        sink.writelines(lines)
+                        emitted += len(lines)
+                    total_windows += len(amp_windows)
+                    next_start += len(amp_windows) * stride
+                keep = max(amplitudes.size - (next_start - consumed), 0)
+                consumed += amplitudes.size - keep
+                carry_ts = timestamps[amplitudes.size - keep:]
+                carry_amp = amplitudes[amplitudes.size - keep:]
+
+        elapsed = time.perf_counter() - started
+        if not emitted:
+            output_path.unlink(missing_ok=True)
+        summary = {
+            "windows": total_windows,
+            "emitted": emitted,
+            "points": consumed + carry_amp.size,
+            "seconds": elapsed,
+            "windows_per_second": total_windows / elapsed if elapsed > 0 else 0.0,
+            "output": str(output_path) if emitted else None,
+        }
+        self.logger.info(
+            "Backfill analysed %d windows (%d emitted) in %.2fs (%.0f windows/sec)",
+            total_windows,
+            emitted,
+            elapsed,
+            summary["windows_per_second"],
+        )
+        return summary
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _iter_history_chunks(self, chunk_records: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        if not self.rhythm_history_path.is_file():
+            return
+        records: List[Tuple[float, float]] = []
+        with open(self.rhythm_history_path, "r", encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                record = self._parse_history_line(line)
+                if record is None:
+                    continue
+                records.append(record)
+                if len(records) >= chunk_records:
+                    data = np.asarray(records, dtype=float)
+                    records = []
+                    yield data[:, 0], data[:, 1]
+        if records:
+            data = np.asarray(records, dtype=float)
+            yield data[:, 0], data[:, 1]
+
+    def _backfill_batch(
+        self,
+        ts_windows: np.ndarray,
+        amp_windows: np.ndarray,
+        seed: HarmonicSeed,
+        cohesion: float,
+        force_emit: bool,
+    ) -> List[str]:
+        points = amp_windows.shape[1]
+        sample_intervals = (ts_windows[:, -1] - ts_windows[:, 0]) / (points - 1)
+        sample_intervals[sample_intervals == 0] = 1.0
+        frequencies, fourier_energies = fourier_batch(amp_windows, sample_intervals)
+        scale_energies = wavelet_energies(amp_windows - amp_windows.mean(axis=1, keepdims=True))
+        totals = scale_energies.sum(axis=1)
+        totals[totals == 0] = 1.0
+        peak = np.argmax(scale_energies, axis=1)
+        peak_scales = np.asarray(WAVELET_SCALES)[peak] * sample_intervals
+        peak_energies = scale_energies[np.arange(len(peak)), peak] / totals
+        entropies = entropy_batch(amp_windows)
+
+        emit = (fourier_energies >= 0.4) | (peak_energies >= 0.4) | (cohesion >= 0.8) | (entropies <= 0.3)
+        if force_emit:
+            emit[:] = True
+
+        lines: List[str] = []
+        for idx in np.flatnonzero(emit):
+            end_iso = self._iso(ts_windows[idx, -1])
+            metrics = {
+                "fourier": {"frequency": float(frequencies[idx]), "energy": float(fourier_energies[idx])},
+                "wavelet": {"peak_scale": float(peak_scales[idx]), "peak_energy": float(peak_energies[idx])},
+                "entropy": float(entropies[idx]),
+                "cohesion": cohesion,
+            }
+            artifact = {
+                "id": f"pattern_{end_iso.replace(':', '-')}",
+                "created_at": end_iso,
+                "backfill": True,
+                "harmonic_seed": {"tempo": seed.tempo, "priority_band": seed.priority_band, "raw": seed.raw},
+                "signals": {
+                    "dominant_frequency": metrics["fourier"]["frequency"],
+                    "fourier_energy": metrics["fourier"]["energy"],
+                    "wavelet_peak_scale": metrics["wavelet"]["peak_scale"],
+                    "wavelet_peak_energy": metrics["wavelet"]["peak_energy"],
+                    "entropy": metrics["entropy"],
+                    "cohesion": cohesion,
+                },
+                "window": {"start": self._iso(ts_windows[idx, 0]), "end": end_iso, "points": points},
+                "annotations": self._derive_annotations(metrics),
+            }
+            lines.append(json.dumps(artifact) + "\n")
+        return lines
+
     def _respect_release_window(self) -> None:
         if not self.release_token_path.is_file():
             return
@@ -91,27 +512,63 @@ class PatternEngineCore:
     def _load_history(self, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
         if not self.rhythm_history_path.is_file():
             return np.array([]), np.array([])
+        tail = self._tail(PRIMARY_STREAM, self.rhythm_history_path, max_points, self.history_state_path)
         try:
-            lines = self.rhythm_history_path.read_text(encoding="utf-8").strip().splitlines()
+            return tail.refresh()
         except OSError:
             return np.array([]), np.array([])
-        records: List[Tuple[float, float]] = []
-        for line in lines[-max_points:]:
-            parts = line.split("|")
-            if not parts:
-                continue
-            ts_str = parts[0].strip()
-            amp = self._extract_value(line, "amp=")
-            timestamp = self._maybe_epoch(ts_str)
-            if timestamp is None or math.isnan(amp):
+
+    def _tail(self, stream: str, path: Path, max_points: int, state_path: Path) -> RhythmHistoryTail:
+        tail = self._tails.get(stream)
+        if tail is None or tail.buffer.capacity != max_points or tail.path != path:
+            tail = self._tails[stream] = RhythmHistoryTail(path, max_points, state_path)
+        return tail
+
+    def analyze_channels(self, window_points: int = 96) -> Dict[str, Dict[str, any]]:
+        """Spectral metrics for every configured extra rhythm channel.
+
+        Channels keep their own tail reader and sliding spectrum; wavelet
+        responses for all channels with the same window length are computed
+        in one batched FFT.
+        """
+        windows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for name, path in self.channels.items():
+            state_path = self.project_dir / "state" / f"rhythm_history_tail_{name}.npz"
+            try:
+                timestamps, amplitudes = self._tail(name, path, window_points, state_path).refresh()
+            except OSError:
                 continue
-            records.append((timestamp, amp))
-        if not records:
-            return np.array([]), np.array([])
-        records.sort(key=lambda item: item[0])
-        timestamps = np.array([r[0] for r in records], dtype=float)
-        amplitudes = np.array([r[1] for r in records], dtype=float)
-        return timestamps, amplitudes
+            if amplitudes.size >= 4:
+                windows[name] = (timestamps, amplitudes)
+
+        by_size: Dict[int, List[str]] = {}
+        for name, (_, amplitudes) in windows.items():
+            by_size.setdefault(amplitudes.size, []).append(name)
+
+        results: Dict[str, Dict[str, any]] = {}
+        for names in by_size.values():
+            centered = np.stack([windows[name][1] - np.mean(windows[name][1]) for name in names])
+            for name, scale_energies in zip(names, wavelet_energies(centered)):
+                timestamps, amplitudes = windows[name]
+                sample_interval = self._sample_interval(timestamps)
+                results[name] = {
+                    "fourier": self._compute_fourier(amplitudes, sample_interval, stream=name),
+                    "wavelet": self._wavelet_summary(scale_energies, sample_interval),
+                    "entropy": self._entropy(amplitudes),
+                    "points": int(amplitudes.size),
+                }
+        return results
+
+    @staticmethod
+    def _parse_history_line(line: str) -> Optional[Tuple[float, float]]:
+        parts = line.split("|")
+        if not parts:
+            return None
+        timestamp = PatternEngineCore._maybe_epoch(parts[0].strip())
+        amp = PatternEngineCore._extract_value(line, "amp=")
+        if timestamp is None or math.isnan(amp):
+            return None
+        return timestamp, amp
 
     def _compute_metrics(self, window: Tuple[np.ndarray, np.ndarray]) -> Dict[str, any]:
         timestamps, amplitudes = window
@@ -180,6 +637,18 @@ class PatternEngineCore:
             },
             "annotations": self._derive_annotations(metrics),
         }
+        if metrics.get("channels"):
+            payload["channels"] = {
+                name: {
+                    "dominant_frequency": channel["fourier"]["frequency"],
+                    "fourier_energy": channel["fourier"]["energy"],
+                    "wavelet_peak_scale": channel["wavelet"]["peak_scale"],
+                    "wavelet_peak_energy": channel["wavelet"]["peak_energy"],
+                    "entropy": channel["entropy"],
+                    "points": channel["points"],
+                }
+                for name, channel in metrics["channels"].items()
+            }
         return payload
 
     def _write_artifact(self, artifact: Dict[str, any]) -> None:
@@ -192,12 +661,15 @@ class PatternEngineCore:
     # ------------------------------------------------------------------
     # Metric primitives
     # ------------------------------------------------------------------
-    def _compute_fourier(self, amplitudes: np.ndarray, sample_interval: float) -> Dict[str, float]:
+    def _compute_fourier(
+        self, amplitudes: np.ndarray, sample_interval: float, stream: str = PRIMARY_STREAM
+    ) -> Dict[str, float]:
         if amplitudes.size < 4:
             return {"frequency": 0.0, "energy": 0.0}
-        centered = amplitudes - np.mean(amplitudes)
-        spectrum = np.fft.rfft(centered)
-        freqs = np.fft.rfftfreq(centered.size, d=sample_interval)
+        # Centering only changes the DC bin, which is discarded below, so the
+        # raw window can be fed to the (sliding) spectrum directly.
+        spectrum = self._spectrum_for(stream).update(np.asarray(amplitudes, dtype=float))
+        freqs = np.fft.rfftfreq(amplitudes.size, d=sample_interval)
         magnitudes = np.abs(spectrum)
         if magnitudes.size <= 1:
             return {"frequency": 0.0, "energy": 0.0}
@@ -211,16 +683,13 @@ class PatternEngineCore:
         if amplitudes.size < 4:
             return {"peak_scale": 0.0, "peak_energy": 0.0}
         centered = amplitudes - np.mean(amplitudes)
-        scales = np.array([2, 4, 8, 16, 32], dtype=float)
-        energies: Dict[float, float] = {}
-        for scale in scales:
-            width = max(int(scale * 6), 3)
-            t = np.linspace(-3, 3, width)
-            wavelet = np.exp(-t**2 / 2) * np.cos(5 * t / scale)
-            wavelet /= np.linalg.norm(wavelet) or 1.0
-            conv = np.convolve(centered, wavelet, mode="same")
-            energy = float(np.mean(conv**2))
-            energies[scale * sample_interval] = energy
+        return self._wavelet_summary(wavelet_energies(centered), sample_interval)
+
+    @staticmethod
+    def _wavelet_summary(scale_energies: np.ndarray, sample_interval: float) -> Dict[str, float]:
+        energies = {
+            scale * sample_interval: float(energy) for scale, energy in zip(WAVELET_SCALES, scale_energies)
+        }
         peak_scale = max(energies, key=energies.get)
         total = sum(energies.values()) or 1.0
         normalized = {scale: energy / total for scale, energy in energies.items()}
@@ -230,6 +699,12 @@ class PatternEngineCore:
             "scale_distribution": normalized,
         }
 
+    def _spectrum_for(self, stream: str) -> SlidingSpectrum:
+        spectrum = self._spectra.get(stream)
+        if spectrum is None:
+            spectrum = self._spectra[stream] = SlidingSpectrum()
+        return spectrum
+
     def _entropy(self, amplitudes: np.ndarray) -> float:
         if amplitudes.size == 0:
             return 0.0
@@ -373,6 +848,16 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser.add_argument("--watch", action="store_true", help="Continuously sample and emit artifacts")
     parser.add_argument("--once", action="store_true", help="Run a single cycle (overrides --watch)")
     parser.add_argument("--emit-now", action="store_true", help="Force artifact emission even if below threshold")
+    parser.add_argument(
+        "--channel",
+        action="append",
+        default=[],
+        metavar="NAME=PATH",
+        help="Additional rhythm log to analyse alongside URIP (may be repeated)",
+    )
+    parser.add_argument("--backfill", action="store_true", help="Analyse the entire rhythm history and exit")
+    parser.add_argument("--backfill-stride", type=int, default=24, help="Points between consecutive backfill windows")
+    parser.add_argument("--window-points", type=int, default=96, help="Points per analysis window")
     parser.add_argument("--log-level", default="INFO", help="Logging level (DEBUG, INFO, ...)")
     return parser.parse_args(argv)
 
@@ -381,9 +866,23 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parse_args(argv)
     logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.INFO))
     project_dir = Path(args.project_dir).expanduser()
-    controller = PatternEngineCore(project_dir, Path(args.orchestrion_spec).expanduser())
+    channels: Dict[str, Path] = {}
+    for spec in args.channel:
+        name, sep, path = spec.partition("=")
+        if not sep or not name or not path:
+            raise SystemExit(f"Invalid --channel '{spec}', expected NAME=PATH")
+        channels[name] = Path(path).expanduser()
+    controller = PatternEngineCore(project_dir, Path(args.orchestrion_spec).expanduser(), channels=channels)
+    if args.backfill:
+        summary = controller.backfill(
+            window_points=args.window_points,
+            stride=args.backfill_stride,
+            force_emit=args.emit_now,
+        )
+        print(json.dumps(summary, indent=2))
+        return 0
     watch_mode = args.watch and not args.once
-    controller.run(watch=watch_mode, force_emit=args.emit_now)
+    controller.run(watch=watch_mode, force_emit=args.emit_now, window_points=args.window_points)
     return 0
 
 
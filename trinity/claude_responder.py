@@ -3,41 +3,24 @@
 
 from __future__ import annotations
 
-import json
 import os
 import signal
 import subprocess
 import sys
-import time
 from pathlib import Path
 from typing import Any, Dict, List
 
-from comms_hub_client import CommsHubClient
+from comms_hub_client import CommsHubClient, send_comms_message
+from inbox_watcher import InboxWatcher
 from trinity_event_stream import TrinityEventStream
 from claude_resident import ResidentClaude # Import the local ResidentClaude class
 
 POLL_INTERVAL_SECONDS = int(os.getenv("COMMS_POLL_INTERVAL_SECONDS", "30"))
 SKILLS_ROOT = Path(os.getenv("TRINITY_SKILLS_PATH", "/srv/janus/trinity/skills"))
-MESSAGE_SCRIPT = Path("/srv/janus/02_FORGE/scripts/comms_hub_send.py")
 
 
 def _send_message(from_vessel: str, to_vessel: str, message_type: str, payload: Dict[str, Any], priority: str) -> bool:
-    cmd = [
-        sys.executable,
-        str(MESSAGE_SCRIPT),
-        "--from",
-        from_vessel,
-        "--to",
-        to_vessel,
-        "--type",
-        message_type,
-        "--payload",
-        json.dumps(payload, ensure_ascii=True),
-        "--priority",
-        priority,
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    return result.returncode == 0
+    return send_comms_message(from_vessel, to_vessel, message_type, payload, priority)
 
 
 def _execute_skill(skill: str, script: str | None, args: List[str]) -> Dict[str, Any]:
@@ -164,18 +147,20 @@ class ClaudeResponder:
 
     def run(self) -> None:
         self.events.log_event(source="claude_responder", event_type="started", data={})
-        while self.running:
-            try:
-                messages = self.comms.unpack(mark_as_read=True)
-                for message in messages:
-                    self._process_message(message)
-            except Exception as exc:  # pragma: no cover - main loop guard
-                self.events.log_event(
-                    source="claude_responder",
-                    event_type="loop_error",
-                    data={"error": str(exc)},
-                )
-            time.sleep(POLL_INTERVAL_SECONDS)
+        # Wake as soon as a message lands; the poll interval is only a safety net.
+        with InboxWatcher(self.comms.inbox) as watcher:
+            while self.running:
+                try:
+                    messages = self.comms.unpack(mark_as_read=True)
+                    for message in messages:
+                        self._process_message(message)
+                except Exception as exc:  # pragma: no cover - main loop guard
+                    self.events.log_event(
+                        source="claude_responder",
+                        event_type="loop_error",
+                        data={"error": str(exc)},
+                    )
+                watcher.wait(POLL_INTERVAL_SECONDS)
         self.events.log_event(source="claude_responder", event_type="stopped", data={})
 
 
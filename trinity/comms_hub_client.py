@@ -1,12 +1,38 @@
 from __future__ import annotations
 
 import json
-import subprocess
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, Iterable, List, Mapping
 
 from config import TrinityPaths, load_configuration
+from deliverable_index import record_deliverable
+
+FORGE_PACKAGES = Path(__file__).resolve().parents[1] / "02_FORGE" / "packages"
+if str(FORGE_PACKAGES) not in sys.path:
+    sys.path.append(str(FORGE_PACKAGES))
+
+from comms_hub import send_many, send_message, validate_fields  # noqa: E402
+
+
+def send_comms_message(
+    from_vessel: str,
+    to_vessel: str,
+    message_type: str,
+    payload: Dict[str, Any],
+    priority: str = "normal",
+    *,
+    comms_root: Path | None = None,
+) -> bool:
+    """Deliver a message in-process, with the same validation as ``comms_hub_send.py``."""
+    try:
+        validate_fields(from_vessel=from_vessel, message_type=message_type, priority=priority)
+        send_message(from_vessel, to_vessel, message_type, payload, priority, comms_root=comms_root)
+    except (ValueError, OSError) as exc:
+        print(f"Error sending message: {exc}", file=sys.stderr)
+        return False
+    return True
 
 
 @dataclass
@@ -20,29 +46,42 @@ class CommsHubClient:
         self.paths, _ = load_configuration()
 
     def pack(self, *, recipient: str, payload: dict[str, Any], priority: str = "normal", tone: str = "") -> str:
-        script = Path("/srv/janus/02_FORGE/scripts/comms_hub_send.py")
-        cmd = [
-            "/usr/bin/env",
-            "python3",
-            str(script),
-            "--from",
+        ok = send_comms_message(
             self.resident,
-            "--to",
             recipient,
-            "--type",
             "response",
-            "--payload",
-            json.dumps({"tone": tone, **payload}, ensure_ascii=True),
-            "--priority",
+            {"tone": tone, **payload},
             priority,
+            comms_root=self.paths.comms_hub,
+        )
+        if self.event_stream:
+            self.event_stream.log_event(source=self.resident, event_type="comms.pack", data={"recipient": recipient, "ok": ok})
+        return "ok" if ok else "error"
+
+    def pack_many(self, messages: Iterable[Mapping[str, Any]], *, priority: str = "normal") -> List[str]:
+        """Send one ``response`` per ``{"recipient": ..., "payload": ...}`` item in a single pass."""
+        validate_fields(from_vessel=self.resident, message_type="response", priority=priority)
+        batch = [
+            {
+                "from_vessel": self.resident,
+                "to_vessel": item["recipient"],
+                "message_type": "response",
+                "payload": {"tone": item.get("tone", ""), **item["payload"]},
+                "priority": priority,
+            }
+            for item in messages
         ]
-        proc = subprocess.run(cmd, capture_output=True, text=True, check=False)
+        message_ids = send_many(batch, comms_root=self.paths.comms_hub)
         if self.event_stream:
-            self.event_stream.log_event(source=self.resident, event_type="comms.pack", data={"recipient": recipient, "ok": proc.returncode == 0})
-        return "ok" if proc.returncode == 0 else "error"
+            self.event_stream.log_event(source=self.resident, event_type="comms.pack", data={"count": len(message_ids), "ok": True})
+        return message_ids
+
+    @property
+    def inbox(self) -> Path:
+        return self.paths.comms_hub / self.resident / "inbox"
 
     def unpack(self, *, mark_as_read: bool = True) -> List[dict]:
-        inbox = self.paths.comms_hub / self.resident / "inbox"
+        inbox = self.inbox
         msgs: List[dict] = []
         if not inbox.exists():
             return msgs
@@ -54,6 +93,7 @@ class CommsHubClient:
                     archive = inbox.parent / "archive"
                     archive.mkdir(parents=True, exist_ok=True)
                     f.rename(archive / f.name)
+                    record_deliverable(archive, archive / f.name, data)
             except Exception:
                 continue
         if self.event_stream:
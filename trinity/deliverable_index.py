@@ -0,0 +1,85 @@
+"""Map mission ids to the archived COMMS_HUB messages that delivered them."""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+INDEX_NAME = "deliverable_index.jsonl"
+
+
+def deliverable_mission_id(message: Mapping[str, Any]) -> Optional[str]:
+    """Return the mission a message reports on (top level or inside ``payload``)."""
+    mission_id = message.get("mission_id")
+    payload = message.get("payload")
+    if not mission_id and isinstance(payload, Mapping):
+        mission_id = payload.get("mission_id")
+    return str(mission_id) if mission_id else None
+
+
+def record_deliverable(archive_dir: Path, archived: Path, message: Mapping[str, Any]) -> bool:
+    """
+    Append ``archived`` to the archive's index if ``message`` carries a mission id.
+
+    Called by whoever moves a message into ``<resident>/archive`` so the
+    intelligence collector can find a mission's deliverable without globbing
+    the whole archive. Each entry is a single short ``O_APPEND`` write.
+    """
+    mission_id = deliverable_mission_id(message)
+    if mission_id is None:
+        return False
+    line = json.dumps({"mission_id": mission_id, "file": archived.name}) + "\n"
+    with (Path(archive_dir) / INDEX_NAME).open("a", encoding="utf-8") as handle:
+        handle.write(line)
+    return True
+
+
+class DeliverableIndex:
+    """
+    Incremental reader over the per-archive ``deliverable_index.jsonl`` files.
+
+    Only bytes appended since the previous lookup are parsed, so a lookup
+    costs one ``stat`` plus whatever was archived in between.
+    """
+
+    def __init__(self) -> None:
+        self._offsets: Dict[Path, int] = {}
+        self._entries: Dict[Path, Dict[str, List[str]]] = {}
+
+    def lookup(self, archive_dir: Path, mission_id: str) -> List[Path]:
+        """Return indexed deliverables for ``mission_id``, newest first."""
+        archive_dir = Path(archive_dir)
+        self._refresh(archive_dir)
+        names = self._entries.get(archive_dir, {}).get(mission_id, [])
+        return [archive_dir / name for name in reversed(names)]
+
+    def _refresh(self, archive_dir: Path) -> None:
+        index_path = archive_dir / INDEX_NAME
+        try:
+            size = os.stat(index_path).st_size
+        except OSError:
+            return
+        offset = self._offsets.get(archive_dir, 0)
+        if size < offset:
+            # Truncated or replaced: start over.
+            offset = 0
+            self._entries.pop(archive_dir, None)
+        if size == offset:
+            return
+        with index_path.open("rb") as handle:
+            handle.seek(offset)
+            chunk = handle.read(size - offset)
+        # Leave a half-written trailing line for the next refresh.
+        complete = chunk.rfind(b"\n") + 1
+        entries = self._entries.setdefault(archive_dir, {})
+        for raw in chunk[:complete].splitlines():
+            try:
+                record = json.loads(raw)
+                entries.setdefault(str(record["mission_id"]), []).append(str(record["file"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._offsets[archive_dir] = offset + complete
+
+
+__all__ = ["INDEX_NAME", "DeliverableIndex", "deliverable_mission_id", "record_deliverable"]
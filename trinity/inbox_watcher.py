@@ -0,0 +1,151 @@
+"""Wake COMMS_HUB loops when a message lands in an inbox instead of sleeping."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _load_inotify() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InboxWatcher:
+    """
+    Block until a new message file appears in ``directory``.
+
+    Uses Linux inotify through ctypes (``IN_CLOSE_WRITE`` for files written in
+    place, ``IN_MOVED_TO`` for atomic renames) and falls back to watching the
+    directory mtime where inotify is unavailable. A burst of files is
+    collapsed into a single wakeup: after the first match, events keep being
+    drained until the directory has been quiet for ``debounce`` seconds, but
+    for no longer than ``max_burst`` seconds (``20 * debounce`` by default, and
+    never past ``timeout``) so a steady stream of files cannot starve the caller.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        suffix: str = ".msg.json",
+        debounce: float = 0.05,
+        fallback_interval: float = 1.0,
+        max_burst: Optional[float] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.suffix = suffix.encode("utf-8")
+        self.debounce = debounce
+        self.max_burst = debounce * 20 if max_burst is None else max_burst
+        self.fallback_interval = fallback_interval
+        self._fd: Optional[int] = None
+        self._last_mtime_ns = self._directory_mtime_ns()
+
+        libc = _load_inotify()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._fd is not None
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "InboxWatcher":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def wait(self, timeout: float) -> bool:
+        """Return ``True`` as soon as a matching file arrives, ``False`` after ``timeout``."""
+        if self._fd is None:
+            return self._poll(timeout)
+
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if readable and self._drain():
+                break
+        # Collapse the rest of the burst into this wakeup.
+        burst_end = time.monotonic() + min(max(timeout, 0.0), self.max_burst)
+        while True:
+            remaining = burst_end - time.monotonic()
+            if remaining <= 0 or not select.select([self._fd], [], [], min(self.debounce, remaining))[0]:
+                return True
+            self._drain()
+
+    def _drain(self) -> bool:
+        """Consume pending events; ``True`` if any of them names a matching file."""
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return False
+        matched = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW or name.endswith(self.suffix):
+                matched = True
+        return matched
+
+    def _directory_mtime_ns(self) -> Optional[int]:
+        try:
+            return self.directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _poll(self, timeout: float) -> bool:
+        deadline = time.monotonic() + max(timeout, 0.0)
+        while True:
+            mtime_ns = self._directory_mtime_ns()
+            if mtime_ns != self._last_mtime_ns:
+                self._last_mtime_ns = mtime_ns
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.fallback_interval, remaining))
+
+
+__all__ = ["InboxWatcher"]
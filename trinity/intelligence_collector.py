@@ -4,14 +4,16 @@ import argparse
 import hashlib
 import json
 import logging
+import os
 import time
 import uuid
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, Iterator
+from typing import Any, Iterable, Iterator
 
 from trinity.config import load_configuration, TrinityPaths
+from trinity.deliverable_index import DeliverableIndex
 from trinity.intelligence_tools import IntelligenceDatabase, IntelligenceNode
 
 LOGGER = logging.getLogger("trinity.intelligence_collector")
@@ -55,6 +57,15 @@ CATEGORY_BY_MESSAGE = {
 CACHE_DIR = Path("/srv/janus/03_OPERATIONS/vessels/balaur/intel_cache/intelligence")
 STATE_FILE = CACHE_DIR / "collector_state.json"
 NODE_DIR = CACHE_DIR / "nodes"
+STATE_VERSION = 3
+# Directory mtimes are only as fine as the filesystem clock tick; trust the
+# "nothing changed" shortcut only once the directory has been quiet this long.
+MTIME_SETTLE_NS = 1_000_000_000
+# Atomic writers stamp the mtime on the temp file and make it visible at
+# rename, so a mission can appear with an mtime older than the last pass. The
+# cursor trails the scan by this much; files inside the window are matched by
+# name and mtime instead.
+CURSOR_SETTLE_NS = 60_000_000_000
 
 
 def _utc_now() -> datetime:
@@ -114,29 +125,76 @@ class IntelligenceCollector:
         self.config.node_dir.mkdir(parents=True, exist_ok=True)
         self.config.log_path.parent.mkdir(parents=True, exist_ok=True)
         self.state = self._load_state()
+        self.deliverables = DeliverableIndex()
         self.db = IntelligenceDatabase(db_path=db_path)
         self.paths: TrinityPaths = paths
 
     def collect_once(self, *, force_rescan: bool = False) -> list[IntelligenceNode]:
+        """
+        Process completed missions written since the last pass.
+
+        The state keeps a high-water mark over ``missions_dir`` rather than one
+        entry per file: every mission older than ``cursor_mtime_ns`` has been
+        seen, and ``recent`` records ``{name: mtime_ns}`` for the ones processed
+        since. The cursor only advances to ``CURSOR_SETTLE_NS`` before the scan
+        started, so a file made visible late with an older mtime is still
+        picked up. The directory is not listed at all while its own mtime is
+        unchanged. ``force_rescan`` ignores the cursor and walks every mission
+        again.
+        """
+        missions_dir = self.config.missions_dir
+        try:
+            dir_mtime_ns = missions_dir.stat().st_mtime_ns
+        except OSError:
+            return []
+        if not force_rescan and dir_mtime_ns == self.state.get("missions_dir_mtime_ns"):
+            return []
+
+        scan_started_ns = time.time_ns()
+        cursor_ns = -1 if force_rescan else self.state["cursor_mtime_ns"]
+        recent: dict[str, int] = {} if force_rescan else self.state["recent"]
+        pending: list[tuple[int, str, Path]] = []
+        with os.scandir(missions_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                try:
+                    mtime_ns = entry.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                if mtime_ns > cursor_ns and recent.get(entry.name) != mtime_ns:
+                    pending.append((mtime_ns, entry.name, Path(entry.path)))
+        pending.sort()
+
         nodes: list[IntelligenceNode] = []
-        mission_files = sorted(self.config.missions_dir.glob("*.json"))
-        for mission_file in mission_files:
-            mission_mtime = mission_file.stat().st_mtime
-            if not force_rescan and self.state.get(str(mission_file)) == mission_mtime:
-                continue
+        for mtime_ns, name, mission_file in pending:
             try:
                 mission_payload = _read_json(mission_file)
             except json.JSONDecodeError as exc:
                 self._log("error", {"mission_file": str(mission_file), "error": f"invalid json: {exc}"})
-                continue
-            extracted = self._process_mission(mission_payload, mission_file)
-            if extracted:
-                nodes.extend(extracted)
-            self.state[str(mission_file)] = mission_mtime
-        if nodes:
+            else:
+                extracted = self._process_mission(mission_payload, mission_file)
+                if extracted:
+                    nodes.extend(extracted)
+            # A rewrite changes the mtime, so bad files are retried then.
+            self.state["recent"][name] = mtime_ns
+        advanced = self._advance_cursor(scan_started_ns - CURSOR_SETTLE_NS)
+
+        settled = time.time_ns() - dir_mtime_ns >= MTIME_SETTLE_NS
+        gate = dir_mtime_ns if settled else None
+        if pending or advanced or gate != self.state.get("missions_dir_mtime_ns"):
+            self.state["missions_dir_mtime_ns"] = gate
             self._write_state()
         return nodes
 
+    def _advance_cursor(self, cursor_ns: int) -> bool:
+        """Move the high-water mark to ``cursor_ns`` and drop names it now covers."""
+        if cursor_ns <= self.state["cursor_mtime_ns"]:
+            return False
+        self.state["cursor_mtime_ns"] = cursor_ns
+        self.state["recent"] = {name: mtime for name, mtime in self.state["recent"].items() if mtime > cursor_ns}
+        return True
+
     def run_loop(self) -> None:
         LOGGER.info("Starting intelligence collector loop (interval=%ss)", self.config.poll_interval)
         while True:
@@ -157,13 +215,18 @@ class IntelligenceCollector:
 
         payload = self._load_deliverable_payload(mission)
         nodes = list(self._normalise_nodes(category, mission, payload))
-        stored: list[IntelligenceNode] = []
+        pending: list[tuple[IntelligenceNode, Path]] = []
         for node in nodes:
             content_hash = self._hash_node(node)
             cache_file = self.config.node_dir / f"{content_hash}.json"
             if cache_file.exists():
                 continue
-            self.db.store_node(node)
+            pending.append((node, cache_file))
+        # One transaction for the whole deliverable instead of one per node.
+        self.db.store_nodes(node for node, _ in pending)
+
+        stored: list[IntelligenceNode] = []
+        for node, cache_file in pending:
             cache_file.write_text(
                 json.dumps(
                     {
@@ -224,15 +287,24 @@ class IntelligenceCollector:
         archive_dir = self.config.archive_root / recipient / "archive"
         if not archive_dir.exists():
             return {}
-        candidates = sorted(archive_dir.glob(f"*{mission_id}*.json"))
-        for candidate in reversed(candidates):
+        payload = self._first_readable(self.deliverables.lookup(archive_dir, mission_id))
+        if payload is None:
+            # Messages archived before the index existed, or by writers that
+            # do not record themselves, are still found by name.
+            candidates = sorted(archive_dir.glob(f"*{mission_id}*.json"))
+            payload = self._first_readable(reversed(candidates))
+        return payload or {}
+
+    @staticmethod
+    def _first_readable(candidates: Iterable[Path]) -> dict[str, Any] | None:
+        for candidate in candidates:
             try:
                 payload = _read_json(candidate)
                 payload["_source_file"] = str(candidate)
                 return payload
-            except json.JSONDecodeError:
+            except (FileNotFoundError, json.JSONDecodeError):
                 continue
-        return {}
+        return None
 
     def _normalise_nodes(
         self,
@@ -368,13 +440,26 @@ class IntelligenceCollector:
         return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
     # ------------------------------------------------------------------ state + logging
-    def _load_state(self) -> dict[str, float]:
+    def _load_state(self) -> dict[str, Any]:
+        state: dict[str, Any] = {}
         if self.config.state_path.exists():
             try:
-                return json.loads(self.config.state_path.read_text(encoding="utf-8"))
+                state = json.loads(self.config.state_path.read_text(encoding="utf-8"))
             except (json.JSONDecodeError, OSError):
-                return {}
-        return {}
+                state = {}
+        if state.get("version") == STATE_VERSION:
+            return state
+        # The original format kept ``{path: st_mtime}`` for every mission ever
+        # seen; its newest entry becomes the starting high-water mark. Float
+        # seconds only keep ~0.25us of precision, so the cursor is rounded up
+        # past that rather than matched against exact nanosecond mtimes.
+        newest = max((value for value in state.values() if isinstance(value, (int, float))), default=None)
+        return {
+            "version": STATE_VERSION,
+            "missions_dir_mtime_ns": None,
+            "cursor_mtime_ns": -1 if newest is None else int(newest * 1_000_000_000) + 1_000,
+            "recent": {},
+        }
 
     def _write_state(self) -> None:
         _safe_write_json(self.config.state_path, self.state)
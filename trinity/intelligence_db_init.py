@@ -8,6 +8,24 @@ from trinity.config import load_configuration
 
 DEFAULT_SCHEMA = Path(__file__).with_name("intelligence_schema.sql")
 
+_TAGGED_TABLES = ("grants", "insights", "contacts", "revenue_signals")
+_FTS_TABLES = ("grants", "insights", "contacts", "revenue_signals", "operational_metrics")
+
+# Derived tables are filled by triggers from then on; when one is added to an
+# existing database, populate it once from the rows already there.
+_BACKFILL: dict[str, list[str]] = {
+    "node_tags": [
+        f"""
+        INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+            SELECT '{table}', tags.value, source.id
+            FROM {table} AS source,
+                 json_each(CASE WHEN json_valid(source.tags) THEN source.tags ELSE '[]' END) AS tags
+        """
+        for table in _TAGGED_TABLES
+    ],
+    **{f"{table}_fts": [f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')"] for table in _FTS_TABLES},
+}
+
 
 def initialise_database(db_path: Path | str | None = None, schema_path: Path | str | None = None) -> Path:
     """Create the intelligence database if it does not already exist."""
@@ -23,8 +41,15 @@ def initialise_database(db_path: Path | str | None = None, schema_path: Path | s
     with sqlite3.connect(resolved_db) as connection:
         connection.execute("PRAGMA foreign_keys = ON;")
         connection.execute("PRAGMA journal_mode = WAL;")
+        existing = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
         connection.executescript(script)
+        if existing:
+            for table, statements in _BACKFILL.items():
+                if table not in existing:
+                    for statement in statements:
+                        connection.execute(statement)
         connection.commit()
+    connection.close()
     return resolved_db
 
 
@@ -196,3 +196,90 @@ CREATE TRIGGER IF NOT EXISTS operational_au AFTER UPDATE ON operational_metrics
     INSERT INTO operational_metrics_fts(operational_metrics_fts, rowid, metric_type) VALUES ('delete', old.rowid, old.metric_type);
     INSERT INTO operational_metrics_fts(rowid, metric_type) VALUES (new.rowid, new.metric_type);
 END;
+
+-- ============================================================
+-- Normalised tags (kept in sync from each table's JSON tags column)
+-- ============================================================
+
+CREATE TABLE IF NOT EXISTS node_tags (
+    kind TEXT NOT NULL,
+    tag TEXT NOT NULL COLLATE NOCASE,
+    node_id TEXT NOT NULL,
+    PRIMARY KEY (kind, tag, node_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_node_tags_node ON node_tags(kind, node_id);
+
+CREATE TRIGGER IF NOT EXISTS grants_tags_ai AFTER INSERT ON grants BEGIN
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'grants', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS grants_tags_ad AFTER DELETE ON grants BEGIN
+    DELETE FROM node_tags WHERE kind = 'grants' AND node_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS grants_tags_au AFTER UPDATE OF id, tags ON grants BEGIN
+    DELETE FROM node_tags WHERE kind = 'grants' AND node_id = old.id;
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'grants', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS insights_tags_ai AFTER INSERT ON insights BEGIN
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'insights', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS insights_tags_ad AFTER DELETE ON insights BEGIN
+    DELETE FROM node_tags WHERE kind = 'insights' AND node_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS insights_tags_au AFTER UPDATE OF id, tags ON insights BEGIN
+    DELETE FROM node_tags WHERE kind = 'insights' AND node_id = old.id;
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'insights', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS contacts_tags_ai AFTER INSERT ON contacts BEGIN
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'contacts', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS contacts_tags_ad AFTER DELETE ON contacts BEGIN
+    DELETE FROM node_tags WHERE kind = 'contacts' AND node_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS contacts_tags_au AFTER UPDATE OF id, tags ON contacts BEGIN
+    DELETE FROM node_tags WHERE kind = 'contacts' AND node_id = old.id;
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'contacts', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS revenue_tags_ai AFTER INSERT ON revenue_signals BEGIN
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'revenue_signals', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+CREATE TRIGGER IF NOT EXISTS revenue_tags_ad AFTER DELETE ON revenue_signals BEGIN
+    DELETE FROM node_tags WHERE kind = 'revenue_signals' AND node_id = old.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS revenue_tags_au AFTER UPDATE OF id, tags ON revenue_signals BEGIN
+    DELETE FROM node_tags WHERE kind = 'revenue_signals' AND node_id = old.id;
+    INSERT OR IGNORE INTO node_tags(kind, tag, node_id)
+        SELECT 'revenue_signals', value, new.id FROM json_each(CASE WHEN json_valid(new.tags) THEN new.tags ELSE '[]' END);
+END;
+
+-- ============================================================
+-- Ordering indexes (match the ORDER BY clauses used by intel_lookup)
+-- ============================================================
+
+CREATE INDEX IF NOT EXISTS idx_grants_rank ON grants((fit_score IS NULL), fit_score DESC, (deadline IS NULL), deadline);
+CREATE INDEX IF NOT EXISTS idx_grants_recent ON grants((discovered_at IS NULL), discovered_at DESC);
+CREATE INDEX IF NOT EXISTS idx_insights_rank ON insights((relevance_score IS NULL), relevance_score DESC, discovered_at DESC);
+CREATE INDEX IF NOT EXISTS idx_insights_recent ON insights((discovered_at IS NULL), discovered_at DESC);
+CREATE INDEX IF NOT EXISTS idx_contacts_rank ON contacts((last_contact IS NULL), last_contact DESC, discovered_at DESC);
+CREATE INDEX IF NOT EXISTS idx_contacts_recent ON contacts((discovered_at IS NULL), discovered_at DESC);
+CREATE INDEX IF NOT EXISTS idx_revenue_rank ON revenue_signals((probability IS NULL), probability DESC, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_revenue_recent ON revenue_signals((created_at IS NULL), created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_operational_recent ON operational_metrics((timestamp IS NULL), timestamp DESC);
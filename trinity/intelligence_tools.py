@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import threading
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from trinity.config import load_configuration
 from trinity.intelligence_db_init import initialise_database
@@ -54,28 +56,75 @@ class IntelligenceNode:
     tags: list[str]
 
 
+_INSERT_SQL = {
+    "grant": """
+        INSERT OR IGNORE INTO grants (id, title, program, deadline, budget, fit_score, status,
+                                      source_mission, discovered_at, tags)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "insight": """
+        INSERT OR IGNORE INTO insights (id, category, summary, details, source,
+                                        source_mission, discovered_at, relevance_score, tags)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "contact": """
+        INSERT OR IGNORE INTO contacts (id, name, organization, role, connection_strength,
+                                        location, last_contact, tags, notes, source_mission, discovered_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "revenue": """
+        INSERT OR IGNORE INTO revenue_signals (id, channel, value_estimate, probability,
+                                               stage, source_mission, created_at, tags)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    "operational": """
+        INSERT OR IGNORE INTO operational_metrics (id, metric_type, value, timestamp, source_mission)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+}
+
+
 class IntelligenceDatabase:
-    """Thin wrapper around the SQLite intelligence database."""
+    """
+    Thin wrapper around the SQLite intelligence database.
+
+    Each thread gets one long-lived connection (PRAGMAs applied once), so
+    repeated stores and lookups no longer pay for ``sqlite3.connect``.
+    """
 
     def __init__(self, db_path: Path | None = None) -> None:
         paths, _ = load_configuration()
         self.db_path = (db_path if db_path is not None else paths.memory_dir / "intelligence.db").resolve()
         initialise_database(self.db_path)
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
 
     def store_node(self, node: IntelligenceNode) -> None:
-        match node.category:
-            case "grant":
-                self._insert_grant(node)
-            case "insight":
-                self._insert_insight(node)
-            case "contact":
-                self._insert_contact(node)
-            case "revenue":
-                self._insert_revenue(node)
-            case "operational":
-                self._insert_operational(node)
-            case _:
+        self.store_nodes([node])
+
+    def store_nodes(self, nodes: Iterable[IntelligenceNode]) -> int:
+        """
+        Insert many nodes in a single transaction; return how many were new.
+
+        Rows are grouped per category and written with ``executemany``.
+        Unknown categories raise ``ValueError`` before anything is written.
+        """
+        rows: dict[str, list[tuple[Any, ...]]] = {}
+        for node in nodes:
+            builder = self._ROW_BUILDERS.get(node.category)
+            if builder is None:
                 raise ValueError(f"Unsupported intelligence category '{node.category}'")
+            rows.setdefault(node.category, []).append(builder(node))
+        if not rows:
+            return 0
+
+        inserted = 0
+        with self._connection() as connection:
+            for category, category_rows in rows.items():
+                cursor = connection.executemany(_INSERT_SQL[category], category_rows)
+                inserted += max(cursor.rowcount, 0)
+        return inserted
 
     def query(
         self,
@@ -95,14 +144,31 @@ class IntelligenceDatabase:
             rows = [dict(row) for row in cursor.fetchall()]
         return rows
 
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
     def _connection(self) -> sqlite3.Connection:
-        connection = sqlite3.connect(self.db_path)
+        connection = getattr(self._local, "connection", None)
+        # A forked child must not reuse the parent's handle.
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
         connection.row_factory = sqlite3.Row
         connection.execute("PRAGMA foreign_keys = ON;")
         connection.execute("PRAGMA busy_timeout = 5000;")
+        connection.execute("PRAGMA synchronous = NORMAL;")
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        with self._connections_lock:
+            self._connections.append(connection)
         return connection
 
-    def _insert_grant(self, node: IntelligenceNode) -> None:
+    @staticmethod
+    def _grant_row(node: IntelligenceNode) -> tuple[Any, ...]:
         title = node.data.get("title") or node.data.get("name") or node.data.get("summary") or "Untitled opportunity"
         program = node.data.get("program")
         deadline = _serialise_timestamp(node.data.get("deadline"))
@@ -110,29 +176,21 @@ class IntelligenceDatabase:
         fit_score = _parse_numeric(node.data.get("fit_score"))
         status = node.data.get("status") or "new"
         tags = _json_dump(node.tags or node.data.get("tags"))
-
-        with self._connection() as connection:
-            connection.execute(
-                """
-                INSERT OR IGNORE INTO grants (id, title, program, deadline, budget, fit_score, status,
-                                              source_mission, discovered_at, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    node.id,
-                    title,
-                    program,
-                    deadline,
-                    budget,
-                    fit_score,
-                    status,
-                    node.source_mission,
-                    node.timestamp,
-                    tags,
-                ),
-            )
-
-    def _insert_insight(self, node: IntelligenceNode) -> None:
+        return (
+            node.id,
+            title,
+            program,
+            deadline,
+            budget,
+            fit_score,
+            status,
+            node.source_mission,
+            node.timestamp,
+            tags,
+        )
+
+    @staticmethod
+    def _insight_row(node: IntelligenceNode) -> tuple[Any, ...]:
         summary = node.data.get("summary") or node.data.get("title") or "Untitled insight"
         details = node.data.get("details") or node.data.get("body")
         category = node.data.get("insight_category") or node.data.get("category") or "market"
@@ -140,28 +198,20 @@ class IntelligenceDatabase:
         tags = _json_dump(node.tags or node.data.get("tags"))
         relevance = node.data.get("relevance_score", node.relevance_score)
         relevance_value = _parse_numeric(relevance)
-
-        with self._connection() as connection:
-            connection.execute(
-                """
-                INSERT OR IGNORE INTO insights (id, category, summary, details, source,
-                                                source_mission, discovered_at, relevance_score, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    node.id,
-                    category,
-                    summary,
-                    details,
-                    source,
-                    node.source_mission,
-                    node.timestamp,
-                    relevance_value,
-                    tags,
-                ),
-            )
-
-    def _insert_contact(self, node: IntelligenceNode) -> None:
+        return (
+            node.id,
+            category,
+            summary,
+            details,
+            source,
+            node.source_mission,
+            node.timestamp,
+            relevance_value,
+            tags,
+        )
+
+    @staticmethod
+    def _contact_row(node: IntelligenceNode) -> tuple[Any, ...]:
         name = node.data.get("name") or "Unknown contact"
         organization = node.data.get("organization")
         role = node.data.get("role")
@@ -170,74 +220,58 @@ class IntelligenceDatabase:
         last_contact = _serialise_timestamp(node.data.get("last_contact"))
         notes = node.data.get("notes")
         tags = _json_dump(node.tags or node.data.get("tags"))
-
-        with self._connection() as connection:
-            connection.execute(
-                """
-                INSERT OR IGNORE INTO contacts (id, name, organization, role, connection_strength,
-                                                location, last_contact, tags, notes, source_mission, discovered_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    node.id,
-                    name,
-                    organization,
-                    role,
-                    connection_strength,
-                    location,
-                    last_contact,
-                    tags,
-                    notes,
-                    node.source_mission,
-                    node.timestamp,
-                ),
-            )
-
-    def _insert_revenue(self, node: IntelligenceNode) -> None:
+        return (
+            node.id,
+            name,
+            organization,
+            role,
+            connection_strength,
+            location,
+            last_contact,
+            tags,
+            notes,
+            node.source_mission,
+            node.timestamp,
+        )
+
+    @staticmethod
+    def _revenue_row(node: IntelligenceNode) -> tuple[Any, ...]:
         channel = node.data.get("channel")
         value_estimate = _parse_numeric(node.data.get("value_estimate"))
         probability = _parse_numeric(node.data.get("probability"))
         stage = node.data.get("stage") or "lead"
         tags = _json_dump(node.tags or node.data.get("tags"))
-
-        with self._connection() as connection:
-            connection.execute(
-                """
-                INSERT OR IGNORE INTO revenue_signals (id, channel, value_estimate, probability,
-                                                       stage, source_mission, created_at, tags)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    node.id,
-                    channel,
-                    value_estimate,
-                    probability,
-                    stage,
-                    node.source_mission,
-                    node.timestamp,
-                    tags,
-                ),
-            )
-
-    def _insert_operational(self, node: IntelligenceNode) -> None:
+        return (
+            node.id,
+            channel,
+            value_estimate,
+            probability,
+            stage,
+            node.source_mission,
+            node.timestamp,
+            tags,
+        )
+
+    @staticmethod
+    def _operational_row(node: IntelligenceNode) -> tuple[Any, ...]:
         metric_type = node.data.get("metric_type") or node.data.get("name") or "metric"
         value = _parse_numeric(node.data.get("value"))
         timestamp = _serialise_timestamp(node.data.get("timestamp") or node.timestamp)
-
-        with self._connection() as connection:
-            connection.execute(
-                """
-                INSERT OR IGNORE INTO operational_metrics (id, metric_type, value, timestamp, source_mission)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    node.id,
-                    metric_type,
-                    value,
-                    timestamp,
-                    node.source_mission,
-                ),
-            )
+        return (
+            node.id,
+            metric_type,
+            value,
+            timestamp,
+            node.source_mission,
+        )
+
+    _ROW_BUILDERS = {
+        "grant": _grant_row,
+        "insight": _insight_row,
+        "contact": _contact_row,
+        "revenue": _revenue_row,
+        "operational": _operational_row,
+    }
 
     def _build_select(
         self,
@@ -257,6 +291,9 @@ class IntelligenceDatabase:
 
         clauses: list[str] = []
         params: list[Any] = []
+        tags = filters.get("tags")
+        if tags and table != "operational_metrics":
+            clauses.extend(_tag_clauses(table, tags, params))
 
         filter_handlers = {
             "grants": self._grant_filters,
@@ -320,9 +357,6 @@ class IntelligenceDatabase:
                 op, val = _parse_deadline(value)
                 clauses.append(f"deadline {op} ?")
                 params.append(val)
-            elif key == "tags":
-                clauses.append("tags LIKE ?")
-                params.append(f"%{value}%")
         return clauses
 
     def _insight_filters(self, filters: dict[str, Any], params: list[Any]) -> list[str]:
@@ -335,9 +369,6 @@ class IntelligenceDatabase:
                 op, val = _parse_operator(value)
                 clauses.append(f"relevance_score {op} ?")
                 params.append(_parse_numeric(val))
-            elif key == "tags":
-                clauses.append("tags LIKE ?")
-                params.append(f"%{value}%")
         return clauses
 
     def _contact_filters(self, filters: dict[str, Any], params: list[Any]) -> list[str]:
@@ -384,6 +415,19 @@ class IntelligenceDatabase:
         return clauses
 
 
+def _tag_clauses(table: str, tags: Any, params: list[Any]) -> list[str]:
+    """Exact (case-insensitive) tag matches through the ``node_tags`` index; a list means all of them.
+
+    A scalar (string, number, bool) is a single tag; every value is matched as text.
+    """
+    values = [tags] if isinstance(tags, (str, bytes)) or not isinstance(tags, Iterable) else list(tags)
+    clauses: list[str] = []
+    for tag in values:
+        clauses.append("id IN (SELECT node_id FROM node_tags WHERE kind = ? AND tag = ?)")
+        params.extend([table, tag.decode("utf-8", errors="replace") if isinstance(tag, bytes) else str(tag)])
+    return clauses
+
+
 def _parse_operator(value: Any) -> tuple[str, Any]:
     if isinstance(value, str):
         value = value.strip()
@@ -0,0 +1,348 @@
+"""Buffered, rotating JSONL sinks shared by Trinity's event and audit logs."""
+from __future__ import annotations
+
+import atexit
+import fcntl
+import gzip
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, Optional
+
+LOGGER = logging.getLogger("trinity.log_sink")
+
+# Trinity modules import this as ``log_sink`` (trinity/ on sys.path) or as
+# ``trinity.log_sink`` (repo root on sys.path). Register both names so the
+# sink registry, the atexit flush and the fork hook exist once per process.
+for _alias in ("log_sink", "trinity.log_sink"):
+    sys.modules.setdefault(_alias, sys.modules[__name__])
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_ROTATE_INTERVAL = 24 * 3600.0
+DEFAULT_BACKUP_COUNT = 10
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_PENDING = 50_000
+
+_TAIL_BLOCK = 64 * 1024
+
+ErrorHandler = Callable[[List[str], OSError], None]
+
+
+class LogSink:
+    """
+    Append JSON lines to ``path`` from a background thread.
+
+    ``write`` serialises the record and queues it; a daemon thread appends
+    queued lines in one ``write`` per batch every ``flush_interval`` seconds
+    (sooner once ``batch_size`` lines are waiting). Appends take an exclusive
+    ``flock`` so several processes can share a file and rotate it safely.
+
+    The file is rotated before a batch that would take it past ``max_bytes``,
+    or once this process has been writing to it for ``rotate_interval``
+    seconds. Rotated files are renamed to ``<name>.<UTC timestamp>``,
+    gzip-compressed, and only the newest ``backup_count`` are kept.
+
+    When more than ``max_pending`` lines are waiting (the disk is stalled),
+    new records are dropped and counted in ``dropped`` rather than blocking
+    the caller. Failed appends are logged and handed to ``on_error``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        rotate_interval: Optional[float] = DEFAULT_ROTATE_INTERVAL,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        compress: bool = True,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        on_error: Optional[ErrorHandler] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.on_error = on_error
+        self.dropped = 0
+        self._reset()
+        _LIVE_SINKS.add(self)
+
+    def _reset(self) -> None:
+        self._pending: Deque[str] = deque()
+        self._wakeup = threading.Condition(threading.Lock())
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._inode: Optional[int] = None
+        self._inode_since = 0.0
+
+    # ------------------------------------------------------------------ producers
+    def write(self, record: Mapping[str, Any], *, ensure_ascii: bool = True) -> None:
+        """Queue ``record`` as one JSON line; never touches the file."""
+        self.write_line(json.dumps(record, ensure_ascii=ensure_ascii, default=str))
+
+    def write_line(self, line: str) -> None:
+        with self._wakeup:
+            if self._closed:
+                raise ValueError(f"log sink for {self.path} is closed")
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending.append(line + "\n")
+            if self._thread is None:
+                self._start()
+            if len(self._pending) in (1, self.batch_size):
+                self._wakeup.notify()
+
+    def flush(self) -> None:
+        """Write everything queued so far before returning."""
+        self._flush_pending()
+
+    def close(self) -> None:
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._flush_pending()
+
+    # ------------------------------------------------------------------ flusher
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"log-sink:{self.path.name}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._closed:
+                    self._wakeup.wait()
+                # Give the batch ``flush_interval`` to fill up.
+                if not self._closed and len(self._pending) < self.batch_size:
+                    self._wakeup.wait(self.flush_interval)
+                closed = self._closed
+            self._flush_pending()
+            if closed:
+                return
+
+    def _flush_pending(self) -> None:
+        with self._io_lock:
+            with self._wakeup:
+                if not self._pending:
+                    return
+                lines = list(self._pending)
+                self._pending.clear()
+            try:
+                rotated = self._append("".join(lines).encode("utf-8"))
+            except OSError as exc:
+                LOGGER.warning("Failed to append %d records to %s: %s", len(lines), self.path, exc)
+                if self.on_error is not None:
+                    self.on_error([line.rstrip("\n") for line in lines], exc)
+                return
+        if rotated is not None:
+            self._finish_rotation(rotated)
+
+    def _append(self, data: bytes) -> Optional[Path]:
+        """Append ``data`` under the file lock; return a freshly rotated file, if any."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rotated: Optional[Path] = None
+        for _attempt in range(5):
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                stat = os.fstat(fd)
+                try:
+                    current = os.stat(self.path).st_ino
+                except FileNotFoundError:
+                    current = None
+                if current != stat.st_ino:
+                    # Another writer rotated the file while we waited for the lock.
+                    continue
+                if rotated is None and self._should_rotate(stat.st_ino, stat.st_size, len(data)):
+                    rotated = self._rotated_name()
+                    os.rename(self.path, rotated)
+                    continue
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view) :]
+                return rotated
+            finally:
+                os.close(fd)
+        raise OSError(f"could not acquire a stable handle on {self.path}")
+
+    def _should_rotate(self, inode: int, size: int, incoming: int) -> bool:
+        now = time.monotonic()
+        if inode != self._inode:
+            self._inode, self._inode_since = inode, now
+        if size == 0:
+            return False
+        if self.max_bytes and size + incoming > self.max_bytes:
+            return True
+        return self.rotate_interval is not None and now - self._inode_since >= self.rotate_interval
+
+    def _rotated_name(self) -> Path:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        candidate = self.path.with_name(f"{self.path.name}.{stamp}")
+        counter = 1
+        while candidate.exists() or candidate.with_name(candidate.name + ".gz").exists():
+            candidate = self.path.with_name(f"{self.path.name}.{stamp}-{counter}")
+            counter += 1
+        return candidate
+
+    def _finish_rotation(self, rotated: Path) -> None:
+        if self.compress:
+            target = rotated.with_name(rotated.name + ".gz")
+            tmp = rotated.with_name(f".{target.name}.tmp")
+            try:
+                with rotated.open("rb") as source, gzip.open(tmp, "wb") as sink:
+                    shutil.copyfileobj(source, sink)
+                os.replace(tmp, target)
+                rotated.unlink()
+            except OSError as exc:
+                LOGGER.warning("Failed to compress rotated log %s: %s", rotated, exc)
+                tmp.unlink(missing_ok=True)
+        for stale in rotated_files(self.path)[self.backup_count :]:
+            stale.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------- registry
+_SINKS: Dict[Path, LogSink] = {}
+_SINKS_LOCK = threading.Lock()
+_LIVE_SINKS: "weakref.WeakSet[LogSink]" = weakref.WeakSet()
+
+
+def get_sink(path: Path, **options: Any) -> LogSink:
+    """
+    Return the process-wide sink for ``path``, creating it on first use.
+
+    ``options`` are passed to :class:`LogSink` and only take effect for the
+    call that creates the sink.
+    """
+    key = Path(path).resolve()
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None or sink._closed:
+            sink = _SINKS[key] = LogSink(key, **options)
+        return sink
+
+
+def flush_all() -> None:
+    for sink in list(_LIVE_SINKS):
+        try:
+            sink.flush()
+        except Exception:  # pragma: no cover - interpreter shutdown guard
+            LOGGER.exception("Failed to flush %s", sink.path)
+
+
+def _after_fork_in_child() -> None:
+    # The flusher threads did not survive the fork and the parent still owns
+    # whatever it had queued.
+    for sink in list(_LIVE_SINKS):
+        sink._reset()
+
+
+atexit.register(flush_all)
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# ---------------------------------------------------------------------- readers
+def rotated_files(path: Path) -> List[Path]:
+    """Rotated siblings of ``path``, newest first."""
+    path = Path(path)
+    prefix = f"{path.name}."
+    try:
+        names = [entry.name for entry in os.scandir(path.parent) if entry.name.startswith(prefix)]
+    except FileNotFoundError:
+        return []
+    names = [name for name in names if name[len(prefix) : len(prefix) + 1].isdigit()]
+    return [path.with_name(name) for name in sorted(names, reverse=True)]
+
+
+def _reverse_lines(path: Path) -> Iterator[bytes]:
+    """Yield the lines of ``path`` last to first, reading backwards in blocks."""
+    with path.open("rb") as handle:
+        position = handle.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            step = min(_TAIL_BLOCK, position)
+            position -= step
+            handle.seek(position)
+            block = handle.read(step) + remainder
+            lines = block.split(b"\n")
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def _reverse_archive_lines(path: Path) -> Iterator[bytes]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as handle:
+        lines = handle.read().split(b"\n")
+    for line in reversed(lines):
+        if line.strip():
+            yield line
+
+
+def tail_lines(path: Path, limit: int, *, include_rotated: bool = True) -> List[str]:
+    """
+    Return the last ``limit`` lines of ``path``, oldest first.
+
+    The live file is read backwards block by block, so the cost follows
+    ``limit`` rather than the file size. If it holds fewer lines, the newest
+    rotated files are read next.
+    """
+    path = Path(path)
+    if limit <= 0:
+        return []
+    sources: List[Callable[[], Iterator[bytes]]] = [lambda: _reverse_lines(path)]
+    if include_rotated:
+        sources.extend(lambda backup=backup: _reverse_archive_lines(backup) for backup in rotated_files(path))
+    collected: List[str] = []
+    for source in sources:
+        try:
+            for line in source():
+                collected.append(line.decode("utf-8", errors="replace"))
+                if len(collected) >= limit:
+                    return collected[::-1]
+        except OSError:
+            continue
+    return collected[::-1]
+
+
+def tail_records(path: Path, limit: int, *, include_rotated: bool = True) -> List[dict]:
+    """Like :func:`tail_lines` but decoded; lines that are not JSON are skipped."""
+    records: List[dict] = []
+    for line in tail_lines(path, limit, include_rotated=include_rotated):
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+__all__ = [
+    "LogSink",
+    "flush_all",
+    "get_sink",
+    "rotated_files",
+    "tail_lines",
+    "tail_records",
+]
@@ -2,6 +2,7 @@ from __future__ import annotations
 import os
 
 import argparse
+import heapq
 import json
 import signal
 import sys
@@ -12,6 +13,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from datetime import datetime
 from config import load_configuration
+from log_sink import get_sink
 from mission_queue_manager import MissionQueueManager
 from reasoning_fork import ReasoningFork, Task, Resident
 from mechanical_bouncer import MechanicalBouncer
@@ -40,6 +42,8 @@ class DispatcherConfig:
     poll_interval: float = 30.0
     heartbeat_interval: float = 300.0
     dispatcher_name: str = "mission_dispatcher"
+    # Re-list queued/ at least this often even if its mtime looks unchanged.
+    queue_resync_interval: float = 60.0
 
 
 class MissionDispatcher:
@@ -57,9 +61,14 @@ class MissionDispatcher:
         self.manager = manager or MissionQueueManager()
         self.log_path = log_path or (paths.log_dir / "dispatcher.jsonl")
         self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log_sink = get_sink(self.log_path)
         self.fork = ReasoningFork()
         self.bouncer = MechanicalBouncer()
         self._stop_requested = False
+        self._queue_order: List[Tuple[float, float, Path, Dict[str, Any]]] = []
+        self._queue_stamps: Dict[str, Tuple[int, int, int]] = {}
+        self._queue_mtime_ns: Optional[int] = None
+        self._queue_synced_at = 0.0
         signal.signal(signal.SIGTERM, self._request_stop)
         signal.signal(signal.SIGINT, self._request_stop)
 
@@ -72,24 +81,54 @@ class MissionDispatcher:
             "event": event,
             **payload,
         }
-        with self.log_path.open("a", encoding="utf-8") as handle:
-            json.dump(record, handle)
-            handle.write("\n")
+        self._log_sink.write(record)
 
     def _queued_missions(self) -> List[Tuple[float, float, Path, Dict[str, Any]]]:
-        missions: List[Tuple[float, float, Path, Dict[str, Any]]] = []
+        """
+        Queued missions ordered by ``(-priority, created_at, path)``.
+
+        The ordered list is cached between polls and refreshed when the queue
+        directory's mtime changes, or every ``queue_resync_interval`` seconds
+        regardless, since a coarse or reused mtime can hide a change (as
+        :class:`MissionIndex` does). A refresh lists the directory and parses
+        just the files whose inode, mtime or size changed; surviving entries
+        keep their order and are merged with the sorted newcomers instead of
+        re-sorting the whole queue.
+        """
         queue_dir = self.manager.missions.queued
-        
         try:
-            found_files_raw = os.listdir(queue_dir)
+            mtime_ns = queue_dir.stat().st_mtime_ns
+        except OSError:
+            return []
+        now = time.monotonic()
+        if mtime_ns == self._queue_mtime_ns and now - self._queue_synced_at < self.config.queue_resync_interval:
+            return self._queue_order
+
+        found: Dict[str, Tuple[int, int, int]] = {}
+        try:
+            with os.scandir(queue_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    found[entry.name] = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
         except OSError:
             return []
 
-        found_files = [queue_dir / f for f in found_files_raw if f.endswith(".json")]
-        for path in sorted(found_files):
+        added: List[Tuple[float, float, Path, Dict[str, Any]]] = []
+        for name, stamp in found.items():
+            if self._queue_stamps.get(name) == stamp:
+                continue
+            path = queue_dir / name
             try:
                 with path.open("r", encoding="utf-8") as handle:
                     mission = json.load(handle)
+                fallback_time = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
             except json.JSONDecodeError:
                 self.manager.fail_queued_mission(path.stem, "Invalid JSON payload")
                 self.log_event(
@@ -101,11 +140,22 @@ class MissionDispatcher:
             created_at = (
                 _parse_timestamp(mission.get("created_at"))
                 or _parse_timestamp(mission.get("queued_at"))
-                or path.stat().st_mtime
+                or fallback_time
             )
-            missions.append((-priority, created_at, path, mission))
-        missions.sort()
-        return missions
+            added.append((-priority, created_at, path, mission))
+        added.sort()
+
+        refreshed = {entry[2].name for entry in added}
+        kept = [
+            entry
+            for entry in self._queue_order
+            if entry[2].name in found and entry[2].name not in refreshed
+        ]
+        self._queue_order = list(heapq.merge(kept, added))
+        self._queue_stamps = {name: found[name] for name in (entry[2].name for entry in self._queue_order)}
+        self._queue_mtime_ns = mtime_ns
+        self._queue_synced_at = now
+        return self._queue_order
 
     def process_queue(self) -> int:
         assignments = 0
@@ -134,8 +184,7 @@ class MissionDispatcher:
                 mission["routing_decision"] = self.fork.explain_routing(task)
                 
                 # Save update back to queue file before assigning
-                with path.open("w", encoding="utf-8") as f:
-                    json.dump(mission, f, indent=2)
+                self.manager.update_queued_mission(mission_id, mission)
 
             # 2. Mechanical Bouncer: Check Availability
             if not self.bouncer.check_admission(assigned_to):
@@ -145,8 +194,7 @@ class MissionDispatcher:
                 assigned_to = backup
                 # Update again
                 mission["assigned_to"] = assigned_to
-                with path.open("w", encoding="utf-8") as f:
-                    json.dump(mission, f, indent=2)
+                self.manager.update_queued_mission(mission_id, mission)
                 
                 # If backup also full? (Simple check for now: allow backup)
             
@@ -189,7 +237,7 @@ class MissionDispatcher:
 
             now = time.monotonic()
             if now >= next_heartbeat:
-                queued_count = len(list(self.manager.missions.queued.glob("*.json")))
+                queued_count = self.manager.queued_count()
                 active_count = len(list(self.manager.missions.active.glob("*.json")))
                 self.log_event(
                     "heartbeat",
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
+import threading
+import time
 import uuid
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from config import TrinityPaths, load_configuration
+from log_sink import get_sink
 from pucklib import TalkingDrumTransmitter
 
 ISO_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
@@ -21,6 +27,25 @@ def isoformat_now() -> str:
     return utc_now().strftime(ISO_FORMAT)
 
 
+def parse_priority(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def parse_timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            normalized = value.replace("Z", "+00:00")
+            return datetime.fromisoformat(normalized).timestamp()
+        except (ValueError, TypeError):
+            return 0.0
+    return 0.0
+
+
 @dataclass(frozen=True)
 class MissionPaths:
     root: Path
@@ -29,10 +54,155 @@ class MissionPaths:
     completed: Path
     failed: Path
     log_file: Path
+    index_file: Path
+
+
+class MissionIndex:
+    """
+    SQLite (WAL) index of queued missions keyed by resident and priority.
+
+    The ``queued/`` directory stays the source of truth and human-readable
+    mirror: the index is reconciled against it whenever the directory's mtime
+    changes, parsing only files it has not seen. Rows are removed as soon as a
+    mission leaves the queue, so the index only ever holds queued work.
+    """
+
+    def __init__(self, path: Path, queued_dir: Path, resync_interval: float = 5.0) -> None:
+        self.path = path
+        self.queued_dir = queued_dir
+        self.resync_interval = resync_interval
+        self._lock = threading.Lock()
+        self._synced_mtime_ns: int | None = None
+        self._synced_at = 0.0
+        self._connection = sqlite3.connect(str(path), check_same_thread=False, timeout=30.0, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS queued_missions (
+                file_name TEXT PRIMARY KEY,
+                mission_id TEXT NOT NULL,
+                resident TEXT NOT NULL,
+                priority REAL NOT NULL,
+                created_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_queued_claim "
+            "ON queued_missions(resident, priority DESC, created_at, file_name)"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _row(file_name: str, mission: Dict[str, Any], fallback_time: float) -> tuple[str, str, str, float, float]:
+        created_at = (
+            parse_timestamp(mission.get("created_at"))
+            or parse_timestamp(mission.get("queued_at"))
+            or fallback_time
+        )
+        return (
+            file_name,
+            str(mission.get("mission_id") or Path(file_name).stem),
+            str(mission.get("assigned_to") or "").lower(),
+            parse_priority(mission.get("priority")),
+            created_at,
+        )
+
+    def upsert(self, path: Path, mission: Dict[str, Any]) -> None:
+        row = self._row(path.name, mission, path.stat().st_mtime if path.exists() else 0.0)
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO queued_missions VALUES (?, ?, ?, ?, ?)", row)
+
+    def remove(self, file_name: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM queued_missions WHERE file_name = ?", (file_name,))
+
+    def _directory_mtime_ns(self) -> int | None:
+        try:
+            return self.queued_dir.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @contextmanager
+    def own_change(self) -> Iterator[None]:
+        """
+        Wrap a change this process makes to ``queued/`` (and mirrors in the index).
+
+        If the index was in sync beforehand it stays in sync afterwards, so our
+        own writes and claims do not force a directory re-list. Changes by other
+        processes in the same instant are caught by the periodic resync.
+        """
+        before = self._directory_mtime_ns()
+        yield
+        if before is not None and before == self._synced_mtime_ns:
+            self._synced_mtime_ns = self._directory_mtime_ns()
+
+    def sync(self) -> None:
+        """Index files added to ``queued/`` out of band and drop vanished ones."""
+        mtime_ns = self._directory_mtime_ns()
+        if mtime_ns is None:
+            return
+        if mtime_ns == self._synced_mtime_ns and time.monotonic() - self._synced_at < self.resync_interval:
+            return
+        on_disk = {name for name in os.listdir(self.queued_dir) if name.endswith(".json")}
+        with self._lock:
+            indexed = {name for (name,) in self._connection.execute("SELECT file_name FROM queued_missions")}
+        new_rows = []
+        for name in on_disk - indexed:
+            path = self.queued_dir / name
+            try:
+                with path.open("r", encoding="utf-8") as handle:
+                    mission = json.load(handle)
+                new_rows.append(self._row(name, mission, path.stat().st_mtime))
+            except (OSError, json.JSONDecodeError):
+                # Unreadable or half-written files are picked up on a later pass.
+                continue
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO queued_missions VALUES (?, ?, ?, ?, ?)", new_rows
+                )
+                self._connection.executemany(
+                    "DELETE FROM queued_missions WHERE file_name = ?", [(name,) for name in indexed - on_disk]
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        if len(new_rows) == len(on_disk - indexed):
+            self._synced_mtime_ns = mtime_ns
+            self._synced_at = time.monotonic()
+
+    def candidates(self, resident_name: str, limit: int = 16) -> List[str]:
+        """Next queued file names claimable by ``resident_name``, highest priority and oldest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT file_name FROM queued_missions WHERE resident IN ('', ?) "
+                "ORDER BY priority DESC, created_at, file_name LIMIT ?",
+                (resident_name.lower(), limit),
+            )
+            return [name for (name,) in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._connection.execute("SELECT COUNT(*) FROM queued_missions").fetchone()[0])
 
 
 class MissionQueueManager:
-    """Filesystem-backed mission queue for COMMS_HUB operations."""
+    """
+    Filesystem-backed mission queue for COMMS_HUB operations.
+
+    Mission files move between ``queued/``, ``active/``, ``completed/`` and
+    ``failed/``. Claims are a ``rename`` out of ``queued/``, so when several
+    dispatchers race for a mission exactly one of them wins; the others see
+    the file gone and move on. Queued missions are looked up through a
+    :class:`MissionIndex` rather than by parsing the whole directory.
+    """
 
     def __init__(
         self,
@@ -49,6 +219,8 @@ class MissionQueueManager:
         self.dispatcher_agent = dispatcher_agent
         self.transmitter = TalkingDrumTransmitter(dispatcher_agent, comms_root=self.comms_root)
         self.log_path = Path(log_path) if log_path else paths.log_dir / "mission_queue_manager.jsonl"
+        self._log_sink = get_sink(self.log_path, on_error=self._log_write_failed)
+        self.index = MissionIndex(self.missions.index_file, self.missions.queued)
 
     def load_mission(self, mission_file: Path | str) -> Dict[str, Any]:
         path = Path(mission_file)
@@ -63,28 +235,50 @@ class MissionQueueManager:
         mission_record.setdefault("queued_at", mission_record["created_at"])
 
         destination = self.missions.queued / f"{mission_record['mission_id']}.json"
-        self._write_json_atomic(destination, mission_record)
+        with self.index.own_change():
+            self._write_json_atomic(destination, mission_record)
+            self.index.upsert(destination, mission_record)
         self._append_log("queued", mission_record["mission_id"], {"mission": mission_record})
         return destination
 
     def assign_mission(self, resident_name: str) -> Dict[str, Any] | None:
-        candidate = self._next_mission_for_resident(resident_name)
-        if candidate is None:
-            return None
-
-        mission_path, mission_record = candidate
-        return self._activate_mission(mission_path, mission_record, resident_name)
+        while True:
+            candidate = self._next_mission_for_resident(resident_name)
+            if candidate is None:
+                return None
+            mission_path, mission_record = candidate
+            activated = self._activate_mission(mission_path, mission_record, resident_name)
+            if activated is not None:
+                return activated
 
     def assign_specific_mission(self, mission_id: str) -> Dict[str, Any] | None:
         source = self._mission_file("queued", mission_id)
         if source is None:
             return None
-        mission_record = self.load_mission(source)
+        try:
+            mission_record = self.load_mission(source)
+        except FileNotFoundError:
+            self.index.remove(source.name)
+            return None
         resident_name = mission_record.get("assigned_to")
         if not resident_name:
             raise ValueError(f"Mission {mission_id} missing 'assigned_to'")
         return self._activate_mission(source, mission_record, resident_name)
 
+    def update_queued_mission(self, mission_id: str, mission: Dict[str, Any]) -> Optional[Path]:
+        """Rewrite a queued mission (e.g. after routing) and keep the index in step."""
+        source = self._mission_file("queued", mission_id)
+        if source is None:
+            return None
+        with self.index.own_change():
+            self._write_json_atomic(source, mission)
+            self.index.upsert(source, mission)
+        return source
+
+    def queued_count(self) -> int:
+        self.index.sync()
+        return self.index.count()
+
     def complete_mission(self, mission_id: str) -> Optional[Path]:
         source = self._mission_file("active", mission_id)
         if source is None:
@@ -122,7 +316,9 @@ class MissionQueueManager:
         mission_record["error_message"] = error_message
         destination = self.missions.failed / source.name
         self._write_json_atomic(destination, mission_record)
-        source.unlink(missing_ok=True)
+        with self.index.own_change():
+            source.unlink(missing_ok=True)
+            self.index.remove(source.name)
         self._append_log("failed", mission_id, {"error": error_message, "stage": "assignment"})
         return destination
 
@@ -149,18 +345,40 @@ class MissionQueueManager:
         completed = root / "completed"
         failed = root / "failed"
         log_file = root / "mission_queue.log"
+        index_file = root / "mission_index.sqlite3"
         for directory in (root, queued, active, completed, failed):
             directory.mkdir(parents=True, exist_ok=True)
-        return MissionPaths(root=root, queued=queued, active=active, completed=completed, failed=failed, log_file=log_file)
+        return MissionPaths(
+            root=root,
+            queued=queued,
+            active=active,
+            completed=completed,
+            failed=failed,
+            log_file=log_file,
+            index_file=index_file,
+        )
 
     def _next_mission_for_resident(self, resident_name: str) -> tuple[Path, Dict[str, Any]] | None:
-        for path in sorted(self.missions.queued.glob("*.json")):
-            mission = self.load_mission(path)
-            assigned_to = mission.get("assigned_to")
-            if assigned_to and assigned_to.lower() != resident_name.lower():
-                continue
-            return path, mission
-        return None
+        self.index.sync()
+        while True:
+            # Every stale candidate is removed or re-keyed below, so each page makes progress.
+            batch = self.index.candidates(resident_name)
+            if not batch:
+                return None
+            for file_name in batch:
+                path = self.missions.queued / file_name
+                try:
+                    mission = self.load_mission(path)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    # Claimed by another dispatcher (or unreadable); forget it.
+                    self.index.remove(file_name)
+                    continue
+                assigned_to = mission.get("assigned_to")
+                if assigned_to and assigned_to.lower() != resident_name.lower():
+                    # File was re-routed in place since it was indexed.
+                    self.index.upsert(path, mission)
+                    continue
+                return path, mission
 
     def _mission_file(self, status: str, mission_id: str) -> Optional[Path]:
         directory = getattr(self.missions, status, None)
@@ -169,9 +387,6 @@ class MissionQueueManager:
         candidate = directory / f"{mission_id}.json"
         if candidate.exists():
             return candidate
-        for path in directory.glob("*.json"):
-            if path.stem == mission_id:
-                return path
         return None
 
     def _write_json_atomic(self, destination: Path, payload: Dict[str, Any]) -> None:
@@ -203,12 +418,14 @@ class MissionQueueManager:
             "mission_id": mission_id,
             **extra,
         }
+        self._log_sink.write(record)
+
+    def _log_write_failed(self, lines: List[str], _error: OSError) -> None:
         try:
-            with self.log_path.open("a", encoding="utf-8") as handle:
-                json.dump(record, handle)
-                handle.write("\n")
-        except OSError:
-            self._write_json_atomic(self.missions.log_file, {"last_error": record})
+            record = json.loads(lines[-1])
+        except ValueError:
+            record = {"raw": lines[-1]}
+        self._write_json_atomic(self.missions.log_file, {"last_error": record})
 
     def _generate_mission_id(self, mission: Dict[str, Any]) -> str:
         assigned_to = mission.get("assigned_to", "mission")
@@ -221,13 +438,20 @@ class MissionQueueManager:
         mission_path: Path,
         mission_record: Dict[str, Any],
         resident_name: str,
-    ) -> Dict[str, Any]:
+    ) -> Dict[str, Any] | None:
+        destination = self.missions.active / mission_path.name
+        with self.index.own_change():
+            try:
+                # The rename is the claim: only one dispatcher can move the file.
+                os.rename(mission_path, destination)
+            except FileNotFoundError:
+                self.index.remove(mission_path.name)
+                return None
+            self.index.remove(mission_path.name)
+
         mission_record["status"] = "active"
         mission_record["assigned_at"] = isoformat_now()
-
-        destination = self.missions.active / mission_path.name
         self._write_json_atomic(destination, mission_record)
-        mission_path.unlink(missing_ok=True)
 
         puck = self._build_assignment_puck(mission_record, resident_name)
         try:
@@ -254,4 +478,4 @@ class MissionQueueManager:
         return mission_record
 
 
-__all__ = ["MissionQueueManager"]
+__all__ = ["MissionIndex", "MissionQueueManager"]
@@ -245,17 +245,18 @@ class TalkingDrumTransmitter:
         Path(temp_file.name).replace(destination)
 
     def _append_log(self, event: str, data: Mapping[str, Any]) -> None:
-        self.rhythm_log_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.rhythm_log_path.open("a", encoding="utf-8") as handle:
-            record = {"event": event, **data}
-            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._append_static_log(self.rhythm_log_path, event, data)
 
     @staticmethod
     def _append_static_log(rhythm_log_path: Path, event: str, data: Mapping[str, Any]) -> None:
-        rhythm_log_path.parent.mkdir(parents=True, exist_ok=True)
-        with rhythm_log_path.open("a", encoding="utf-8") as handle:
-            record = {"event": event, **data}
-            handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # pucklib is loaded as ``trinity.pucklib`` (repo root on sys.path, e.g.
+        # skill scripts) and as ``pucklib`` (trinity/ on sys.path, the daemons).
+        try:
+            from trinity.log_sink import get_sink
+        except ImportError:
+            from log_sink import get_sink
+
+        get_sink(rhythm_log_path).write({"event": event, **data}, ensure_ascii=False)
 
     @staticmethod
     def _utc_now() -> str:
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Mapping, MutableMapping, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 try:
     import tiktoken  # type: ignore
@@ -25,6 +31,50 @@ BASE_SECTIONS: Tuple[str, ...] = (
 COMPOSITE_SECTION = "composite_concepts"
 
 
+# Non-ASCII characters that ``re.IGNORECASE`` treats as ASCII letters.
+_IGNORECASE_ASCII_FOLD = (("\u0130", "i"), ("\u0131", "i"), ("\u017f", "s"), ("\u212a", "k"))
+
+
+def _fold(text: str) -> str:
+    if not text.isascii():
+        for char, ascii_char in _IGNORECASE_ASCII_FOLD:
+            if char in text:
+                text = text.replace(char, ascii_char)
+    return text.lower()
+
+
+class _RuleSet:
+    """
+    Ordered substitution rules compiled once, with a literal-anchor prefilter.
+
+    Each rule is ``(pattern, replacement, anchor, folded)``. Rules still run
+    sequentially in dictionary order (later rules see the output of earlier
+    ones, exactly as before), but a rule whose anchor literal does not occur in
+    the current text is skipped with a substring check instead of a regex pass.
+    ``folded`` anchors are compared against the case-folded text.
+    """
+
+    def __init__(self, rules: Sequence[Tuple["re.Pattern[str]", str, Optional[str], bool]]) -> None:
+        self.rules = list(rules)
+
+    def apply(self, text: str) -> str:
+        result = text
+        folded: Optional[str] = None
+        for pattern, replacement, anchor, fold in self.rules:
+            if anchor is not None:
+                if fold:
+                    if folded is None:
+                        folded = _fold(result)
+                    if anchor not in folded:
+                        continue
+                elif anchor not in result:
+                    continue
+            result, count = pattern.subn(replacement, result)
+            if count:
+                folded = None
+        return result
+
+
 @dataclass(frozen=True)
 class BIHConfig:
     lojban_templates: Sequence[Mapping[str, str]]
@@ -32,6 +82,29 @@ class BIHConfig:
     nsibidi_dict: Mapping[str, Mapping[str, Mapping[str, str]]]
 
 
+# Engine rebuilt once per pool worker by ``_init_worker``.
+_WORKER_ENGINE: Optional["BIHEngine"] = None
+
+
+def _init_worker(config: BIHConfig) -> None:
+    global _WORKER_ENGINE
+    _WORKER_ENGINE = BIHEngine(
+        lojban_templates=config.lojban_templates,
+        ithkuil_dict=config.ithkuil_dict,
+        nsibidi_dict=config.nsibidi_dict,
+    )
+
+
+def _worker_compress(payload: str, language: str, mode: str) -> str:
+    assert _WORKER_ENGINE is not None
+    return _WORKER_ENGINE.compress(payload, language=language, mode=mode)
+
+
+def _worker_decompress(compressed: str) -> str:
+    assert _WORKER_ENGINE is not None
+    return _WORKER_ENGINE.decompress(compressed)
+
+
 class BIHEngine:
     """
     Babbage-Ithkuil Hybrid compression engine.
@@ -60,6 +133,7 @@ class BIHEngine:
         lojban_templates: Sequence[Mapping[str, str]],
         ithkuil_dict: Mapping[str, Mapping[str, Mapping[str, str]]],
         nsibidi_dict: Mapping[str, Mapping[str, Mapping[str, str]]],
+        token_cache_size: int = 4096,
     ) -> None:
         self.config = BIHConfig(
             lojban_templates=lojban_templates,
@@ -69,6 +143,12 @@ class BIHEngine:
 
         self.encoding_name: Optional[str] = None
         self._token_length_func = self._init_tokenizer()
+        self._token_cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._token_cache_size = token_cache_size
+        self._token_cache_lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_workers = 0
+        self._pool_lock = threading.Lock()
 
         (
             self._concept_to_morpheme,
@@ -83,6 +163,8 @@ class BIHEngine:
             self._symbol_to_morpheme,
         ) = self._build_nsibidi_maps(nsibidi_dict)
 
+        self._compile_rules()
+
     # ------------------------------------------------------------------ Factory
     @classmethod
     def from_files(
@@ -154,6 +236,36 @@ class BIHEngine:
             stage3 = self._embed_nsibidi(stage2)
             return stage3
 
+    def compress_many(
+        self,
+        payloads: Sequence[str],
+        *,
+        language: str = "english",
+        mode: str = "hybrid",
+        workers: int = 1,
+        parallel_threshold: int = 256,
+    ) -> List[str]:
+        """
+        Compress a batch of payloads, preserving order.
+
+        Batches of at least ``parallel_threshold`` payloads are spread over
+        ``workers`` processes (``0`` means one per CPU). The pool is started on
+        first use and kept on the engine, so each worker compiles the
+        dictionaries once for every later batch too; call :meth:`close` to stop
+        it. Smaller batches run in-process on this engine's compiled rules.
+        """
+        payloads = list(payloads)
+        pool_size = self._pool_size(len(payloads), workers, parallel_threshold)
+        if pool_size <= 1:
+            return [self.compress(payload, language=language, mode=mode) for payload in payloads]
+        return self._map(
+            pool_size,
+            _worker_compress,
+            payloads,
+            [language] * len(payloads),
+            [mode] * len(payloads),
+        )
+
     # ---------------------------------------------------------------- Decompression
     def decompress(self, compressed: str) -> str:
         """
@@ -167,6 +279,68 @@ class BIHEngine:
         stage3 = self._expand_ithkuil(stage2)
         return stage3
 
+    def decompress_many(
+        self,
+        compressed: Sequence[str],
+        *,
+        workers: int = 1,
+        parallel_threshold: int = 256,
+    ) -> List[str]:
+        """Decompress a batch of pucks, preserving order (see ``compress_many``)."""
+        compressed = list(compressed)
+        pool_size = self._pool_size(len(compressed), workers, parallel_threshold)
+        if pool_size <= 1:
+            return [self.decompress(item) for item in compressed]
+        return self._map(pool_size, _worker_decompress, compressed)
+
+    def close(self) -> None:
+        """Shut down the worker pool started by the batch API, if any."""
+        with self._pool_lock:
+            pool, self._pool, self._pool_workers = self._pool, None, 0
+        if pool is not None:
+            pool.shutdown()
+
+    def __enter__(self) -> "BIHEngine":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _map(self, pool_size: int, func: Callable[..., str], *iterables: Sequence[str]) -> List[str]:
+        count = len(iterables[0])
+        with self._pool_lock:
+            # A larger pool serves smaller batches; only grow when more workers are asked for.
+            if self._pool is not None and self._pool_workers < pool_size:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=pool_size, initializer=_init_worker, initargs=(self.config,)
+                )
+                self._pool_workers = pool_size
+            pool = self._pool
+        try:
+            return list(pool.map(func, *iterables, chunksize=self._chunksize(count, pool_size)))
+        except BrokenProcessPool:
+            # A dead worker poisons the executor; start a fresh one next time.
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool, self._pool_workers = None, 0
+            raise
+
+    @staticmethod
+    def _pool_size(count: int, workers: int, parallel_threshold: int) -> int:
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        if workers <= 1 or count < parallel_threshold:
+            return 1
+        return min(workers, count)
+
+    @staticmethod
+    def _chunksize(count: int, pool_size: int) -> int:
+        # A few chunks per worker keeps IPC overhead low while balancing uneven pucks.
+        return max(1, count // (pool_size * 4))
+
     # ---------------------------------------------------------------- Metrics
     def calculate_ratio(self, original: str, compressed: str) -> float:
         """Return compression ratio (compressed length / original length)."""
@@ -179,43 +353,81 @@ class BIHEngine:
         return compressed_tokens / original_tokens
 
     # ---------------------------------------------------------------- Internals
-    def _apply_ithkuil(self, payload: str, *, language: str) -> str:
-        if language.lower() != "english" or not self._concept_to_morpheme:
-            return payload
-
-        result = payload
-        # Longer phrases first to avoid partial replacements.
-        for phrase, morpheme in sorted(
-            self._concept_to_morpheme.items(), key=lambda item: len(item[0]), reverse=True
-        ):
-            pattern = re.compile(self._concept_regex(phrase), re.IGNORECASE)
-            result = pattern.sub(morpheme, result)
-        return result
+    def _compile_rules(self) -> None:
+        """Compile every dictionary once; (de)compression only runs the rule sets."""
+        self._ithkuil_rules = _RuleSet(
+            [
+                self._concept_rule(phrase, morpheme)
+                for phrase, morpheme in sorted(
+                    self._concept_to_morpheme.items(), key=lambda item: len(item[0]), reverse=True
+                )
+            ]
+        )
 
-    def _apply_lojban_templates(self, payload: str) -> str:
-        if not self.config.lojban_templates:
-            return payload
-        result = payload
+        lojban_rules = []
         for entry in self.config.lojban_templates:
             match = entry.get("match")
             replacement = entry.get("replace")
             if not match or not replacement:
                 continue
-            pattern = re.compile(match, re.IGNORECASE)
-            result = pattern.sub(replacement, result)
-        return result
+            lojban_rules.append((re.compile(match, re.IGNORECASE), replacement, None, False))
+        self._lojban_rules = _RuleSet(lojban_rules)
+
+        self._nsibidi_rules = _RuleSet(
+            [self._morpheme_rule(morpheme, symbol) for morpheme, symbol in self._morpheme_to_symbol.items()]
+            + [self._concept_rule(phrase, symbol) for phrase, symbol in self._concept_to_symbol.items()]
+        )
+
+        self._composite_expansions = [
+            (morpheme, self._expand_composite(morpheme))
+            for morpheme, _ in sorted(
+                self._composite_morpheme_to_concept.items(), key=lambda item: len(item[0]), reverse=True
+            )
+        ]
+        self._base_expansion_rules = _RuleSet(
+            [self._morpheme_rule(morpheme, phrase) for morpheme, phrase in self._base_morpheme_to_concept.items()]
+        )
+
+    @classmethod
+    def _concept_rule(cls, phrase: str, replacement: str) -> Tuple["re.Pattern[str]", str, Optional[str], bool]:
+        ascii_tokens = [token for token in phrase.split() if token.isascii()]
+        anchor = max(ascii_tokens, key=len).lower() if ascii_tokens else None
+        pattern = re.compile(cls._search_friendly(cls._concept_regex(phrase), phrase), re.IGNORECASE)
+        return pattern, replacement, anchor, True
+
+    @classmethod
+    def _morpheme_rule(cls, morpheme: str, replacement: str) -> Tuple["re.Pattern[str]", str, Optional[str], bool]:
+        pattern = re.compile(cls._search_friendly(rf"\b{re.escape(morpheme)}\b", morpheme))
+        return pattern, replacement, morpheme, False
+
+    @staticmethod
+    def _search_friendly(regex: str, text: str) -> str:
+        """
+        Move a leading ``\\b`` behind the first literal so ``re`` can scan for it.
+
+        ``\\bword`` and ``word(?<!\\w[\\s\\S]{4})`` are equivalent when the
+        first character is a word character, but only the latter lets the
+        regex engine use its literal-prefix search instead of trying every
+        position.
+        """
+        first = text.split()[0] if text.split() else ""
+        escaped = re.escape(first)
+        if not first or not re.match(r"\w", first[0]) or not regex.startswith(rf"\b{escaped}"):
+            return regex
+        return rf"{escaped}(?<!\w[\s\S]{{{len(first)}}})" + regex[len(rf"\b{escaped}"):]
+
+    def _apply_ithkuil(self, payload: str, *, language: str) -> str:
+        if language.lower() != "english" or not self._concept_to_morpheme:
+            return payload
+        # Longer phrases first to avoid partial replacements.
+        return self._ithkuil_rules.apply(payload)
+
+    def _apply_lojban_templates(self, payload: str) -> str:
+        return self._lojban_rules.apply(payload)
 
     def _embed_nsibidi(self, payload: str) -> str:
-        result = payload
-        # First replace morphemes with symbols when available.
-        for morpheme, symbol in self._morpheme_to_symbol.items():
-            pattern = re.compile(rf"\b{re.escape(morpheme)}\b")
-            result = pattern.sub(symbol, result)
-        # Then attempt to replace remaining English phrases.
-        for phrase, symbol in self._concept_to_symbol.items():
-            pattern = re.compile(self._concept_regex(phrase), re.IGNORECASE)
-            result = pattern.sub(symbol, result)
-        return result
+        # Morphemes are replaced with symbols first, then remaining English phrases.
+        return self._nsibidi_rules.apply(payload)
 
     def _expand_nsibidi_to_morphemes(self, payload: str) -> str:
         result = payload
@@ -236,16 +448,9 @@ class BIHEngine:
     def _expand_ithkuil(self, payload: str) -> str:
         result = payload
         # Expand composite morphemes first to avoid consuming components early.
-        for morpheme, _ in sorted(
-            self._composite_morpheme_to_concept.items(), key=lambda item: len(item[0]), reverse=True
-        ):
-            expanded = self._expand_composite(morpheme)
+        for morpheme, expanded in self._composite_expansions:
             result = result.replace(morpheme, expanded)
-
-        for morpheme, phrase in self._base_morpheme_to_concept.items():
-            pattern = re.compile(rf"\b{re.escape(morpheme)}\b")
-            result = pattern.sub(phrase, result)
-        return result
+        return self._base_expansion_rules.apply(result)
 
     def _expand_composite(self, morpheme: str) -> str:
         parts = morpheme.split("-")
@@ -391,7 +596,22 @@ class BIHEngine:
 
     def _token_length(self, text: str) -> int:
         tokenizer = self._token_length_func or self._fallback_tokenizer
-        return tokenizer(text)
+        if self._token_cache_size <= 0 or tokenizer is self._fallback_tokenizer:
+            return tokenizer(text)
+
+        # Keyed by digest so the memo never pins large payloads in memory.
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._token_cache_lock:
+            cached = self._token_cache.get(key)
+            if cached is not None:
+                self._token_cache.move_to_end(key)
+                return cached
+        count = tokenizer(text)
+        with self._token_cache_lock:
+            self._token_cache[key] = count
+            if len(self._token_cache) > self._token_cache_size:
+                self._token_cache.popitem(last=False)
+        return count
 
     @staticmethod
     def canonicalize(text: str) -> str:
@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, Mapping, MutableMapping, Optional
 
 from config import APIKeys, TrinityPaths, load_configuration
+from deliverable_index import record_deliverable
+from inbox_watcher import InboxWatcher
 from master_librarian_adapter import MasterLibrarianAdapter
 from mission_queue_manager import MissionQueueManager, isoformat_now
 from oracle_bridge import OracleBridge
@@ -228,13 +230,15 @@ class ResidentMissionExecutor:
             return None
         return payload
 
-    def _archive(self, path: Path) -> None:
+    def _archive(self, path: Path, message: Optional[Mapping[str, Any]] = None) -> None:
         target = self.archive_dir / path.name
         counter = 1
         while target.exists():
             target = self.archive_dir / f"{path.stem}-{counter}{path.suffix}"
             counter += 1
         path.rename(target)
+        if message:
+            record_deliverable(self.archive_dir, target, message)
 
     def _resolve_handler(self, mission: dict[str, Any]) -> MissionHandler:
         source_template = mission.get("source_template")
@@ -258,7 +262,7 @@ class ResidentMissionExecutor:
                     "skipped_message",
                     {"path": str(message_path), "message_type": message.get("message_type")},
                 )
-                self._archive(message_path)
+                self._archive(message_path, message)
                 continue
 
             mission = message.get("payload", {}).get("mission")
@@ -316,23 +320,29 @@ class ResidentMissionExecutor:
     def run_forever(self) -> None:
         self.log_event("executor_started", {"poll_interval": self.poll_interval})
         next_heartbeat = time.monotonic() + self.heartbeat_interval
-        while not self._stop_requested:
-            try:
-                self.process_once()
-            except Exception as exc:  # pragma: no cover - defensive
-                self.log_event("executor_exception", {"error": str(exc)})
-
-            now = time.monotonic()
-            if now >= next_heartbeat:
-                queued_active = len(list(self.manager.missions.active.glob("*.json")))
-                self.log_event("heartbeat", {"active_missions": queued_active})
-                next_heartbeat = now + self.heartbeat_interval
-
-            end_time = time.monotonic() + self.poll_interval
-            while time.monotonic() < end_time:
-                if self._stop_requested:
-                    break
-                time.sleep(min(1.0, end_time - time.monotonic()))
+        watcher = InboxWatcher(self.inbox, suffix=".json")
+        try:
+            while not self._stop_requested:
+                try:
+                    self.process_once()
+                except Exception as exc:  # pragma: no cover - defensive
+                    self.log_event("executor_exception", {"error": str(exc)})
+
+                now = time.monotonic()
+                if now >= next_heartbeat:
+                    queued_active = len(list(self.manager.missions.active.glob("*.json")))
+                    self.log_event("heartbeat", {"active_missions": queued_active})
+                    next_heartbeat = now + self.heartbeat_interval
+
+                # Wake on new inbox messages; wait in short slices so stop requests are honoured.
+                end_time = time.monotonic() + self.poll_interval
+                while time.monotonic() < end_time:
+                    if self._stop_requested:
+                        break
+                    if watcher.wait(min(1.0, end_time - time.monotonic())):
+                        break
+        finally:
+            watcher.close()
         self.log_event("executor_stopped", {})
 
 
@@ -1,17 +1,44 @@
 """Retrieval helper to build and query a semantic index of UBOS documents.
 
-This helper uses the OpenAI resident to generate embeddings for text chunks
-from specified documentation directories. The resulting index is stored as a
-JSONL file and can be queried to find relevant documents.
+Text chunks from the documentation directories are embedded with a pluggable
+encoder: the OpenAI resident by default, or the Narrative Warehouse
+``HashingEncoder`` (``encoder="hashing"``) so the index can be built and
+queried without network access. The index is stored as a Narrative Warehouse
+bundle next to ``index_path`` (``index.jsonl`` -> ``index/``): float32
+``embeddings.npy``, ``entries.jsonl`` with a byte-offsets file, and the
+encoder settings in ``metadata.json``. Indexes written by older versions as a
+single JSONL file with inline embeddings can still be searched.
 """
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
-from openai_resident import ResidentOpenAI
+
+FORGE_PACKAGES = Path(__file__).resolve().parents[1] / "02_FORGE" / "packages"
+if str(FORGE_PACKAGES) not in sys.path:
+    sys.path.append(str(FORGE_PACKAGES))
+
+from narrative_warehouse.cache import EmbeddingCache, cache_namespace, content_hash
+from narrative_warehouse.encoder import BaseEncoder, EncoderConfig, HashingEncoder
+from narrative_warehouse.query_engine import _top_k
+from narrative_warehouse.storage import METADATA_FILENAME, load_index_bundle, save_index_bundle
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from openai_resident import ResidentOpenAI
+
+EMBEDDING_MODEL = "text-embedding-3-large"
+EMBEDDING_NAMESPACE = cache_namespace({"kind": "openai", "model_name": EMBEDDING_MODEL})
+DEFAULT_INDEX_PATH = "/srv/janus/trinity_memory/openai_embeddings/index.jsonl"
+ENCODER_ENV_VAR = "TRINITY_RETRIEVAL_ENCODER"
+INDEX_VERSION = 1
+EMBED_BATCH_SIZE = 256
 
 
 def cosine_similarity(v1: List[float], v2: List[float]) -> float:
@@ -21,16 +48,128 @@ def cosine_similarity(v1: List[float], v2: List[float]) -> float:
     return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
 
 
+def embed_texts_cached(
+    openai_resident: "ResidentOpenAI",
+    texts: List[str],
+    cache: Optional[EmbeddingCache] = None,
+) -> List[List[float]]:
+    """Embed ``texts``, serving repeats from the shared embedding cache."""
+    cache = cache or EmbeddingCache()
+    hashes = [content_hash(text) for text in texts]
+    cached = cache.get_many(EMBEDDING_NAMESPACE, hashes)
+    missing = [i for i, vector in enumerate(cached) if vector is None]
+    if missing:
+        fresh = openai_resident.embed_texts([texts[i] for i in missing], model=EMBEDDING_MODEL)
+        if len(fresh) != len(missing):
+            return []
+        cache.put_many(EMBEDDING_NAMESPACE, [hashes[i] for i in missing], np.asarray(fresh, dtype=np.float32))
+        for i, vector in zip(missing, fresh):
+            cached[i] = np.asarray(vector, dtype=np.float32)
+    return [vector.tolist() for vector in cached]
+
+
+class OpenAIEmbeddingEncoder(BaseEncoder):
+    """Narrative Warehouse encoder backed by the OpenAI resident and the shared embedding cache."""
+
+    def __init__(self, openai_resident: Optional["ResidentOpenAI"] = None, cache: Optional[EmbeddingCache] = None) -> None:
+        if openai_resident is None:
+            from openai_resident import ResidentOpenAI
+
+            openai_resident = ResidentOpenAI()
+        self._resident = openai_resident
+        self._cache = cache or EmbeddingCache()
+        self.name = f"openai:{EMBEDDING_MODEL}"
+        self.config = EncoderConfig(kind="openai", model_name=EMBEDDING_MODEL)
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = embed_texts_cached(self._resident, list(texts), self._cache)
+        if len(vectors) != len(texts):
+            raise RuntimeError("Failed to generate embeddings.")
+        return np.asarray(vectors, dtype=np.float32)
+
+
+EncoderSpec = Union[str, BaseEncoder, None]
+
+
+def select_encoder(spec: EncoderSpec = None) -> BaseEncoder:
+    """Resolve ``"openai"``, ``"hashing"`` or an encoder instance (default: ``$TRINITY_RETRIEVAL_ENCODER`` or openai)."""
+    if isinstance(spec, BaseEncoder):
+        return spec
+    name = (spec or os.getenv(ENCODER_ENV_VAR) or "openai").lower()
+    if name == "openai":
+        return OpenAIEmbeddingEncoder()
+    if name == "hashing":
+        return HashingEncoder()
+    raise ValueError(f"Unsupported retrieval encoder '{spec}'")
+
+
+def _encoder_from_metadata(config: Dict[str, Any]) -> BaseEncoder:
+    """Query encoder for a bundle's settings, shared by every index in the process."""
+    encoder_config = EncoderConfig.from_dict(config)
+    encoder = _QUERY_ENCODERS.get(encoder_config)
+    if encoder is not None:
+        return encoder
+    if encoder_config.kind == "hashing":
+        encoder = HashingEncoder(dimension=encoder_config.dimension or 768)
+    elif encoder_config.kind == "openai":
+        encoder = OpenAIEmbeddingEncoder()
+    else:
+        raise ValueError(f"Unsupported retrieval encoder kind '{encoder_config.kind}'")
+    return _QUERY_ENCODERS.setdefault(encoder_config, encoder)
+
+
+def _bundle_dir(index_path: Union[str, Path]) -> Path:
+    path = Path(index_path)
+    return path.with_suffix("") if path.suffix == ".jsonl" else path
+
+
+def _normalise_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _previous_rows(bundle_dir: Path, encoder: BaseEncoder, chunk_size: int) -> Tuple[Optional[np.ndarray], Dict[str, int]]:
+    """Embeddings of the last build keyed by chunk hash, if it used the same settings."""
+    if not (bundle_dir / METADATA_FILENAME).exists():
+        return None, {}
+    try:
+        embeddings, entries, metadata = load_index_bundle(bundle_dir, mmap_mode="r")
+    except (OSError, ValueError):
+        return None, {}
+    if (
+        metadata.get("version") != INDEX_VERSION
+        or metadata.get("encoder") != encoder.config.to_dict()
+        or metadata.get("chunk_size") != chunk_size
+        or len(entries) != len(embeddings)
+    ):
+        return None, {}
+    rows = {str(entry["chunk_hash"]): row for row, entry in enumerate(entries)}
+    return embeddings, rows
+
+
 def build_index(
     root_dirs: List[str],
-    index_path: str = "/srv/janus/trinity_memory/openai_embeddings/index.jsonl",
+    index_path: str = DEFAULT_INDEX_PATH,
     chunk_size: int = 512,
+    *,
+    encoder: EncoderSpec = None,
+    batch_size: int = EMBED_BATCH_SIZE,
 ) -> str:
-    """Builds a semantic index from documents in the specified directories."""
+    """Builds a semantic index from documents in the specified directories.
+
+    Chunks are identified by content hash. Chunks already present in the
+    previous bundle (same encoder and ``chunk_size``) keep their vectors; the
+    rest are encoded ``batch_size`` at a time, and the OpenAI encoder stores
+    every finished batch in the embedding cache, so an interrupted build picks
+    up where it stopped. Files whose chunks could not all be embedded are left
+    out and retried on the next build.
+    """
     print("Starting index build...")
-    openai_resident = ResidentOpenAI()
-    index_file = Path(index_path)
-    index_file.parent.mkdir(parents=True, exist_ok=True)
+    encoder_impl = select_encoder(encoder)
+    bundle_dir = _bundle_dir(index_path)
+    previous_embeddings, previous_rows = _previous_rows(bundle_dir, encoder_impl, chunk_size)
 
     documents = []
     print(f"Searching for documents in: {root_dirs}")
@@ -40,67 +179,156 @@ def build_index(
             documents.extend(root_path.rglob(ext))
     print(f"Found {len(documents)} documents.")
 
-    with index_file.open("w", encoding="utf-8") as f:
-        total_docs = len(documents)
-        for idx, doc_path in enumerate(documents):
-            print(f"Processing document {idx + 1}/{total_docs}: {doc_path}")
-            try:
-                content = doc_path.read_text(encoding="utf-8")
-                chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
-                if not chunks:
-                    print(f"  Skipping empty document.")
-                    continue
-
-                embeddings = openai_resident.embed_texts(chunks)
-                if not embeddings:
-                    print(f"  Failed to generate embeddings. Skipping.")
-                    continue
-
-                for i, chunk in enumerate(chunks):
-                    item = {
-                        "path": str(doc_path),
-                        "chunk": chunk,
-                        "embedding": embeddings[i],
-                    }
-                    f.write(json.dumps(item) + "\n")
-            except Exception as e:
-                print(f"  Error processing document: {e}")
-                continue  # Skip files that can't be read
-
-    return f"Index built successfully at {index_path}."
+    # (path, chunks, chunk hashes) per readable, non-empty document.
+    parsed: List[Tuple[Path, List[str], List[str]]] = []
+    manifest: Dict[str, Dict[str, Any]] = {}
+    for doc_path in documents:
+        try:
+            raw = doc_path.read_bytes()
+            content = raw.decode("utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  Error processing document {doc_path}: {e}")
+            continue
+        chunks = [content[i : i + chunk_size] for i in range(0, len(content), chunk_size)]
+        if not chunks:
+            continue
+        parsed.append((doc_path, chunks, [content_hash(chunk) for chunk in chunks]))
+        manifest[str(doc_path)] = {"sha256": hashlib.sha256(raw).hexdigest(), "chunks": len(chunks)}
 
+    pending: Dict[str, str] = {}
+    for _, chunks, hashes in parsed:
+        for chunk, digest in zip(chunks, hashes):
+            if digest not in previous_rows:
+                pending.setdefault(digest, chunk)
 
-def search_index(
-    query: str,
-    top_n: int = 5,
-    index_path: str = "/srv/janus/trinity_memory/openai_embeddings/index.jsonl",
-) -> List[Dict[str, Any]]:
-    """Searches the index for the most relevant document chunks."""
-    openai_resident = ResidentOpenAI()
-    index_file = Path(index_path)
+    fresh: Dict[str, np.ndarray] = {}
+    pending_items = list(pending.items())
+    for start in range(0, len(pending_items), batch_size):
+        batch = pending_items[start : start + batch_size]
+        print(f"Embedding chunks {start + 1}-{start + len(batch)}/{len(pending_items)}")
+        try:
+            vectors = encoder_impl.encode([chunk for _, chunk in batch])
+        except Exception as e:
+            print(f"  Failed to generate embeddings: {e}")
+            continue
+        fresh.update(zip((digest for digest, _ in batch), vectors))
 
-    if not index_file.exists():
-        return [{"error": "Index not found. Please build it first."}]
+    entries: List[Dict[str, Any]] = []
+    rows: List[np.ndarray] = []
+    for doc_path, chunks, hashes in parsed:
+        if any(digest not in fresh and digest not in previous_rows for digest in hashes):
+            print(f"  Skipping {doc_path}: embeddings incomplete.")
+            manifest.pop(str(doc_path), None)
+            continue
+        for chunk, digest in zip(chunks, hashes):
+            entries.append({"source_file": str(doc_path), "chunk": chunk, "chunk_hash": digest})
+            vector = fresh.get(digest)
+            rows.append(previous_embeddings[previous_rows[digest]] if vector is None else vector)
 
-    query_embedding = openai_resident.embed_texts([query])
-    if not query_embedding:
-        return [{"error": "Failed to generate query embedding."}]
+    dimension = len(rows[0]) if rows else 0
+    embeddings = _normalise_rows(np.vstack(rows)) if rows else np.zeros((0, dimension), dtype=np.float32)
+    metadata = {
+        "version": INDEX_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "entry_count": len(entries),
+        "encoder": encoder_impl.config.to_dict(),
+        "chunk_size": chunk_size,
+        "roots": [str(root) for root in root_dirs],
+        "build": {
+            "files": len(manifest),
+            "chunks_encoded": len(fresh),
+            "chunks_reused": sum(1 for entry in entries if entry["chunk_hash"] not in fresh),
+        },
+    }
+    save_index_bundle(bundle_dir, embeddings, entries, metadata, files=manifest)
+    _BUNDLES.pop(bundle_dir, None)
+    print(f"Encoded {len(fresh)} new chunks; {len(entries)} chunks across {len(manifest)} files.")
+    return f"Index built successfully at {bundle_dir}."
+
+
+class _LoadedIndex:
+    """Normalised embeddings, entries and query encoder for one index on disk."""
 
-    results = []
-    with index_file.open("r", encoding="utf-8") as f:
-        for line in f:
-            item = json.loads(line)
-            similarity = cosine_similarity(query_embedding, item["embedding"])
+    def __init__(self, embeddings: np.ndarray, entries: Sequence[Dict[str, Any]], encoder: Optional[BaseEncoder]) -> None:
+        self.embeddings = embeddings
+        self.entries = entries
+        self.encoder = encoder
+
+    def search(self, query_vector: np.ndarray, top_n: int) -> List[Dict[str, Any]]:
+        if not len(self.entries) or top_n <= 0:
+            return []
+        scores = self.embeddings @ _normalise_rows(query_vector.reshape(1, -1))[0]
+        results = []
+        for row in _top_k(scores, top_n):
+            entry = self.entries[int(row)]
             results.append(
                 {
-                    "path": item["path"],
-                    "score": similarity,
-                    "preview": item["chunk"][:200] + "...",
+                    "path": entry.get("source_file", entry.get("path")),
+                    "score": float(scores[row]),
+                    "preview": entry["chunk"][:200] + "...",
                 }
             )
+        return results
+
+
+# path -> (mtime_ns of the file that changes on every build, loaded index)
+_BUNDLES: Dict[Path, Tuple[int, _LoadedIndex]] = {}
+# encoder settings -> query encoder; keeps one OpenAI client and embedding cache per process
+_QUERY_ENCODERS: Dict[EncoderConfig, BaseEncoder] = {}
 
-    results.sort(key=lambda x: x["score"], reverse=True)
-    return results[:top_n]
+
+def _load_index(index_path: Union[str, Path]) -> Optional[_LoadedIndex]:
+    """Open the bundle for ``index_path`` (or a legacy JSONL index), reusing it while unchanged."""
+    bundle_dir = _bundle_dir(index_path)
+    if (bundle_dir / METADATA_FILENAME).exists():
+        key, marker = bundle_dir, bundle_dir / METADATA_FILENAME
+    elif Path(index_path).is_file():
+        key, marker = Path(index_path), Path(index_path)
+    else:
+        return None
+    mtime_ns = marker.stat().st_mtime_ns
+    cached = _BUNDLES.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    if key == bundle_dir:
+        embeddings, entries, metadata = load_index_bundle(bundle_dir, mmap_mode="r")
+        loaded = _LoadedIndex(embeddings, entries, _encoder_from_metadata(metadata["encoder"]))
+    else:
+        # Legacy single-file index: parse once per modification, not per query.
+        entries, vectors = [], []
+        with marker.open("r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    vectors.append(item.pop("embedding"))
+                    entries.append(item)
+        embeddings = _normalise_rows(np.asarray(vectors, dtype=np.float32)) if vectors else np.zeros((0, 0), np.float32)
+        loaded = _LoadedIndex(embeddings, entries, None)
+    _BUNDLES[key] = (mtime_ns, loaded)
+    return loaded
+
+
+def search_index(
+    query: str,
+    top_n: int = 5,
+    index_path: str = DEFAULT_INDEX_PATH,
+) -> List[Dict[str, Any]]:
+    """Searches the index for the most relevant document chunks."""
+    try:
+        index = _load_index(index_path)
+    except (OSError, ValueError, KeyError) as exc:
+        return [{"error": f"Index unreadable: {exc}"}]
+    if index is None:
+        return [{"error": "Index not found. Please build it first."}]
+
+    try:
+        # Legacy indexes carry no encoder settings; they were always built with OpenAI.
+        encoder = index.encoder or _encoder_from_metadata({"kind": "openai", "model_name": EMBEDDING_MODEL})
+        query_vector = np.asarray(encoder.encode([query]), dtype=np.float32)[0]
+    except Exception:
+        return [{"error": "Failed to generate query embedding."}]
+    return index.search(query_vector, top_n)
 
 
 def retrieve_ubos_docs(query: str, top_k: int = 3) -> List[Dict[str, Any]]:
@@ -117,4 +345,4 @@ if __name__ == "__main__":
     # 2. Search the index
     results = retrieve_ubos_docs("Lion Sanctuary", top_k=3)
     print(f"{len(results)} results")
-    print(results if results else "EMPTY")
\ No newline at end of file
+    print(results if results else "EMPTY")
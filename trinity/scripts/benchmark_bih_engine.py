@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+BIH Engine matcher benchmark.
+
+Compares the precompiled, anchor-filtered rule sets in ``BIHEngine`` against the
+previous per-phrase regex implementation (reproduced below as
+``LegacyBIHEngine``): every puck in a synthetic corpus must compress and
+decompress to byte-identical output, and the speedup is reported for small
+and large pucks.
+
+Usage:
+    python3 benchmark_bih_engine.py
+    python3 benchmark_bih_engine.py --pucks 500 --large-words 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Sequence
+
+# Add trinity to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pucklib.cypher.bih_engine import BIHEngine
+
+CYPHER_DIR = Path(__file__).resolve().parents[2] / "03_OPERATIONS" / "cypher"
+FILLER = (
+    "the council reviewed status and agreed that resources flow toward shared goals while "
+    "each resident reports progress clearly before proceeding with the next beat of work"
+).split()
+MODES = ("hybrid", "token_optimized", "semantic_only")
+
+
+class LegacyBIHEngine(BIHEngine):
+    """Reference implementation: one compiled regex and one pass per dictionary phrase."""
+
+    def _apply_ithkuil(self, payload: str, *, language: str) -> str:
+        if language.lower() != "english" or not self._concept_to_morpheme:
+            return payload
+        result = payload
+        for phrase, morpheme in sorted(
+            self._concept_to_morpheme.items(), key=lambda item: len(item[0]), reverse=True
+        ):
+            pattern = re.compile(self._concept_regex(phrase), re.IGNORECASE)
+            result = pattern.sub(morpheme, result)
+        return result
+
+    def _apply_lojban_templates(self, payload: str) -> str:
+        result = payload
+        for entry in self.config.lojban_templates:
+            match = entry.get("match")
+            replacement = entry.get("replace")
+            if not match or not replacement:
+                continue
+            result = re.compile(match, re.IGNORECASE).sub(replacement, result)
+        return result
+
+    def _embed_nsibidi(self, payload: str) -> str:
+        result = payload
+        for morpheme, symbol in self._morpheme_to_symbol.items():
+            result = re.compile(rf"\b{re.escape(morpheme)}\b").sub(symbol, result)
+        for phrase, symbol in self._concept_to_symbol.items():
+            result = re.compile(self._concept_regex(phrase), re.IGNORECASE).sub(symbol, result)
+        return result
+
+    def _expand_nsibidi_to_morphemes(self, payload: str) -> str:
+        result = payload
+        for symbol, morpheme in self._symbol_to_morpheme.items():
+            result = result.replace(symbol, morpheme)
+        return result
+
+    def _expand_lojban_templates(self, payload: str) -> str:
+        result = payload
+        for entry in self.config.lojban_templates:
+            match = entry.get("match")
+            replacement = entry.get("replace")
+            if not match or not replacement:
+                continue
+            result = result.replace(replacement, match)
+        return result
+
+    def _expand_ithkuil(self, payload: str) -> str:
+        result = payload
+        for morpheme, _ in sorted(
+            self._composite_morpheme_to_concept.items(), key=lambda item: len(item[0]), reverse=True
+        ):
+            result = result.replace(morpheme, self._expand_composite(morpheme))
+        for morpheme, phrase in self._base_morpheme_to_concept.items():
+            result = re.compile(rf"\b{re.escape(morpheme)}\b").sub(phrase, result)
+        return result
+
+
+def load_engine(cls: type, cypher_dir: Path) -> BIHEngine:
+    return cls.from_files(
+        lojban_path=cypher_dir / "lojban_templates_v1.yaml",
+        ithkuil_path=cypher_dir / "ithkuil_morpheme_dictionary_v1.yaml",
+        nsibidi_path=cypher_dir / "nsibidi_dictionary_v1.yaml",
+    )
+
+
+def synthetic_pucks(engine: BIHEngine, count: int, words: int, seed: int = 7) -> List[str]:
+    """Pucks mixing dictionary phrases, template clauses and filler prose."""
+    rng = random.Random(seed)
+    phrases = list(engine._concept_to_morpheme) + list(engine._concept_to_symbol)
+    clauses = [entry["match"] for entry in engine.config.lojban_templates if entry.get("match")]
+    pucks = []
+    for _ in range(count):
+        parts: List[str] = []
+        while len(parts) < words:
+            roll = rng.random()
+            if roll < 0.25:
+                phrase = rng.choice(phrases)
+                parts.append(phrase.title() if rng.random() < 0.3 else phrase)
+            elif roll < 0.35:
+                parts.append(rng.choice(clauses))
+            else:
+                parts.extend(rng.sample(FILLER, 3))
+            if rng.random() < 0.1:
+                parts[-1] += "."
+        pucks.append(" ".join(parts))
+    return pucks
+
+
+def time_it(func: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def compare(legacy: BIHEngine, engine: BIHEngine, pucks: Sequence[str]) -> int:
+    mismatches = 0
+    for puck in pucks:
+        for mode in MODES:
+            old = legacy.compress(puck, mode=mode)
+            new = engine.compress(puck, mode=mode)
+            if old != new or legacy.decompress(old) != engine.decompress(new):
+                mismatches += 1
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cypher-dir", type=Path, default=CYPHER_DIR)
+    parser.add_argument("--pucks", type=int, default=300, help="Number of small pucks to verify")
+    parser.add_argument("--small-words", type=int, default=80)
+    parser.add_argument("--large-words", type=int, default=10000)
+    args = parser.parse_args()
+
+    legacy = load_engine(LegacyBIHEngine, args.cypher_dir)
+    engine = load_engine(BIHEngine, args.cypher_dir)
+
+    small = synthetic_pucks(engine, args.pucks, args.small_words)
+    large = synthetic_pucks(engine, 5, args.large_words, seed=11)
+    mismatches = compare(legacy, engine, small + large)
+
+    report = {"pucks_checked": len(small) + len(large), "modes": list(MODES), "mismatches": mismatches}
+    for label, corpus in (("small", small), ("large", large)):
+        compressed = [engine.compress(puck) for puck in corpus]
+        legacy_c = time_it(lambda: [legacy.compress(puck) for puck in corpus])
+        engine_c = time_it(lambda: [engine.compress(puck) for puck in corpus])
+        legacy_d = time_it(lambda: [legacy.decompress(puck) for puck in compressed])
+        engine_d = time_it(lambda: [engine.decompress(puck) for puck in compressed])
+        report[label] = {
+            "pucks": len(corpus),
+            "compress_speedup": round(legacy_c / engine_c, 2),
+            "decompress_speedup": round(legacy_d / engine_d, 2),
+            "legacy_compress_s": round(legacy_c, 4),
+            "compiled_compress_s": round(engine_c, 4),
+            "legacy_decompress_s": round(legacy_d, 4),
+            "compiled_decompress_s": round(engine_d, 4),
+        }
+
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+BIH Engine end-to-end throughput benchmark.
+
+Measures pucks/sec for compress + ratio + decompress on a synthetic corpus,
+one puck at a time (the way puck traffic calls the engine today) versus the
+batch API (``compress_many`` / ``decompress_many``) in-process and across a
+process pool. Every run gets a freshly loaded engine so the token-count memo
+starts cold; the pool run includes starting its workers. Batch outputs are
+checked against the per-puck results.
+
+Usage:
+    python3 benchmark_bih_throughput.py
+    python3 benchmark_bih_throughput.py --pucks 5000 --words 120 --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add trinity to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pucklib.cypher.bih_engine import BIHEngine
+from benchmark_bih_engine import CYPHER_DIR, load_engine, synthetic_pucks
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cypher-dir", type=Path, default=CYPHER_DIR)
+    parser.add_argument("--pucks", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=80, help="Approximate words per puck")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--mode", default="hybrid", choices=("hybrid", "token_optimized", "semantic_only"))
+    args = parser.parse_args()
+
+    pucks = synthetic_pucks(load_engine(BIHEngine, args.cypher_dir), args.pucks, args.words)
+    # Repeat traffic: a share of pucks are re-sent verbatim (retries, broadcasts).
+    pucks += pucks[: len(pucks) // 4]
+
+    engine = load_engine(BIHEngine, args.cypher_dir)
+    started = time.perf_counter()
+    sequential = []
+    for puck in pucks:
+        compressed = engine.compress(puck, mode=args.mode)
+        engine.calculate_ratio(puck, compressed)
+        sequential.append(engine.decompress(compressed))
+    sequential_s = time.perf_counter() - started
+
+    report = {
+        "pucks": len(pucks),
+        "mode": args.mode,
+        "tokenizer": engine.encoding_name or "fallback",
+        "sequential_pucks_per_s": round(len(pucks) / sequential_s, 1),
+    }
+
+    mismatches = 0
+    for label, workers in (("batch", 1), (f"pool_{args.workers}", args.workers)):
+        with load_engine(BIHEngine, args.cypher_dir) as engine:
+            started = time.perf_counter()
+            compressed = engine.compress_many(pucks, mode=args.mode, workers=workers)
+            for puck, item in zip(pucks, compressed):
+                engine.calculate_ratio(puck, item)
+            recovered = engine.decompress_many(compressed, workers=workers)
+            elapsed = time.perf_counter() - started
+        mismatches += sum(1 for left, right in zip(sequential, recovered) if left != right)
+        report[f"{label}_pucks_per_s"] = round(len(pucks) / elapsed, 1)
+
+    report["mismatches"] = mismatches
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
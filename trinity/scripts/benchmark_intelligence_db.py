@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+IntelligenceDatabase write benchmark.
+
+Inserts synthetic intelligence nodes three ways and reports nodes/sec:
+
+* ``legacy``: one ``sqlite3.connect`` + commit per node (the previous
+  behaviour, reproduced below), measured on a sample and extrapolated;
+* ``pooled``: ``store_node`` per node on the per-thread connection;
+* ``bulk``: ``store_nodes`` in batches (one transaction + executemany each).
+
+Usage:
+    python3 benchmark_intelligence_db.py
+    python3 benchmark_intelligence_db.py --nodes 100000 --batch 5000 --legacy-sample 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from trinity.intelligence_tools import IntelligenceDatabase, IntelligenceNode
+
+CATEGORIES = ("grant", "insight", "contact", "revenue", "operational")
+
+
+class LegacyIntelligenceDatabase(IntelligenceDatabase):
+    """Reference behaviour: a fresh connection (and PRAGMAs) for every call."""
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON;")
+        connection.execute("PRAGMA busy_timeout = 5000;")
+        return connection
+
+
+def synthetic_nodes(count: int, prefix: str, seed: int = 7) -> List[IntelligenceNode]:
+    rng = random.Random(seed)
+    nodes = []
+    for index in range(count):
+        category = CATEGORIES[index % len(CATEGORIES)]
+        data = {
+            "title": f"Opportunity {index}",
+            "program": rng.choice(["Horizon Europe", "Digital Europe", "LIFE"]),
+            "summary": f"Signal {index} about regional infrastructure",
+            "name": f"Contact {index}",
+            "channel": rng.choice(["RemoteEU", "Direct", "Referral"]),
+            "fit_score": round(rng.uniform(1, 5), 2),
+            "probability": round(rng.random(), 2),
+            "value": rng.random() * 100,
+        }
+        nodes.append(
+            IntelligenceNode(
+                id=f"{prefix}-{index}",
+                category=category,
+                timestamp="2025-01-01T00:00:00+00:00",
+                source_mission="BENCH",
+                data=data,
+                relevance_score=rng.random(),
+                tags=["bench", category],
+            )
+        )
+    return nodes
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=5_000, help="Nodes per store_nodes call")
+    parser.add_argument("--legacy-sample", type=int, default=2_000, help="Nodes to time on the per-connection path")
+    args = parser.parse_args()
+
+    report = {"nodes": args.nodes, "batch": args.batch}
+    with tempfile.TemporaryDirectory() as workdir:
+        root = Path(workdir)
+
+        legacy = LegacyIntelligenceDatabase(db_path=root / "legacy.db")
+        sample = synthetic_nodes(args.legacy_sample, "legacy")
+        started = time.perf_counter()
+        for node in sample:
+            legacy.store_node(node)
+        legacy_rate = len(sample) / (time.perf_counter() - started)
+        report["legacy_nodes_per_s"] = round(legacy_rate, 1)
+        report["legacy_estimated_s"] = round(args.nodes / legacy_rate, 2)
+
+        pooled = IntelligenceDatabase(db_path=root / "pooled.db")
+        sample = synthetic_nodes(args.legacy_sample, "pooled")
+        started = time.perf_counter()
+        for node in sample:
+            pooled.store_node(node)
+        report["pooled_nodes_per_s"] = round(len(sample) / (time.perf_counter() - started), 1)
+        pooled.close()
+
+        bulk = IntelligenceDatabase(db_path=root / "bulk.db")
+        nodes = synthetic_nodes(args.nodes, "bulk")
+        started = time.perf_counter()
+        inserted = 0
+        for start in range(0, len(nodes), args.batch):
+            inserted += bulk.store_nodes(nodes[start : start + args.batch])
+        bulk_elapsed = time.perf_counter() - started
+        report["bulk_inserted"] = inserted
+        report["bulk_s"] = round(bulk_elapsed, 2)
+        report["bulk_nodes_per_s"] = round(args.nodes / bulk_elapsed, 1)
+        report["bulk_speedup_vs_legacy"] = round((args.nodes / legacy_rate) / bulk_elapsed, 1)
+        bulk.close()
+
+    print(json.dumps(report, indent=2))
+    return 0 if inserted == args.nodes else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
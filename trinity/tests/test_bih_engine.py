@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+from pucklib.cypher.bih_engine import BIHEngine
+
+ITHKUIL = {
+    "constitutional_principles": {
+        "lion_sanctuary": {"morpheme": "Lsa"},
+        "cognitive_sovereignty": {"morpheme": "Kso"},
+    },
+    "system_states": {"mission_active": {"morpheme": "Mac"}},
+    "composite_concepts": {"sovereign_mission": {"morpheme": "Kso-Mac"}},
+}
+NSIBIDI = {
+    "core": {
+        "lion_sanctuary": {"symbol": "\U0001f981", "ithkuil_equivalent": "Lsa"},
+        "trinity": {"symbol": "△"},
+    }
+}
+LOJBAN = [{"match": "in order to", "replace": "lo nu"}]
+
+PUCKS = [
+    f"Puck {index}: the Lion Sanctuary keeps cognitive sovereignty in order to keep the mission active for Trinity."
+    for index in range(40)
+] + ["", "plain text with no dictionary terms", "Trinity"]
+
+
+def _config() -> dict:
+    return dict(lojban_templates=LOJBAN, ithkuil_dict=ITHKUIL, nsibidi_dict=NSIBIDI)
+
+
+def _engine() -> BIHEngine:
+    return BIHEngine(**_config())
+
+
+def test_batch_api_matches_single_calls() -> None:
+    engine = _engine()
+    for mode in ("hybrid", "token_optimized", "semantic_only"):
+        expected = [engine.compress(puck, mode=mode) for puck in PUCKS]
+        assert engine.compress_many(PUCKS, mode=mode) == expected
+        assert engine.decompress_many(expected) == [engine.decompress(item) for item in expected]
+    assert engine.compress_many([]) == []
+
+
+def test_pooled_batches_round_trip_and_reuse_the_pool() -> None:
+    with _engine() as engine:
+        compressed = engine.compress_many(PUCKS, workers=2, parallel_threshold=8)
+        pool = engine._pool
+        assert pool is not None
+        assert compressed == [engine.compress(puck) for puck in PUCKS]
+
+        recovered = engine.decompress_many(compressed, workers=2, parallel_threshold=8)
+        assert engine._pool is pool
+        assert recovered == [engine.decompress(item) for item in compressed]
+        assert "Lion's Sanctuary" in recovered[0]
+
+        # Batches under the threshold stay in-process.
+        assert engine.compress_many(PUCKS[:3], workers=2, parallel_threshold=8) == compressed[:3]
+    assert engine._pool is None
+
+
+def _load_benchmark():
+    path = Path(__file__).resolve().parents[1] / "scripts" / "benchmark_bih_engine.py"
+    spec = importlib.util.spec_from_file_location("benchmark_bih_engine", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+OVERLAPPING_ITHKUIL = {
+    "constitutional_principles": {
+        "lion": {"morpheme": "Lio"},
+        "lion_sanctuary": {"morpheme": "Lsa"},
+        "sanctuary": {"morpheme": "San"},
+        "sanctuary_keeper": {"morpheme": "Ske"},
+    },
+    "system_states": {
+        "mission": {"morpheme": "Mis"},
+        "mission_active": {"morpheme": "Mac"},
+    },
+    "composite_concepts": {"lion_mission": {"morpheme": "Lio-Mis"}},
+}
+OVERLAPPING_NSIBIDI = {
+    "core": {
+        "lion": {"symbol": "\U0001f981", "ithkuil_equivalent": "Lio"},
+        "keeper": {"symbol": "◇"},
+        "mission active": {"symbol": "△"},
+    }
+}
+OVERLAPPING_PUCKS = [
+    "The LION Sanctuary keeper met the Sanctuary Keeper; lion, lions and sanctuary-keeper stayed.",
+    "Mission ACTIVE: the mission is active, mission_active and MissionActive are not phrases.",
+    "Lsa and Lio-Mis already look compressed; lionsanctuary, sanctuary keeper in order to rest.",
+    "lion sanctuary lion sanctuary keeper mission active mission Lion Mission",
+]
+
+
+def test_compiled_rules_match_sequential_substitution() -> None:
+    benchmark = _load_benchmark()
+    config = dict(lojban_templates=LOJBAN, ithkuil_dict=OVERLAPPING_ITHKUIL, nsibidi_dict=OVERLAPPING_NSIBIDI)
+    legacy = benchmark.LegacyBIHEngine(**config)
+    engine = BIHEngine(**config)
+    pucks = OVERLAPPING_PUCKS + benchmark.synthetic_pucks(engine, count=40, words=60)
+    assert benchmark.compare(legacy, engine, pucks) == 0
+    assert benchmark.compare(benchmark.LegacyBIHEngine(**_config()), _engine(), PUCKS) == 0
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from comms_hub_client import send_comms_message
+
+
+def test_send_comms_message_writes_inbox_and_outbox(tmp_path: Path) -> None:
+    assert send_comms_message("claude", "groq", "response", {"answer": 42}, "high", comms_root=tmp_path)
+
+    inbox_files = list((tmp_path / "groq" / "inbox").glob("*.msg.json"))
+    outbox_files = list((tmp_path / "outbox").glob("*.msg.json"))
+    assert len(inbox_files) == 1 and len(outbox_files) == 1
+    message = json.loads(inbox_files[0].read_text(encoding="utf-8"))
+    assert message["from_vessel"] == "claude"
+    assert message["priority"] == "high"
+    assert message["payload"] == {"answer": 42}
+    assert message["constitutional_verified"] is True
+    assert not list((tmp_path / "groq" / "inbox").glob(".*.tmp"))
+
+
+def test_send_comms_message_broadcast_and_validation(tmp_path: Path) -> None:
+    assert send_comms_message("janus", "broadcast", "broadcast", {"note": "sync"}, "normal", comms_root=tmp_path)
+    for recipient in ("claude", "gemini", "groq", "janus"):
+        assert len(list((tmp_path / recipient / "inbox").glob("*.msg.json"))) == 1
+
+    # Same rejections the CLI applied through argparse choices.
+    assert not send_comms_message("claude", "groq", "response", {}, "urgent", comms_root=tmp_path)
+    assert not send_comms_message("claude", "groq", "chitchat", {}, "normal", comms_root=tmp_path)
+    assert len(list((tmp_path / "groq" / "inbox").glob("*.msg.json"))) == 1
+
+
+def test_blocked_payload_is_logged_not_printed(tmp_path: Path, caplog, capsys) -> None:
+    with caplog.at_level("WARNING", logger="comms_hub.messages"):
+        assert send_comms_message("claude", "groq", "query", {"step": "rm -rf /"}, "normal", comms_root=tmp_path)
+    assert "harmful pattern" in caplog.text
+    assert capsys.readouterr().out == ""
+    message = json.loads(next((tmp_path / "groq" / "inbox").glob("*.msg.json")).read_text(encoding="utf-8"))
+    assert message["constitutional_verified"] is False
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from inbox_watcher import InboxWatcher
+
+
+def _deliver_later(path: Path, delay: float) -> threading.Thread:
+    def write() -> None:
+        time.sleep(delay)
+        path.write_text(json.dumps({"message_id": path.stem}), encoding="utf-8")
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    return thread
+
+
+def test_wakes_on_message_and_ignores_other_files(tmp_path: Path) -> None:
+    inbox = tmp_path / "inbox"
+    with InboxWatcher(inbox) as watcher:
+        (inbox / "notes.txt").write_text("ignored", encoding="utf-8")
+        if watcher.uses_inotify:
+            assert watcher.wait(0.1) is False
+
+        thread = _deliver_later(inbox / "m1.msg.json", 0.1)
+        started = time.monotonic()
+        assert watcher.wait(5.0) is True
+        assert time.monotonic() - started < 2.0
+        thread.join()
+
+
+def test_burst_collapses_into_one_wakeup(tmp_path: Path) -> None:
+    inbox = tmp_path / "inbox"
+    with InboxWatcher(inbox, debounce=0.05) as watcher:
+        for index in range(20):
+            (inbox / f"m{index}.msg.json").write_text("{}", encoding="utf-8")
+        assert watcher.wait(1.0) is True
+        assert watcher.wait(0.2) is False
+
+
+def test_steady_stream_does_not_starve_the_wakeup(tmp_path: Path) -> None:
+    inbox = tmp_path / "inbox"
+    stop = threading.Event()
+
+    def stream() -> None:
+        index = 0
+        while not stop.is_set():
+            (inbox / f"m{index}.msg.json").write_text("{}", encoding="utf-8")
+            index += 1
+            time.sleep(0.01)
+
+    with InboxWatcher(inbox, debounce=0.05, max_burst=0.2) as watcher:
+        thread = threading.Thread(target=stream)
+        thread.start()
+        try:
+            started = time.monotonic()
+            assert watcher.wait(10.0) is True
+            assert time.monotonic() - started < 2.0
+        finally:
+            stop.set()
+            thread.join()
+
+
+def test_polling_fallback_detects_new_files(tmp_path: Path) -> None:
+    inbox = tmp_path / "inbox"
+    watcher = InboxWatcher(inbox, fallback_interval=0.02)
+    watcher.close()  # force the mtime-polling path
+    assert watcher.wait(0.05) is False
+    thread = _deliver_later(inbox / "m1.msg.json", 0.05)
+    assert watcher.wait(2.0) is True
+    thread.join()
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import json
+import os
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import pytest
+
+from trinity.deliverable_index import record_deliverable
 from trinity.intelligence_action_generator import IntelligenceActionGenerator
 from trinity.intelligence_collector import IntelligenceCollector
-from trinity.intelligence_tools import IntelligenceDatabase, _INTEL_DB, intel_lookup
+from trinity.intelligence_tools import IntelligenceDatabase, IntelligenceNode, _INTEL_DB, intel_lookup
 from trinity.mission_queue_manager import MissionQueueManager
 
 
@@ -146,3 +151,138 @@ def test_full_intelligence_pipeline(tmp_path: Path, monkeypatch) -> None:
     # Ensure no duplicate mission spawns on second run
     second_pass = generator.run(dry_run=False)
     assert not second_pass, "processed intelligence should not spawn duplicate missions"
+
+
+def _node(node_id: str, category: str, **data: object) -> IntelligenceNode:
+    return IntelligenceNode(
+        id=node_id,
+        category=category,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        source_mission="TEST",
+        data=dict(data),
+        relevance_score=0.5,
+        tags=["test"],
+    )
+
+
+def test_store_nodes_bulk_inserts_in_one_pass(tmp_path: Path) -> None:
+    db = IntelligenceDatabase(db_path=tmp_path / "intelligence.db")
+    nodes = [_node(f"grant-{index}", "grant", title=f"Grant {index}", fit_score=4.0) for index in range(50)]
+    nodes += [_node("metric-1", "operational", metric_type="latency", value=12.5)]
+
+    assert db.store_nodes(nodes) == 51
+    # Duplicates are ignored, as with store_node.
+    assert db.store_nodes(nodes[:10]) == 0
+
+    with pytest.raises(ValueError):
+        db.store_nodes([_node("ok", "grant", title="Kept?"), _node("bad", "unknown")])
+
+    with db._connection() as connection:
+        assert connection.execute("SELECT COUNT(*) FROM grants").fetchone()[0] == 50
+        assert connection.execute("SELECT COUNT(*) FROM operational_metrics").fetchone()[0] == 1
+    assert db._connection() is db._connection()
+    db.close()
+
+
+def test_tag_filters_use_normalised_tags(tmp_path: Path) -> None:
+    db = IntelligenceDatabase(db_path=tmp_path / "intelligence.db")
+    db.store_nodes(
+        [
+            _node("g-1", "grant", title="Port electrification", tags=None),
+            _node("g-2", "grant", title="Grid storage"),
+        ]
+    )
+    with db._connection() as connection:
+        connection.execute("UPDATE grants SET tags = ? WHERE id = ?", ('["energy", "EU"]', "g-2"))
+
+    assert [row["id"] for row in db.query("grants", {"tags": "eu"}, None, 10, "relevance")] == ["g-2"]
+    assert [row["id"] for row in db.query("grants", {"tags": ["eu", "energy"]}, None, 10, "relevance")] == ["g-2"]
+    # Substrings of a tag no longer match (previously a LIKE over the JSON text).
+    assert db.query("grants", {"tags": "tes"}, None, 10, "relevance") == []
+    assert [row["id"] for row in db.query("grants", {}, "electrification", 10, "relevance")] == ["g-1"]
+    # Scalar tags are matched as text instead of failing on list().
+    with db._connection() as connection:
+        connection.execute("UPDATE grants SET tags = ? WHERE id = ?", ('[2025, "port"]', "g-1"))
+    assert [row["id"] for row in db.query("grants", {"tags": 2025}, None, 10, "relevance")] == ["g-1"]
+    assert [row["id"] for row in db.query("grants", {"tags": [2025, "PORT"]}, None, 10, "relevance")] == ["g-1"]
+    assert db.query("grants", {"tags": True}, None, 10, "relevance") == []
+
+    with db._connection() as connection:
+        connection.execute("DELETE FROM grants WHERE id = 'g-2'")
+        assert connection.execute("SELECT COUNT(*) FROM node_tags WHERE node_id = 'g-2'").fetchone()[0] == 0
+
+
+def test_existing_database_is_backfilled(tmp_path: Path) -> None:
+    db_path = tmp_path / "intelligence.db"
+    db = IntelligenceDatabase(db_path=db_path)
+    db.store_nodes([_node("c-1", "contact", name="Ana", location="Malaga")])
+    with db._connection() as connection:
+        connection.execute("DROP TABLE node_tags")
+    db.close()
+
+    reopened = IntelligenceDatabase(db_path=db_path)
+    assert [row["id"] for row in reopened.query("contacts", {"tags": "test"}, None, 10, "relevance")] == ["c-1"]
+
+
+def test_collector_cursor_and_deliverable_index(tmp_path: Path) -> None:
+    mission_path, archive_path = _build_grant_mission(tmp_path)
+    missions_dir = mission_path.parent
+    archive_dir = archive_path.parent
+    # Deliverable named after the message, not the mission: only the index finds it.
+    indexed = archive_dir / "msg-20250101-000000-abcd1234.msg.json"
+    archive_path.rename(indexed)
+    assert record_deliverable(archive_dir, indexed, {"payload": {"mission_id": "GROQ-TEST-GRANT-001"}})
+    assert not record_deliverable(archive_dir, indexed, {"payload": {}})
+
+    collector = IntelligenceCollector(
+        missions_dir=missions_dir,
+        archive_root=archive_dir.parents[1],
+        cache_dir=tmp_path / "intel_cache",
+        log_path=tmp_path / "collector.log",
+        db_path=tmp_path / "intelligence.db",
+    )
+    nodes = collector.collect_once()
+    assert [node.data["title"] for node in nodes] == ["Sovereign Data Center Upgrade"]
+
+    # Nothing new: the cursor skips every mission already seen.
+    assert collector.collect_once() == []
+
+    for index in range(5):
+        old = missions_dir / f"OLD-{index}.json"
+        _write_json(old, {"mission_id": f"OLD-{index}", "source_template": "ops_hardening"})
+        os.utime(old, ns=(1, 1))
+    # An atomic writer stamps the mtime before the rename makes the file
+    # visible, so a mission can show up with an mtime before the last pass.
+    late = missions_dir / "LATE-1.json"
+    _write_json(late, {"mission_id": "LATE-1", "source_template": "eu_remote_opportunity_scout_daily"})
+    late_ns = time.time_ns() - 5_000_000_000
+    os.utime(late, ns=(late_ns, late_ns))
+    _build_revenue_mission(tmp_path)
+    nodes = collector.collect_once()
+    # Files older than the settle window are left to force_rescan.
+    assert sorted(node.source_mission for node in nodes) == ["GROQ-TEST-REMOTE-001", "LATE-1"]
+    assert collector.collect_once() == []
+
+    state = json.loads((tmp_path / "intel_cache" / "collector_state.json").read_text(encoding="utf-8"))
+    assert state["recent"]["LATE-1.json"] == late_ns
+    assert state["cursor_mtime_ns"] < late_ns
+    assert str(mission_path) not in state
+
+    rescanned = collector.collect_once(force_rescan=True)
+    assert sorted(node.source_mission for node in rescanned) == [f"OLD-{index}" for index in range(5)]
+
+
+def test_collector_migrates_legacy_state(tmp_path: Path) -> None:
+    mission_path, archive_path = _build_grant_mission(tmp_path)
+    cache_dir = tmp_path / "intel_cache"
+    # The original state kept ``{path: st_mtime}`` for every mission seen.
+    _write_json(cache_dir / "collector_state.json", {str(mission_path): mission_path.stat().st_mtime})
+    collector = IntelligenceCollector(
+        missions_dir=mission_path.parent,
+        archive_root=archive_path.parents[2],
+        cache_dir=cache_dir,
+        log_path=tmp_path / "collector.log",
+        db_path=tmp_path / "intelligence.db",
+    )
+    assert collector.state["cursor_mtime_ns"] >= mission_path.stat().st_mtime_ns
+    assert collector.collect_once() == []
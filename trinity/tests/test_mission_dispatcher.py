@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
+from log_sink import flush_all
 from mission_dispatcher_daemon import DispatcherConfig, MissionDispatcher
 from mission_queue_manager import MissionQueueManager, isoformat_now
 
@@ -53,6 +55,60 @@ def test_dispatcher_assigns_high_priority_first(tmp_path: Path) -> None:
         mission_data = json.load(handle)
     assert mission_data["assigned_to"] == "groq"
 
+    flush_all()
     log_entries = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines() if line.strip()]
     assignment_events = [entry for entry in log_entries if entry.get("event") == "mission_assigned"]
     assert len(assignment_events) == 2
+
+
+def test_queue_snapshot_is_cached_until_directory_changes(tmp_path: Path) -> None:
+    comms_root = tmp_path / "comms"
+    manager = MissionQueueManager(
+        dispatcher_agent="codex",
+        comms_root=comms_root,
+        mission_root=comms_root / "missions",
+        log_path=tmp_path / "queue_manager.jsonl",
+    )
+    manager.queue_mission(_mission("low", "groq", 1))
+    manager.queue_mission(_mission("high", "groq", 5))
+
+    dispatcher = MissionDispatcher(
+        DispatcherConfig(poll_interval=0.1, heartbeat_interval=5.0),
+        manager=manager,
+        log_path=tmp_path / "dispatcher.jsonl",
+    )
+
+    first = dispatcher._queued_missions()
+    assert [entry[3]["mission_id"] for entry in first] == ["high-5", "low-1"]
+    assert dispatcher._queued_missions() is first
+
+    manager.queue_mission(_mission("mid", "groq", 3))
+    manager.fail_queued_mission("low-1", "cancelled")
+    refreshed = dispatcher._queued_missions()
+    assert refreshed is not first
+    assert [entry[3]["mission_id"] for entry in refreshed] == ["high-5", "mid-3"]
+
+
+def test_queue_snapshot_resyncs_when_directory_mtime_is_stale(tmp_path: Path) -> None:
+    comms_root = tmp_path / "comms"
+    manager = MissionQueueManager(
+        dispatcher_agent="codex",
+        comms_root=comms_root,
+        mission_root=comms_root / "missions",
+        log_path=tmp_path / "queue_manager.jsonl",
+    )
+    manager.queue_mission(_mission("low", "groq", 1))
+    dispatcher = MissionDispatcher(
+        DispatcherConfig(poll_interval=0.1, heartbeat_interval=5.0, queue_resync_interval=0.0),
+        manager=manager,
+        log_path=tmp_path / "dispatcher.jsonl",
+    )
+    queued = manager.missions.queued
+    assert [entry[3]["priority"] for entry in dispatcher._queued_missions()] == [1]
+
+    # An in-place rewrite that leaves the directory mtime untouched.
+    stat = queued.stat()
+    path = next(queued.glob("*.json"))
+    path.write_text(json.dumps(_mission("low", "groq", 7)), encoding="utf-8")
+    os.utime(queued, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert [entry[3]["priority"] for entry in dispatcher._queued_missions()] == [7]
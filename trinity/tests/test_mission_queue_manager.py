@@ -89,3 +89,61 @@ def test_assign_specific_and_fail_queued(tmp_path: Path) -> None:
     failed_data = json.loads(failed_path.read_text(encoding="utf-8"))
     assert failed_data["status"] == "failed"
     assert failed_data["error_message"] == "invalid setup"
+
+
+def test_assign_uses_index_priority_and_out_of_band_files(tmp_path: Path) -> None:
+    comms_root = tmp_path / "comms"
+    mission_root = comms_root / "missions"
+    manager = MissionQueueManager(
+        dispatcher_agent="codex",
+        comms_root=comms_root,
+        mission_root=mission_root,
+        log_path=tmp_path / "mission_log.jsonl",
+    )
+
+    low = _sample_mission()
+    low["mission_id"] = "A-LOW"
+    manager.queue_mission(low)
+    other = _sample_mission()
+    other.update({"mission_id": "B-OTHER", "assigned_to": "claude", "priority": 9})
+    manager.queue_mission(other)
+
+    # Dropped straight into the directory by hand; the index picks it up.
+    dropped = _sample_mission()
+    dropped.update({"mission_id": "C-DROPPED", "priority": 5, "status": "queued"})
+    (mission_root / "queued" / "C-DROPPED.json").write_text(json.dumps(dropped), encoding="utf-8")
+
+    first = manager.assign_mission("groq")
+    second = manager.assign_mission("groq")
+    assert first is not None and first["mission_id"] == "C-DROPPED"
+    assert second is not None and second["mission_id"] == "A-LOW"
+    assert manager.assign_mission("groq") is None
+    assert manager.queued_count() == 1
+
+
+def test_competing_managers_claim_each_mission_once(tmp_path: Path) -> None:
+    comms_root = tmp_path / "comms"
+    mission_root = comms_root / "missions"
+    first, second = (
+        MissionQueueManager(
+            dispatcher_agent="codex",
+            comms_root=comms_root,
+            mission_root=mission_root,
+            log_path=tmp_path / f"mission_log_{index}.jsonl",
+        )
+        for index in range(2)
+    )
+    for index in range(2):
+        mission = _sample_mission()
+        mission["mission_id"] = f"M-{index}"
+        first.queue_mission(mission)
+
+    # Both dispatchers pick the same candidate; only the first rename wins.
+    stale_path, stale_record = second._next_mission_for_resident("groq")
+    winner = first.assign_mission("groq")
+    assert winner is not None and winner["mission_id"] == stale_path.stem
+    assert second._activate_mission(stale_path, stale_record, "groq") is None
+
+    loser_retry = second.assign_mission("groq")
+    assert loser_retry is not None and loser_retry["mission_id"] == "M-1"
+    assert first.assign_mission("groq") is None
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PATTERN_ENGINE_DIR = Path(__file__).resolve().parents[2] / "balaur" / "projects" / "05_software" / "pattern_engine"
+if str(PATTERN_ENGINE_DIR) not in sys.path:
+    sys.path.insert(0, str(PATTERN_ENGINE_DIR))
+
+from pattern_engine_core import WAVELET_SCALES, PatternEngineCore, RhythmHistoryTail, SlidingSpectrum, morlet_kernel, wavelet_energies
+
+
+def _line(index: int) -> str:
+    return f"2025-01-01T00:{index // 60:02d}:{index % 60:02d}Z | beat={index} amp={index * 0.5:.1f}s\n"
+
+
+def _append(path: Path, text: str) -> None:
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def test_tail_reads_window_then_only_appended_lines(tmp_path: Path) -> None:
+    log = tmp_path / "rhythm_history.log"
+    log.write_text("".join(_line(index) for index in range(500)), encoding="utf-8")
+    tail = RhythmHistoryTail(log, capacity=8)
+    tail.BLOCK_SIZE = 64  # force several backwards reads
+
+    _, amplitudes = tail.refresh()
+    assert amplitudes.tolist() == [index * 0.5 for index in range(492, 500)]
+
+    # A half-written line is left for the next refresh.
+    _append(log, _line(500) + _line(501)[:20])
+    _, amplitudes = tail.refresh()
+    assert amplitudes[-1] == 250.0
+    _append(log, _line(501)[20:] + "garbage without amplitude\n")
+    _, amplitudes = tail.refresh()
+    assert amplitudes.tolist() == [index * 0.5 for index in range(494, 502)]
+
+
+def test_tail_resumes_from_persisted_state(tmp_path: Path) -> None:
+    log = tmp_path / "rhythm_history.log"
+    state = tmp_path / "state" / "tail.npz"
+    log.write_text("".join(_line(index) for index in range(20)), encoding="utf-8")
+    RhythmHistoryTail(log, capacity=6, state_path=state).refresh()
+
+    _append(log, _line(20))
+    resumed = RhythmHistoryTail(log, capacity=6, state_path=state)
+    assert resumed.buffer.window()[1].tolist() == [index * 0.5 for index in range(14, 20)]
+    # Lines consumed before the restart are not read again.
+    assert resumed.refresh()[1].tolist() == [index * 0.5 for index in range(15, 21)]
+
+    # A different capacity ignores the saved window.
+    assert len(RhythmHistoryTail(log, capacity=4, state_path=state).buffer) == 0
+
+
+def test_tail_restarts_after_rotation_or_truncation(tmp_path: Path) -> None:
+    log = tmp_path / "rhythm_history.log"
+    log.write_text("".join(_line(index) for index in range(10)), encoding="utf-8")
+    tail = RhythmHistoryTail(log, capacity=4)
+    tail.refresh()
+
+    log.write_text(_line(100), encoding="utf-8")
+    assert tail.refresh()[1].tolist() == [50.0]
+
+    rotated = tmp_path / "rhythm_history.log.new"
+    rotated.write_text(_line(200) + _line(201), encoding="utf-8")
+    os.replace(rotated, log)
+    assert tail.refresh()[1].tolist() == [100.0, 100.5]
+
+
+def test_sliding_spectrum_matches_fft() -> None:
+    rng = np.random.default_rng(7)
+    stream = rng.standard_normal(4000)
+    spectrum = SlidingSpectrum(resync_every=64)
+    position = 0
+    for shift in [0, 1, 1, 3, 0, 16, 5, 200, 2, 1] * 10:
+        position += shift
+        window = stream[position : position + 96]
+        np.testing.assert_allclose(spectrum.update(window), np.fft.rfft(window), atol=1e-8)
+    # A new window length starts over from a full FFT.
+    np.testing.assert_allclose(spectrum.update(stream[:64]), np.fft.rfft(stream[:64]), atol=1e-8)
+
+
+def test_wavelet_energies_match_direct_convolution() -> None:
+    rng = np.random.default_rng(11)
+    for size in (4, 12, 96, 250):
+        signals = rng.standard_normal((3, size))
+        signals -= signals.mean(axis=1, keepdims=True)
+        kernels = [morlet_kernel(scale, max(int(scale * 6), 3)) for scale in WAVELET_SCALES]
+        expected = np.array(
+            [[np.mean(np.convolve(signal, kernel, mode="same") ** 2) for kernel in kernels] for signal in signals]
+        )
+        np.testing.assert_allclose(wavelet_energies(signals), expected, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(wavelet_energies(signals[0]), expected[0], rtol=1e-9, atol=1e-12)
+
+
+def _backfill(tmp_path: Path, name: str, log: Path, **kwargs) -> tuple[dict, list[dict]]:
+    engine = PatternEngineCore(tmp_path / name, tmp_path / "missing_spec.md")
+    engine.rhythm_history_path = log
+    engine.rhythm_state_path = tmp_path / "missing_state.json"
+    summary = engine.backfill(force_emit=True, **kwargs)
+    lines = Path(summary["output"]).read_text(encoding="utf-8").splitlines()
+    return summary, [json.loads(line) for line in lines]
+
+
+def test_backfill_windows_do_not_depend_on_chunk_seams(tmp_path: Path) -> None:
+    log = tmp_path / "rhythm_history.log"
+    rng = np.random.default_rng(5)
+    amplitudes = np.sin(np.arange(1000) / 4.0) + 0.1 * rng.standard_normal(1000)
+    lines = ["2025-01-01T00:00:00Z | bad line\n"]
+    lines += [_line(index).replace(f"amp={index * 0.5:.1f}", f"amp={value:.6f}") for index, value in enumerate(amplitudes)]
+    log.write_text("".join(lines), encoding="utf-8")
+
+    whole, reference = _backfill(tmp_path, "whole", log, window_points=32, stride=7, chunk_records=5000)
+    expected = (1000 - 32) // 7 + 1
+    assert whole["windows"] == whole["emitted"] == expected == len(reference)
+    assert whole["points"] == 1000
+    assert [artifact["window"]["start"] for artifact in reference] == [
+        PatternEngineCore._iso(PatternEngineCore._maybe_epoch(_line(index).split("|")[0].strip()))
+        for index in range(0, 1000 - 31, 7)
+    ]
+
+    # Chunks shorter than a window and batches that split a chunk must give the same windows.
+    for chunk_records, batch_windows in ((10, 3), (33, 2048), (250, 5)):
+        summary, artifacts = _backfill(
+            tmp_path,
+            f"chunks-{chunk_records}",
+            log,
+            window_points=32,
+            stride=7,
+            chunk_records=chunk_records,
+            batch_windows=batch_windows,
+        )
+        assert summary["windows"] == expected
+        assert [artifact["window"] for artifact in artifacts] == [artifact["window"] for artifact in reference]
+        for got, want in zip(artifacts, reference):
+            assert got["signals"].keys() == want["signals"].keys()
+            np.testing.assert_allclose(
+                list(got["signals"].values()), list(want["signals"].values()), rtol=1e-9, atol=1e-12
+            )
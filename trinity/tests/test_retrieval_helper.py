@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+import retrieval_helper
+from narrative_warehouse.encoder import EncoderConfig, HashingEncoder
+from narrative_warehouse.storage import bundle_data_dir
+
+
+def _bundle_file(index_dir: Path, name: str) -> Path:
+    metadata = json.loads((index_dir / "metadata.json").read_text(encoding="utf-8"))
+    return bundle_data_dir(index_dir, metadata) / name
+
+
+class CountingEncoder(HashingEncoder):
+    def __init__(self) -> None:
+        super().__init__(dimension=256)
+        self.encoded = 0
+
+    def encode(self, texts):
+        texts = list(texts)
+        self.encoded += len(texts)
+        return super().encode(texts)
+
+
+def _docs(root: Path) -> Path:
+    docs = root / "docs"
+    docs.mkdir()
+    (docs / "lion.md").write_text("The Lion Sanctuary protects constitutional memory. " * 4, encoding="utf-8")
+    (docs / "grants.txt").write_text("Horizon Europe grant deadlines and budgets. " * 4, encoding="utf-8")
+    (docs / "notes.rst").write_text("Malaga contact network outreach notes.", encoding="utf-8")
+    return docs
+
+
+def test_build_and_search_offline(tmp_path: Path) -> None:
+    docs = _docs(tmp_path)
+    index_path = str(tmp_path / "index.jsonl")
+    encoder = CountingEncoder()
+
+    retrieval_helper.build_index([str(docs)], index_path=index_path, chunk_size=64, encoder=encoder, batch_size=2)
+    first_pass = encoder.encoded
+    assert first_pass > 0
+    assert _bundle_file(tmp_path / "index", "embeddings.npy").exists()
+
+    results = retrieval_helper.search_index("lion sanctuary", top_n=2, index_path=index_path)
+    assert len(results) == 2
+    assert results[0]["path"].endswith("lion.md")
+    assert results[0]["score"] >= results[1]["score"]
+
+    # Rebuild: unchanged chunks are reused, only the edited file is encoded again.
+    (docs / "notes.rst").write_text("Oradea revenue outreach notes.", encoding="utf-8")
+    retrieval_helper.build_index([str(docs)], index_path=index_path, chunk_size=64, encoder=encoder)
+    assert encoder.encoded - first_pass == 1
+    metadata = json.loads((tmp_path / "index" / "metadata.json").read_text(encoding="utf-8"))
+    assert metadata["build"]["chunks_encoded"] == 1
+    assert retrieval_helper.search_index("oradea revenue", top_n=1, index_path=index_path)[0]["path"].endswith("notes.rst")
+
+
+def test_failed_batches_are_left_for_the_next_build(tmp_path: Path) -> None:
+    docs = _docs(tmp_path)
+    index_path = str(tmp_path / "index.jsonl")
+
+    class FlakyEncoder(CountingEncoder):
+        def encode(self, texts):
+            if any("Horizon" in text for text in texts):
+                raise RuntimeError("rate limited")
+            return super().encode(texts)
+
+    retrieval_helper.build_index([str(docs)], index_path=index_path, chunk_size=64, encoder=FlakyEncoder(), batch_size=1)
+    files = json.loads(_bundle_file(tmp_path / "index", "files.json").read_text(encoding="utf-8"))
+    assert not any(path.endswith("grants.txt") for path in files)
+
+    encoder = CountingEncoder()
+    retrieval_helper.build_index([str(docs)], index_path=index_path, chunk_size=64, encoder=encoder)
+    grant_chunks = len(range(0, len((docs / "grants.txt").read_text(encoding="utf-8")), 64))
+    assert encoder.encoded == grant_chunks
+
+
+def test_legacy_jsonl_index_is_searchable(tmp_path: Path, monkeypatch) -> None:
+    index_path = tmp_path / "legacy.jsonl"
+    rows = [
+        {"path": "a.md", "chunk": "alpha", "embedding": [1.0, 0.0, 0.0]},
+        {"path": "b.md", "chunk": "beta", "embedding": [0.0, 2.0, 0.0]},
+        {"path": "c.md", "chunk": "gamma", "embedding": [0.5, 0.5, 0.0]},
+    ]
+    index_path.write_text("\n".join(json.dumps(row) for row in rows) + "\n", encoding="utf-8")
+
+    class FixedEncoder:
+        def __init__(self, *_, **__) -> None:
+            pass
+
+        def encode(self, texts):
+            return np.asarray([[0.0, 1.0, 0.0]], dtype=np.float32)
+
+    monkeypatch.setattr(retrieval_helper, "OpenAIEmbeddingEncoder", FixedEncoder)
+    monkeypatch.setattr(retrieval_helper, "_QUERY_ENCODERS", {})
+    results = retrieval_helper.search_index("beta", top_n=2, index_path=str(index_path))
+    assert [result["path"] for result in results] == ["b.md", "c.md"]
+    assert abs(results[0]["score"] - 1.0) < 1e-6
+
+
+def test_query_encoder_is_created_once_per_process(tmp_path: Path, monkeypatch) -> None:
+    docs = _docs(tmp_path)
+    index_path = str(tmp_path / "index.jsonl")
+    created = []
+
+    class FakeOpenAIEncoder(HashingEncoder):
+        def __init__(self) -> None:
+            super().__init__(dimension=256)
+            self.config = EncoderConfig(kind="openai", model_name=retrieval_helper.EMBEDDING_MODEL)
+            created.append(self)
+
+    monkeypatch.setattr(retrieval_helper, "OpenAIEmbeddingEncoder", FakeOpenAIEncoder)
+    monkeypatch.setattr(retrieval_helper, "_QUERY_ENCODERS", {})
+    build_encoder = FakeOpenAIEncoder()
+    retrieval_helper.build_index([str(docs)], index_path=index_path, chunk_size=64, encoder=build_encoder)
+    for query in ("lion", "grants", "malaga"):
+        assert retrieval_helper.search_index(query, top_n=1, index_path=index_path)[0]["path"]
+
+    # A rebuild reloads the bundle but keeps the process-wide query encoder.
+    (docs / "notes.rst").write_text("Oradea revenue outreach notes.", encoding="utf-8")
+    retrieval_helper.build_index([str(docs)], index_path=index_path, chunk_size=64, encoder=build_encoder)
+    assert retrieval_helper.search_index("oradea", top_n=1, index_path=index_path)[0]["path"].endswith("notes.rst")
+    assert len(created) == 2
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 import time
 from functools import wraps
 from pathlib import Path
 from typing import Any, Callable, ParamSpec, TypeVar
 
 from trinity.config import load_configuration
+from trinity.log_sink import get_sink
 
 P = ParamSpec("P")
 R = TypeVar("R")
@@ -14,6 +14,7 @@ R = TypeVar("R")
 _paths, _ = load_configuration()
 LOG_PATH = _paths.log_dir / "tool_audit.jsonl"
 LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+_SINK = get_sink(LOG_PATH)
 
 MAX_FIELD_LENGTH = 400
 
@@ -43,9 +44,7 @@ def _serialise_args(args: tuple[Any, ...], kwargs: dict[str, Any]) -> dict[str,
 
 def _write_record(record: dict[str, Any]) -> None:
     record.setdefault("timestamp", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()))
-    with LOG_PATH.open("a", encoding="utf-8") as handle:
-        json.dump(record, handle)
-        handle.write("\n")
+    _SINK.write(record)
 
 
 def audit_tool_call(tool_name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, List
 
 from config import TrinityPaths, load_configuration
+from log_sink import get_sink, tail_records
 
 
 @dataclass
@@ -16,6 +16,7 @@ class TrinityEventStream:
         self.paths: TrinityPaths = paths
         self.log_file: Path = self.paths.log_dir / "events.jsonl"
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self._sink = get_sink(self.log_file)
 
     def log_event(self, *, source: str, event_type: str, data: dict[str, Any]) -> None:
         entry = {
@@ -25,15 +26,14 @@ class TrinityEventStream:
             "data": data,
         }
         try:
-            with self.log_file.open("a", encoding="utf-8") as fh:
-                fh.write(json.dumps(entry, ensure_ascii=True) + "\n")
+            self._sink.write(entry)
         except Exception:
             pass
 
     def get_recent_events(self, limit: int = 50) -> List[dict]:
         try:
-            lines = self.log_file.read_text(encoding="utf-8").splitlines()[-limit:]
-            return [json.loads(line) for line in lines if line.strip()]
+            self._sink.flush()
+            return tail_records(self.log_file, limit)
         except Exception:
             return []
 